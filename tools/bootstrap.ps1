@@ -112,16 +112,34 @@ $script:PythonToolFiles = @(
     "tmdl_format_validator.py",
     "tmdl_measure_replacer.py",
     "pbir_visual_editor.py",
+    "json_splice.py",
     "pbi_project_validator.py",
     "pbi_merger_utils.py",
     "pbi_merger_schemas.json",
     "extract_visual_layout.py",
+    "pbir_field_index.py",
+    "pbi_field_renamer.py",
+    "pbir_schema_validator.py",
+    "pbir_definition_schemas.json",
+    "model_reference_checker.py",
+    "report_documenter.py",
+    "report_load_linter.py",
+    "layout_linter.py",
+    "layout_solver.py",
+    "wireframe_renderer.py",
+    "pbir_page_generator.py",
+    "template_harvester.py",
+    "legacy_report_converter.py",
+    "pbix_reader.py",
+    "pbi_project_doctor.py",
+    "bim_tmdl_splitter.py",
     "agent_logger.py",
     "sensitive_column_detector.py",
     "anonymization_generator.py",
     "m_partition_editor.py",
     "m_pattern_analyzer.py",
-    "query_folding_validator.py"
+    "query_folding_validator.py",
+    "portfolio_scanner.py"
 )
 
 # Advanced files to copy (PRIVATE - only in Developer edition)
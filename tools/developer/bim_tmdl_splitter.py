@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+BIM to TMDL Splitter
+
+Converts a model.bim semantic model into the TMDL folder layout
+(definition/database.tmdl, model.tmdl, relationships.tmdl, expressions.tmdl,
+tables/<table>.tmdl, roles/, perspectives/, cultures/), so later edits touch
+one small file per table instead of a single large JSON document.
+
+model.bim is streamed table by table (BimParser.iter_model), so memory stays
+bounded by the largest table even for 100+ MB models; each table file is
+written as soon as its table has been read. After writing, every table,
+column, measure, hierarchy, level, partition and calculation item is checked
+against the TMDL declarations read back from the written files.
+
+Usage:
+    python bim_tmdl_splitter.py <model.bim> (--output <new.SemanticModel> | --in-place)
+                                [--no-verify] [--json]
+
+Arguments:
+    model.bim             Path to model.bim (or the .SemanticModel folder containing it)
+
+Options:
+    --output <dir>        Write a converted copy of the .SemanticModel folder here
+    --in-place            Write definition/ next to model.bim; model.bim is kept as model.bim.legacy
+    --no-verify           Skip the read-back check of object declarations
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - Converted and verified
+    1 - Converted, but verification found differences
+    2 - model.bim not found, or output already exists
+
+Examples:
+    python bim_tmdl_splitter.py "Sales.SemanticModel" --in-place
+    python bim_tmdl_splitter.py "Sales.SemanticModel/model.bim" --output "Sales TMDL.SemanticModel"
+"""
+
+import sys
+import json
+import time
+import shutil
+import argparse
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pbi_merger_utils import BimParser, TmdlParser
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+INDENT = "\t"
+PBISM_TMDL_VERSION = "4.0"
+
+# Child collections: BIM array key -> TMDL object keyword
+CHILD_KINDS = {
+    "columns": "column", "measures": "measure", "hierarchies": "hierarchy", "levels": "level",
+    "partitions": "partition", "calculationItems": "calculationItem",
+    "tablePermissions": "tablePermission", "columnPermissions": "columnPermission", "members": "member",
+    "perspectiveTables": "perspectiveTable", "perspectiveColumns": "perspectiveColumn",
+    "perspectiveMeasures": "perspectiveMeasure", "perspectiveHierarchies": "perspectiveHierarchy",
+    "queryGroups": "queryGroup", "annotations": "annotation", "extendedProperties": "extendedProperty",
+}
+# Written after properties and other children, as Power BI Desktop does
+TRAILING_CHILDREN = ("annotations", "extendedProperties")
+
+# Property holding the expression written after "=" on the declaration line
+DECLARATION_EXPRESSIONS = {
+    "measure": "expression", "column": "expression", "calculationItem": "expression",
+    "expression": "expression", "tablePermission": "filterExpression", "annotation": "value",
+}
+NAME_KEYS = {"member": "memberName", "queryGroup": "folder"}
+# Declared without quoting (culture names such as en-US)
+UNQUOTED_KINDS = {"cultureInfo"}
+
+# Properties that reference another object by name (quoted like a declaration name)
+NAME_REFERENCES = {"sortByColumn", "column", "dataSource"}
+# Properties dropped because TMDL derives them (column type) or merges them (relationship tables)
+SKIPPED_PROPERTIES = {
+    "column": {"type"},
+    "relationship": {"fromTable", "toTable"},
+    "expression": {"kind"},
+}
+SKIPPED_COLUMN_TYPES = {"rowNumber"}
+
+INVALID_FILE_CHARS = '<>:"/\\|?*%'
+
+
+def _file_name(name: str) -> str:
+    """Object name as a file name; characters invalid on Windows are %-encoded."""
+    return "".join(f"%{ord(c):02X}" if c in INVALID_FILE_CHARS or ord(c) < 32 else c for c in name)
+
+
+def _expression_text(value: Any) -> str:
+    text = "\n".join(value) if isinstance(value, list) else str(value)
+    lines = text.replace("\r\n", "\n").split("\n")
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return "\n".join(lines)
+
+
+def _scalar(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    text = str(value)
+    if not text or text != text.strip() or '"' == text[:1]:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+class TmdlWriter:
+    """Serializes BIM (TOM JSON) objects as TMDL text."""
+
+    def __init__(self):
+        self.warnings: List[str] = []
+
+    def _expression_lines(self, head: str, value: Any, depth: int) -> List[str]:
+        """'head = expr' on one line, or 'head =' followed by the expression two levels deeper."""
+        text = _expression_text(value)
+        if "\n" not in text:
+            return [f"{INDENT * depth}{head} = {text}"]
+        body = INDENT * (depth + 2)
+        return [f"{INDENT * depth}{head} ="] + [body + line if line.strip() else "" for line in text.split("\n")]
+
+    def _description(self, obj: Dict[str, Any], depth: int) -> List[str]:
+        description = obj.get("description")
+        if not description:
+            return []
+        text = "\n".join(description) if isinstance(description, list) else description
+        return [f"{INDENT * depth}/// {line}".rstrip() for line in text.split("\n")]
+
+    def write_object(self, kind: str, obj: Dict[str, Any], depth: int = 0,
+                     name: Optional[str] = None) -> List[str]:
+        """Serialize one object (declaration, properties, children) at the given depth."""
+        if name is None:
+            name = obj.get(NAME_KEYS.get(kind, "name"), "")
+        quoted = str(name) if kind in UNQUOTED_KINDS else TmdlParser.quote_name(str(name))
+        head = f"{kind} {quoted}" if name != "" else kind
+        lines = self._description(obj, depth)
+
+        expression_key = DECLARATION_EXPRESSIONS.get(kind)
+        if kind == "partition" and isinstance(obj.get("source"), dict):
+            lines.append(f"{INDENT * depth}{head} = {obj['source'].get('type', 'm')}")
+        elif kind == "extendedProperty":
+            lines.extend(self._expression_lines(head, json.dumps(obj.get("value"), indent=2), depth))
+        elif expression_key and expression_key in obj:
+            lines.extend(self._expression_lines(head, obj[expression_key], depth))
+        else:
+            lines.append(INDENT * depth + head)
+
+        skipped = SKIPPED_PROPERTIES.get(kind, set()) | {"name", "description", NAME_KEYS.get(kind, "name")}
+        if expression_key:
+            skipped.add(expression_key)
+        if kind == "extendedProperty":
+            skipped.add("value")
+        children = []
+        for key, value in obj.items():
+            if key in skipped:
+                continue
+            if key in CHILD_KINDS and isinstance(value, list):
+                children.append((key, value))
+            elif kind == "relationship" and key in ("fromColumn", "toColumn"):
+                table = obj.get("fromTable" if key == "fromColumn" else "toTable", "")
+                lines.append(f"{INDENT * (depth + 1)}{key}: "
+                             f"{TmdlParser.quote_name(table)}.{TmdlParser.quote_name(value)}")
+            elif kind == "partition" and key == "source" and isinstance(value, dict):
+                lines.extend(self._source(value, depth + 1))
+            elif key == "changedProperties" and isinstance(value, list):
+                for changed in value:
+                    lines.append(f"{INDENT * (depth + 1)}changedProperty = {changed.get('property')}")
+            else:
+                lines.extend(self._property(key, value, depth + 1))
+
+        children.sort(key=lambda c: c[0] in TRAILING_CHILDREN)
+        for key, items in children:
+            child_kind = CHILD_KINDS[key]
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                if child_kind == "column" and item.get("type") in SKIPPED_COLUMN_TYPES:
+                    continue
+                lines.append("")
+                lines.extend(self.write_object(child_kind, item, depth + 1))
+        return lines
+
+    def _property(self, key: str, value: Any, depth: int) -> List[str]:
+        if isinstance(value, bool) and value:
+            return [f"{INDENT * depth}{key}"]
+        if key == "linguisticMetadata" and isinstance(value, dict) and "content" in value:
+            content = value["content"]
+            lines = self._expression_lines(key, content if isinstance(content, str) else json.dumps(content, indent=2), depth)
+            if value.get("contentType"):
+                lines.append(f"{INDENT * (depth + 1)}contentType: {value['contentType']}")
+            return lines
+        if isinstance(value, dict):
+            if set(value) == {"expression"}:
+                return self._expression_lines(key, value["expression"], depth)
+            lines = [INDENT * depth + key]
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, list) and sub_value and all(isinstance(i, dict) for i in sub_value):
+                    for item in sub_value:
+                        lines.append("")
+                        lines.extend(self.write_object(CHILD_KINDS.get(sub_key, sub_key.rstrip("s")), item, depth + 1))
+                else:
+                    lines.extend(self._property(sub_key, sub_value, depth + 1))
+            return lines
+        if isinstance(value, list):
+            if all(isinstance(i, str) for i in value) and key in ("expression", "query"):
+                return self._expression_lines(key, value, depth)
+            return self._expression_lines(key, json.dumps(value, indent=2), depth)
+        if isinstance(value, str) and "\n" in value:
+            return self._expression_lines(key, value, depth)
+        if key in NAME_REFERENCES and isinstance(value, str):
+            return [f"{INDENT * depth}{key}: {TmdlParser.quote_name(value)}"]
+        return [f"{INDENT * depth}{key}: {_scalar(value)}"]
+
+    def _source(self, source: Dict[str, Any], depth: int) -> List[str]:
+        """Partition source: 'source = <expr>' for M/DAX, otherwise a property block."""
+        if "expression" in source:
+            lines = self._expression_lines("source", source["expression"], depth)
+            for key, value in source.items():
+                if key not in ("type", "expression"):
+                    lines.extend(self._property(key, value, depth))
+            return lines
+        if set(source) <= {"type"}:
+            return []  # e.g. calculation group partitions: the declaration is enough
+        lines = [INDENT * depth + "source"]
+        for key, value in source.items():
+            if key == "query":
+                lines.extend(self._expression_lines(key, value, depth + 1))
+            elif key != "type":
+                lines.extend(self._property(key, value, depth + 1))
+        return lines
+
+    def write_file(self, kind: str, objects: List[Dict[str, Any]]) -> str:
+        """Several top-level objects in one file (relationships.tmdl, expressions.tmdl, ...)."""
+        blocks = ["\n".join(self.write_object(kind, obj)) for obj in objects]
+        return "\n\n".join(blocks) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Verification
+# ---------------------------------------------------------------------------
+
+VERIFIED_KINDS = {"table", "column", "measure", "hierarchy", "level", "partition", "calculationItem"}
+
+
+def bim_declarations(table: Dict[str, Any]) -> Set[Tuple[str, str, str]]:
+    """(table, kind, name) for every object of a BIM table that TMDL declares."""
+    name = table.get("name", "")
+    found = {(name, "table", name)}
+    for column in table.get("columns", []):
+        if column.get("type") not in SKIPPED_COLUMN_TYPES:
+            found.add((name, "column", column.get("name", "")))
+    for measure in table.get("measures", []):
+        found.add((name, "measure", measure.get("name", "")))
+    for hierarchy in table.get("hierarchies", []):
+        found.add((name, "hierarchy", hierarchy.get("name", "")))
+        for level in hierarchy.get("levels", []):
+            found.add((name, "level", level.get("name", "")))
+    for partition in table.get("partitions", []):
+        found.add((name, "partition", partition.get("name", "")))
+    for item in (table.get("calculationGroup") or {}).get("calculationItems", []):
+        found.add((name, "calculationItem", item.get("name", "")))
+    return found
+
+
+def tmdl_declarations(content: str) -> Set[Tuple[str, str, str]]:
+    found = set()
+    for decl in TmdlParser.iter_declarations(content):
+        if decl["kind"] in VERIFIED_KINDS:
+            table = decl["name"] if decl["kind"] == "table" else decl["table"]
+            found.add((table or "", decl["kind"], decl["name"]))
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Splitting
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SplitResult:
+    """Conversion summary"""
+    source: str
+    output: str
+    bim_bytes: int = 0
+    tables: int = 0
+    files_written: int = 0
+    largest_file_bytes: int = 0
+    verified: Optional[bool] = None
+    differences: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+class BimTmdlSplitter:
+    """Stream a model.bim into the TMDL definition folder layout."""
+
+    # Model members written to their own files / folders
+    FILE_MEMBERS = {"relationships": "relationship", "expressions": "expression", "dataSources": "dataSource"}
+    FOLDER_MEMBERS = {"roles": "role", "perspectives": "perspective", "cultures": "cultureInfo"}
+
+    def __init__(self, bim_path, output_path=None, in_place: bool = False):
+        bim_path = Path(bim_path)
+        self.bim_path = bim_path / "model.bim" if bim_path.is_dir() else bim_path
+        if not self.bim_path.is_file():
+            raise FileNotFoundError(f"model.bim not found: {bim_path}")
+        if in_place == bool(output_path):
+            raise ValueError("Specify exactly one of --output or --in-place")
+        self.model_folder = self.bim_path.parent
+        self.in_place = in_place
+        self.output_path = self.model_folder if in_place else Path(output_path)
+        self.definition = self.output_path / "definition"
+        if (in_place and self.definition.exists()) or (not in_place and self.output_path.exists()):
+            raise FileExistsError(f"Output already exists: {self.definition if in_place else self.output_path}")
+        self.writer = TmdlWriter()
+
+    def _write(self, path: Path, text: str, result: SplitResult) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        size = len(text.encode('utf-8'))
+        result.files_written += 1
+        result.largest_file_bytes = max(result.largest_file_bytes, size)
+
+    def split(self, verify: bool = True) -> SplitResult:
+        started = time.perf_counter()
+        result = SplitResult(source=str(self.bim_path), output=str(self.definition),
+                             bim_bytes=self.bim_path.stat().st_size)
+        if not self.in_place:
+            shutil.copytree(self.model_folder, self.output_path, ignore=shutil.ignore_patterns("model.bim"))
+        tables_dir = self.definition / "tables"
+        tables_dir.mkdir(parents=True)
+
+        top: Dict[str, Any] = {}
+        model: Dict[str, Any] = {}
+        table_names: List[str] = []
+        expected: Set[Tuple[str, str, str]] = set()
+        for key, index, value in BimParser.iter_model(str(self.bim_path)):
+            if key == "model.tables":
+                if index is None:
+                    continue
+                name = value.get("name", f"Table{index}")
+                table_names.append(name)
+                self._write(tables_dir / f"{_file_name(name)}.tmdl",
+                            "\n".join(self.writer.write_object("table", value)) + "\n", result)
+                if verify:
+                    expected |= bim_declarations(value)
+                result.tables += 1
+            elif key.startswith("model."):
+                model[key[len("model."):]] = value
+            else:
+                top[key] = value
+
+        self._write_model_files(top, model, table_names, result)
+        self._update_pbism()
+        result.warnings.extend(self.writer.warnings)
+
+        if verify:
+            self.verify(expected, result)
+        if self.in_place:
+            self.bim_path.rename(self.bim_path.with_name("model.bim.legacy"))
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    def _write_model_files(self, top: Dict[str, Any], model: Dict[str, Any],
+                           table_names: List[str], result: SplitResult) -> None:
+        database = {k: v for k, v in top.items() if k not in ("name", "id")}
+        database_lines = self.writer.write_object("database", database, name=top.get("name", ""))
+        self._write(self.definition / "database.tmdl", "\n".join(database_lines) + "\n", result)
+
+        model_props = {}
+        for key, value in model.items():
+            if key in self.FILE_MEMBERS and isinstance(value, list):
+                if value:
+                    self._write(self.definition / f"{key}.tmdl",
+                                self.writer.write_file(self.FILE_MEMBERS[key], value), result)
+            elif key in self.FOLDER_MEMBERS and isinstance(value, list):
+                for obj in value:
+                    if key == "cultures" and obj.get("translations"):
+                        self.writer.warnings.append(
+                            f"Culture {obj.get('name')}: translations not converted; re-add them in Power BI Desktop")
+                        obj = {k: v for k, v in obj.items() if k != "translations"}
+                    text = "\n".join(self.writer.write_object(self.FOLDER_MEMBERS[key], obj)) + "\n"
+                    self._write(self.definition / key / f"{_file_name(str(obj.get('name', '')))}.tmdl", text, result)
+            else:
+                model_props[key] = value
+
+        model_lines = self.writer.write_object("model", model_props, name="Model")
+        model_lines.append("")
+        for name in table_names:
+            model_lines.append(f"ref table {TmdlParser.quote_name(name)}")
+        for culture in model.get("cultures", []) or []:
+            model_lines.append(f"ref cultureInfo {culture.get('name', '')}")
+        self._write(self.definition / "model.tmdl", "\n".join(model_lines) + "\n", result)
+
+    def _update_pbism(self) -> None:
+        """TMDL definition folders require definition.pbism version 4.0 or later."""
+        pbism = self.output_path / "definition.pbism"
+        if not pbism.is_file():
+            return
+        with open(pbism, 'r', encoding='utf-8-sig') as f:
+            data = json.load(f)
+        try:
+            major = float(str(data.get("version", "1.0")).split(".")[0])
+        except ValueError:
+            major = 0
+        if major < 4:
+            data["version"] = PBISM_TMDL_VERSION
+            with open(pbism, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+                f.write("\n")
+
+    def verify(self, expected: Set[Tuple[str, str, str]], result: SplitResult) -> None:
+        """Read the written table files back and compare their declarations with the BIM."""
+        found: Set[Tuple[str, str, str]] = set()
+        for tmdl_file in sorted((self.definition / "tables").glob("*.tmdl")):
+            found |= tmdl_declarations(tmdl_file.read_text(encoding='utf-8'))
+        for table, kind, name in sorted(expected - found)[:50]:
+            result.differences.append(f"Missing {kind} {table}[{name}]")
+        for table, kind, name in sorted(found - expected)[:50]:
+            result.differences.append(f"Unexpected {kind} {table}[{name}]")
+        result.verified = not result.differences
+
+
+def format_result(result: SplitResult) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("BIM TO TMDL SPLIT")
+    lines.append("=" * 80)
+    lines.append(f"Source: {result.source}")
+    lines.append(f"Output: {result.output}")
+    lines.append(f"Tables: {result.tables} | Files: {result.files_written} | {result.elapsed_ms} ms")
+    lines.append(f"model.bim: {result.bim_bytes / 1024:,.0f} KB -> largest TMDL file: "
+                 f"{result.largest_file_bytes / 1024:,.1f} KB")
+    if result.verified is True:
+        lines.append("✅ All tables, columns, measures, hierarchies and partitions present")
+    elif result.verified is False:
+        lines.append(f"❌ Verification found {len(result.differences)} difference(s):")
+        for diff in result.differences:
+            lines.append(f"  - {diff}")
+    for warning in result.warnings:
+        lines.append(f"⚠️ {warning}")
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split a model.bim into the TMDL folder layout",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("bim_path", help="Path to model.bim or its .SemanticModel folder")
+    parser.add_argument("--output", help="Write a converted copy of the .SemanticModel folder here")
+    parser.add_argument("--in-place", action="store_true", help="Convert in place (keeps model.bim.legacy)")
+    parser.add_argument("--no-verify", action="store_true", help="Skip declaration read-back check")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        splitter = BimTmdlSplitter(args.bim_path, args.output, args.in_place)
+        result = splitter.split(verify=not args.no_verify)
+    except (FileNotFoundError, FileExistsError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(asdict(result), indent=2, ensure_ascii=False))
+    else:
+        print(format_result(result))
+
+    sys.exit(1 if result.verified is False else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ a detailed layout report showing visual positions, sizes, types, and data fields
 
 Usage:
     python extract_visual_layout.py <report_path> <page_id> [options]
+    python extract_visual_layout.py <report_path> --all [options]
 
 Arguments:
     report_path: Path to .Report folder (e.g., "project.Report")
@@ -16,6 +17,11 @@ Options:
     --list-pages: List all available page IDs in the report
     --output <file>: Write report to file instead of stdout
     --json: Output as JSON instead of formatted report
+    --all: Extract every page (in pages.json order) into one Markdown/JSON document.
+           Visuals are loaded in parallel and the result is cached in
+           <project>/.pbi-squire-cache/ until a page or visual file changes.
+    --workers <n>: Number of parallel readers for --all (default: Python's default)
+    --no-cache: Do not read or write the --all cache
 
 Examples:
     # List available pages
@@ -29,13 +35,23 @@ Examples:
 
     # Get JSON output
     python extract_visual_layout.py "PSSR Commissions.Report" "feaad185bc0ca0d442fb" --json
+
+    # Whole report as one Markdown document
+    python extract_visual_layout.py "PSSR Commissions.Report" --all --output layout.md
 """
 
+import hashlib
 import json
+import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+CACHE_DIR_NAME = ".pbi-squire-cache"
+LAYOUT_CACHE_VERSION = 3
+DEFAULT_CANVAS = (1280, 720)
+
 
 def list_pages(report_path):
     """List all available pages in the report."""
@@ -68,6 +84,97 @@ def list_pages(report_path):
     return pages
 
 
+def parse_visual(data):
+    """Extract layout properties and data fields from a parsed visual.json object."""
+    container_id = data.get("name", "unknown")
+    position = data.get("position", {})
+    visual = data.get("visual", {})
+
+    # Extract basic properties
+    visual_type = visual.get("visualType", "unknown")
+    x = position.get("x", 0)
+    y = position.get("y", 0)
+    width = position.get("width", 0)
+    height = position.get("height", 0)
+    z = position.get("z", 0)
+    tab_order = position.get("tabOrder", 0)
+
+    # Extract title from visualContainerObjects
+    title = "No title"
+    vc_objects = visual.get("visualContainerObjects", {})
+    if "title" in vc_objects:
+        title_obj = vc_objects["title"]
+        if isinstance(title_obj, list) and len(title_obj) > 0:
+            title_props = title_obj[0].get("properties", {})
+            text_expr = title_props.get("text", {}).get("expr", {})
+            if "Literal" in text_expr:
+                title = text_expr["Literal"].get("Value", "No title").strip("'")
+
+    # Extract data fields
+    query = visual.get("query", {})
+    query_state = query.get("queryState", {})
+    fields = []
+
+    for role, role_data in query_state.items():
+        if isinstance(role_data, dict) and "projections" in role_data:
+            for projection in role_data["projections"]:
+                field_info = projection.get("field", {})
+                display_name = projection.get("displayName") or projection.get("nativeQueryRef", "")
+
+                # Determine if it's a measure or column
+                if "Measure" in field_info:
+                    measure_prop = field_info["Measure"].get("Property", "")
+                    fields.append(f"[Measure] {measure_prop}" + (f" as '{display_name}'" if display_name else ""))
+                elif "Column" in field_info:
+                    col_prop = field_info["Column"].get("Property", "")
+                    entity = field_info["Column"].get("Expression", {}).get("SourceRef", {}).get("Entity", "")
+                    fields.append(f"[Column] {entity}.{col_prop}" + (f" as '{display_name}'" if display_name else ""))
+
+    # Check if it's a slicer
+    is_slicer = visual_type == "slicer"
+
+    # Parent group
+    parent_group = data.get("parentGroupName", "None")
+
+    return {
+        "container_id": container_id,
+        "visual_type": visual_type,
+        "title": title,
+        "x": x,
+        "y": y,
+        "width": width,
+        "height": height,
+        "z_index": z,
+        "tab_order": tab_order,
+        "fields": fields,
+        "is_slicer": is_slicer,
+        "is_hidden": bool(data.get("isHidden", False)),
+        "is_group": "visualGroup" in data,
+        "parent_group": parent_group
+    }
+
+
+def load_visual(visual_json_path):
+    """Read one visual.json file and return its parsed layout entry."""
+    with open(visual_json_path, 'r', encoding='utf-8') as f:
+        return parse_visual(json.load(f))
+
+
+def _load_visual_job(job):
+    """Load one (page_id, path) job; returns (visual, None) or (None, skip record)."""
+    page_id, path = job
+    try:
+        return load_visual(path), None
+    except (OSError, ValueError) as e:
+        return None, {"page": page_id, "file": str(path), "error": str(e)}
+
+
+def sort_visuals(visual_data):
+    """Sort by y coordinate (top to bottom), then x (left to right)."""
+    visual_data.sort(key=lambda v: (v["y"], v["x"]))
+    return visual_data
+
+
 def extract_visual_layout(report_path, page_id):
     """Extract visual layout data from a specific page."""
     visuals_path = Path(report_path) / "definition" / "pages" / page_id / "visuals"
@@ -82,78 +189,154 @@ def extract_visual_layout(report_path, page_id):
         if visual_dir.is_dir():
             visual_json_path = visual_dir / "visual.json"
             if visual_json_path.exists():
-                with open(visual_json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                container_id = data.get("name", "unknown")
-                position = data.get("position", {})
-                visual = data.get("visual", {})
-
-                # Extract basic properties
-                visual_type = visual.get("visualType", "unknown")
-                x = position.get("x", 0)
-                y = position.get("y", 0)
-                width = position.get("width", 0)
-                height = position.get("height", 0)
-                z = position.get("z", 0)
-                tab_order = position.get("tabOrder", 0)
-
-                # Extract title from visualContainerObjects
-                title = "No title"
-                vc_objects = visual.get("visualContainerObjects", {})
-                if "title" in vc_objects:
-                    title_obj = vc_objects["title"]
-                    if isinstance(title_obj, list) and len(title_obj) > 0:
-                        title_props = title_obj[0].get("properties", {})
-                        text_expr = title_props.get("text", {}).get("expr", {})
-                        if "Literal" in text_expr:
-                            title = text_expr["Literal"].get("Value", "No title").strip("'")
-
-                # Extract data fields
-                query = visual.get("query", {})
-                query_state = query.get("queryState", {})
-                fields = []
-
-                for role, role_data in query_state.items():
-                    if isinstance(role_data, dict) and "projections" in role_data:
-                        for projection in role_data["projections"]:
-                            field_info = projection.get("field", {})
-                            display_name = projection.get("displayName") or projection.get("nativeQueryRef", "")
-
-                            # Determine if it's a measure or column
-                            if "Measure" in field_info:
-                                measure_prop = field_info["Measure"].get("Property", "")
-                                fields.append(f"[Measure] {measure_prop}" + (f" as '{display_name}'" if display_name else ""))
-                            elif "Column" in field_info:
-                                col_prop = field_info["Column"].get("Property", "")
-                                entity = field_info["Column"].get("Expression", {}).get("SourceRef", {}).get("Entity", "")
-                                fields.append(f"[Column] {entity}.{col_prop}" + (f" as '{display_name}'" if display_name else ""))
-
-                # Check if it's a slicer
-                is_slicer = visual_type == "slicer"
-
-                # Parent group
-                parent_group = data.get("parentGroupName", "None")
-
-                visual_data.append({
-                    "container_id": container_id,
-                    "visual_type": visual_type,
-                    "title": title,
-                    "x": x,
-                    "y": y,
-                    "width": width,
-                    "height": height,
-                    "z_index": z,
-                    "tab_order": tab_order,
-                    "fields": fields,
-                    "is_slicer": is_slicer,
-                    "parent_group": parent_group
-                })
-
-    # Sort by y coordinate (top to bottom), then x (left to right)
-    visual_data.sort(key=lambda v: (v["y"], v["x"]))
+                visual_data.append(load_visual(visual_json_path))
+
+    return sort_visuals(visual_data)
+
+
+def _scan_report(pages_path):
+    """
+    Stat every page.json / visual.json under pages/ in one directory walk.
+
+    Returns:
+        (pages, signature) where pages maps page_id -> {"page_json", "visuals"}
+        and signature is a hash of every path, mtime and size (directory mtimes
+        alone miss in-place edits to existing files).
+    """
+    pages = {}
+    digest = hashlib.sha1()
+
+    for page_entry in sorted(os.scandir(pages_path), key=lambda e: e.name):
+        if not page_entry.is_dir():
+            if page_entry.name == "pages.json":
+                st = page_entry.stat()
+                digest.update(f"pages.json|{st.st_mtime_ns}|{st.st_size}\n".encode('utf-8'))
+            continue
+
+        page = {"page_json": None, "visuals": []}
+        page_json = os.path.join(page_entry.path, "page.json")
+        if os.path.isfile(page_json):
+            st = os.stat(page_json)
+            digest.update(f"{page_entry.name}/page.json|{st.st_mtime_ns}|{st.st_size}\n".encode('utf-8'))
+            page["page_json"] = page_json
+
+        visuals_dir = os.path.join(page_entry.path, "visuals")
+        if os.path.isdir(visuals_dir):
+            for visual_entry in sorted(os.scandir(visuals_dir), key=lambda e: e.name):
+                visual_json = os.path.join(visual_entry.path, "visual.json")
+                if not visual_entry.is_dir() or not os.path.isfile(visual_json):
+                    continue
+                st = os.stat(visual_json)
+                digest.update(f"{page_entry.name}/{visual_entry.name}|{st.st_mtime_ns}|{st.st_size}\n".encode('utf-8'))
+                page["visuals"].append(visual_json)
+
+        pages[page_entry.name] = page
+
+    return pages, digest.hexdigest()
+
+
+def _page_order(pages_path, page_ids):
+    """Order pages by pages.json pageOrder, then any unlisted pages by folder name."""
+    order = []
+    pages_json = Path(pages_path) / "pages.json"
+    if pages_json.exists():
+        try:
+            with open(pages_json, 'r', encoding='utf-8') as f:
+                order = [p for p in json.load(f).get("pageOrder", []) if p in page_ids]
+        except (json.JSONDecodeError, OSError):
+            order = []
+    listed = set(order)
+    return order + sorted(p for p in page_ids if p not in listed)
+
+
+def _load_page_meta(page_id, page_json):
+    meta = {"id": page_id, "name": page_id, "width": DEFAULT_CANVAS[0], "height": DEFAULT_CANVAS[1]}
+    if page_json:
+        try:
+            with open(page_json, 'r', encoding='utf-8') as f:
+                page_data = json.load(f)
+            meta["name"] = page_data.get("displayName", page_id)
+            meta["width"] = page_data.get("width", meta["width"])
+            meta["height"] = page_data.get("height", meta["height"])
+        except (json.JSONDecodeError, OSError):
+            pass
+    return meta
+
+
+def layout_cache_path(report_path):
+    """Cache location: <project>/.pbi-squire-cache/<report>.visual_layout.json"""
+    report_folder = Path(report_path).resolve()
+    return report_folder.parent / CACHE_DIR_NAME / f"{report_folder.name}.visual_layout.json"
+
+
+def extract_report_layout(report_path, workers=None, use_cache=True):
+    """
+    Extract visual layout data for every page of a report in one pass.
+
+    All visual.json files are loaded concurrently. The result is cached and
+    reused as long as no page or visual file was added, removed or modified.
+
+    Returns:
+        Dict with report-level counts and a "pages" list (in pages.json order),
+        each page carrying its display name, canvas size and sorted visuals
+    """
+    pages_path = Path(report_path) / "definition" / "pages"
+    if not pages_path.exists():
+        raise FileNotFoundError(f"Pages directory not found: {pages_path}")
+
+    scanned, signature = _scan_report(pages_path)
+
+    cache_file = layout_cache_path(report_path)
+    if use_cache and cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("version") == LAYOUT_CACHE_VERSION and cached.get("signature") == signature:
+                return cached["layout"]
+        except (json.JSONDecodeError, OSError, KeyError):
+            pass
+
+    ordered_ids = _page_order(pages_path, scanned.keys())
+    jobs = [(page_id, path) for page_id in ordered_ids for path in scanned[page_id]["visuals"]]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        metas = list(pool.map(lambda pid: _load_page_meta(pid, scanned[pid]["page_json"]), ordered_ids))
+        loaded = list(pool.map(_load_visual_job, jobs))
+
+    # One unreadable or malformed visual.json is skipped rather than failing the report
+    by_page = {page_id: [] for page_id in ordered_ids}
+    skipped = []
+    for (page_id, _), (visual, skip) in zip(jobs, loaded):
+        if skip:
+            skipped.append(skip)
+        else:
+            by_page[page_id].append(visual)
 
-    return visual_data
+    pages = []
+    for meta in metas:
+        page_visuals = sort_visuals(by_page[meta["id"]])
+        pages.append(dict(meta, visual_count=len(page_visuals), visuals=page_visuals))
+
+    layout = {
+        "report_path": str(report_path),
+        "page_count": len(pages),
+        "visual_count": len(jobs) - len(skipped),
+        "skipped_visuals": skipped,
+        "pages": pages
+    }
+
+    if use_cache:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"version": LAYOUT_CACHE_VERSION, "signature": signature, "layout": layout},
+                          f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # Cache is an optimization only
+
+    return layout
 
 
 def format_report(visual_data, page_id):
@@ -226,6 +409,43 @@ def format_report(visual_data, page_id):
     return "\n".join(lines)
 
 
+def _md_cell(value):
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def format_report_markdown(layout):
+    """Generate a single Markdown document covering every page."""
+    lines = []
+    lines.append(f"# Visual Layout: {Path(layout['report_path']).name}")
+    lines.append("")
+    lines.append(f"**Pages:** {layout['page_count']} | **Visuals:** {layout['visual_count']}")
+    lines.append("")
+    if layout.get("skipped_visuals"):
+        lines.append(f"**Skipped (unreadable visual.json):** {len(layout['skipped_visuals'])}")
+        lines.append("")
+
+    for page in layout["pages"]:
+        lines.append(f"## {page['name']}")
+        lines.append("")
+        lines.append(f"Page ID: `{page['id']}` | Canvas: {page['width']} x {page['height']} | Visuals: {page['visual_count']}")
+        lines.append("")
+        if not page["visuals"]:
+            lines.append("_No visuals_")
+            lines.append("")
+            continue
+        lines.append("| # | Type | Title | X | Y | Width | Height | Z | Fields |")
+        lines.append("|---|------|-------|---|---|-------|--------|---|--------|")
+        for idx, v in enumerate(page["visuals"], 1):
+            fields = "<br>".join(_md_cell(f) for f in v["fields"])
+            lines.append(
+                f"| {idx} | {v['visual_type']} | {_md_cell(v['title'])} | {v['x']:.0f} | {v['y']:.0f} "
+                f"| {v['width']:.0f} | {v['height']:.0f} | {v['z_index']} | {fields} |"
+            )
+        lines.append("")
+
+    return "\n".join(lines)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract and analyze visual layout from Power BI Report pages",
@@ -238,6 +458,9 @@ def main():
     parser.add_argument("--list-pages", action="store_true", help="List all available pages")
     parser.add_argument("--output", help="Write report to file instead of stdout")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--all", action="store_true", help="Extract every page into one document")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel readers for --all")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the --all layout cache")
 
     args = parser.parse_args()
 
@@ -263,19 +486,26 @@ def main():
         sys.exit(0)
 
     # Validate required arguments
-    if not args.report_path or not args.page_id:
+    if not args.report_path or not (args.page_id or args.all):
         parser.print_help()
         sys.exit(1)
 
     try:
-        # Extract visual data
-        visual_data = extract_visual_layout(args.report_path, args.page_id)
-
-        # Generate output
-        if args.json:
-            output = json.dumps(visual_data, indent=2)
+        if args.all:
+            # Extract every page in one pass (cached)
+            layout = extract_report_layout(args.report_path, args.workers, use_cache=not args.no_cache)
+            for skip in layout.get("skipped_visuals", []):
+                print(f"Warning: skipped {skip['file']}: {skip['error']}", file=sys.stderr)
+            output = json.dumps(layout, indent=2) if args.json else format_report_markdown(layout)
         else:
-            output = format_report(visual_data, args.page_id)
+            # Extract visual data
+            visual_data = extract_visual_layout(args.report_path, args.page_id)
+
+            # Generate output
+            if args.json:
+                output = json.dumps(visual_data, indent=2)
+            else:
+                output = format_report(visual_data, args.page_id)
 
         # Write output
         if args.output:
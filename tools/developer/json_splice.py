@@ -0,0 +1,245 @@
+"""
+Minimal-diff JSON Editing
+
+Helpers for editing JSON files without reformatting them: locate the span of a
+value by path in the raw text, splice a new value in, and render an edited
+document so that only the changed values differ from the original bytes.
+
+Shared by the PBIR visual editor, field renamer, page generator and the legacy
+report layout in pbi_merger_utils.
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+
+def parse_path_segment(segment: str) -> Tuple[str, int]:
+    """
+    Parse a path segment that may include array indexing.
+
+    Args:
+        segment: Path segment like "field" or "projections[0]"
+
+    Returns:
+        Tuple of (key, index) where index is -1 if not an array access
+
+    Examples:
+        parse_path_segment("field") -> ("field", -1)
+        parse_path_segment("projections[0]") -> ("projections", 0)
+    """
+    match = re.match(r'^([^\[]+)\[(\d+)\]$', segment)
+    if match:
+        return (match.group(1), int(match.group(2)))
+    return (segment, -1)
+
+
+_MISSING = object()
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+_JSON_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_JSON_SCALAR = re.compile(r'[^,\]\}\s]+')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def path_tokens(json_path: Union[str, Sequence[Union[str, int]]]) -> List[Union[str, int]]:
+    """
+    Convert a dot path ("visual.query.projections[0].displayName") into a token list.
+
+    Sequences of keys/indices (as produced by pbir_field_index.iter_field_nodes) pass through.
+    """
+    if not isinstance(json_path, str):
+        return list(json_path)
+    tokens: List[Union[str, int]] = []
+    for segment in json_path.split('.'):
+        key, index = parse_path_segment(segment)
+        tokens.append(key)
+        if index >= 0:
+            tokens.append(index)
+    return tokens
+
+
+def lookup_path(obj: Any, tokens: Sequence[Union[str, int]]) -> Any:
+    """Return the value at tokens, or _MISSING (distinguishes absent keys from null)."""
+    current = obj
+    for token in tokens:
+        if isinstance(token, int):
+            if not isinstance(current, list) or token >= len(current):
+                return _MISSING
+        elif not isinstance(current, dict) or token not in current:
+            return _MISSING
+        current = current[token]
+    return current
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    return _JSON_WS.match(text, pos).end()
+
+
+def _skip_json_value(text: str, pos: int) -> int:
+    """Return the index just past the JSON value starting at pos."""
+    char = text[pos]
+    if char == '"':
+        return _JSON_STRING.match(text, pos).end()
+    if char not in '{[':
+        return _JSON_SCALAR.match(text, pos).end()
+    # The C scanner finds the end of a container far faster than a token walk
+    try:
+        return _JSON_DECODER.raw_decode(text, pos)[1]
+    except json.JSONDecodeError:
+        raise ValueError(f"Unterminated JSON container at offset {pos}")
+
+
+def _iter_members(text: str, pos: int):
+    """Yield (key, key_start, value_start, value_end) for the object opening at pos."""
+    pos = _skip_ws(text, pos + 1)
+    while text[pos] != '}':
+        key_end = _JSON_STRING.match(text, pos).end()
+        key = json.loads(text[pos:key_end])
+        value_start = _skip_ws(text, _skip_ws(text, key_end) + 1)
+        value_end = _skip_json_value(text, value_start)
+        yield key, pos, value_start, value_end
+        pos = _skip_ws(text, value_end)
+        if text[pos] == ',':
+            pos = _skip_ws(text, pos + 1)
+
+
+def _iter_items(text: str, pos: int):
+    """Yield (value_start, value_end) for the array opening at pos."""
+    pos = _skip_ws(text, pos + 1)
+    while text[pos] != ']':
+        value_end = _skip_json_value(text, pos)
+        yield pos, value_end
+        pos = _skip_ws(text, value_end)
+        if text[pos] == ',':
+            pos = _skip_ws(text, pos + 1)
+
+
+def locate_json_value(text: str, json_path) -> Optional[Tuple[int, int]]:
+    """
+    Locate the character span of the value at json_path inside raw JSON text.
+
+    Only the containers on the path are scanned; sibling values are skipped
+    without being decoded.
+
+    Returns:
+        (start, end) offsets of the value, or None if the path does not exist
+    """
+    tokens = path_tokens(json_path)
+    start = _skip_ws(text, 0)
+    if not tokens:
+        return start, _skip_json_value(text, start)
+    end = start
+    for token in tokens:
+        if isinstance(token, int):
+            if text[start] != '[':
+                return None
+            spans = _iter_items(text, start)
+            span = next((s for i, s in enumerate(spans) if i == token), None)
+        else:
+            if text[start] != '{':
+                return None
+            span = next(((vs, ve) for key, _, vs, ve in _iter_members(text, start) if key == token), None)
+        if span is None:
+            return None
+        start, end = span
+    return start, end
+
+
+def _line_indent(text: str, pos: int) -> str:
+    line_start = text.rfind('\n', 0, pos) + 1
+    return _JSON_WS.match(text, line_start).group().lstrip('\r\n')
+
+
+def _serialize_at(value: Any, text: str, pos: int, newline: str) -> str:
+    """Serialize value for splicing at pos, indenting nested lines to match the file."""
+    if not isinstance(value, (dict, list)) or not value:
+        return json.dumps(value, ensure_ascii=False)
+    rendered = json.dumps(value, indent=2, ensure_ascii=False)
+    indent = _line_indent(text, pos)
+    return rendered.replace('\n', newline + indent)
+
+
+def splice_json_value(text: str, json_path, value: Any) -> Optional[str]:
+    """
+    Return text with the value at json_path replaced by value, leaving every
+    other byte of the original document untouched.
+
+    If the final key does not exist yet but its parent object does, the member
+    is appended using the indentation and separators of its siblings.
+
+    Returns:
+        The edited text, or None when a minimal splice is not possible
+        (missing parent, empty parent object, array append)
+    """
+    tokens = path_tokens(json_path)
+    newline = '\r\n' if '\r\n' in text else '\n'
+
+    span = locate_json_value(text, tokens)
+    if span is not None:
+        start, end = span
+        return text[:start] + _serialize_at(value, text, start, newline) + text[end:]
+
+    if not tokens or isinstance(tokens[-1], int):
+        return None
+    parent = locate_json_value(text, tokens[:-1])
+    if parent is None or text[parent[0]] != '{':
+        return None
+    members = list(_iter_members(text, parent[0]))
+    if not members:
+        return None
+
+    _, first_key_start, first_value_start, _ = members[0]
+    leading = text[parent[0] + 1:first_key_start]
+    first_key_end = _JSON_STRING.match(text, first_key_start).end()
+    separator = text[first_key_end:first_value_start]
+    last_value_end = members[-1][3]
+
+    member = json.dumps(tokens[-1], ensure_ascii=False) + separator
+    rendered = _serialize_at(value, text, first_key_start, newline)
+    return text[:last_value_end] + ',' + leading + member + rendered + text[last_value_end:]
+
+
+def render_json_minimal(original_text: str, new_obj: Any, changed_paths: Sequence,
+                        original_obj: Any = _MISSING) -> str:
+    """
+    Render new_obj by splicing only the values at changed_paths into
+    original_text, preserving formatting, key order and escapes elsewhere.
+
+    Falls back to a full 2-space-indented dump (keeping the file's line
+    endings and trailing newline) when a path cannot be spliced.
+
+    Args:
+        original_text: Raw text of the document before editing
+        new_obj: Decoded document after editing
+        changed_paths: Dot paths or key/index sequences that were edited
+        original_obj: Decoded original, used to skip paths whose value is unchanged
+
+    Returns:
+        Text that decodes to exactly new_obj
+    """
+    newline = '\r\n' if '\r\n' in original_text else '\n'
+    text = original_text
+    for json_path in changed_paths:
+        tokens = path_tokens(json_path)
+        new_value = lookup_path(new_obj, tokens)
+        if new_value is _MISSING:
+            continue
+        if original_obj is not _MISSING and lookup_path(original_obj, tokens) == new_value:
+            continue
+        spliced = splice_json_value(text, tokens, new_value)
+        if spliced is None:
+            # Intermediate objects created by the edit are inserted whole at the first missing key
+            for depth in range(1, len(tokens)):
+                if locate_json_value(text, tokens[:depth]) is None:
+                    spliced = splice_json_value(text, tokens[:depth], lookup_path(new_obj, tokens[:depth]))
+                    break
+        text = spliced
+        if text is None:
+            break
+
+    # Guard: the spliced document must decode to exactly the edited object
+    if text is None or json.loads(text) != new_obj:
+        text = json.dumps(new_obj, indent=2, ensure_ascii=False).replace('\n', newline)
+        if original_text.endswith('\n'):
+            text += newline
+    return text
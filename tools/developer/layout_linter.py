@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Layout Linter
+
+Checks visual placement on every Power BI Report (PBIR) page and returns
+structured findings with suggested snapped coordinates, so layout review does
+not require pairwise comparison of positions by hand.
+
+Checks:
+    overlap             Two visible content visuals intersect
+    z_order_conflict    Overlapping visuals share a z-index (render order undefined),
+                        or a decorative shape/image is layered above content
+    misaligned_edge     An edge is within tolerance of, but not on, an alignment
+                        line shared by other visuals
+    uneven_gutter       Gap to the adjacent visual differs from the page's typical gutter on that axis
+    off_canvas          Visual extends beyond the page canvas
+
+Rectangles are bucketed into a uniform grid (spatial hash), so overlap and
+neighbour queries only compare visuals sharing grid cells; alignment uses one
+sort per edge. Hidden visuals (bookmark toggles) and group containers are
+excluded from overlap, z-order and spacing checks.
+
+Usage:
+    python layout_linter.py <report_path> [--page <page_id>] [--tolerance N] [--max-gutter N] [--json]
+
+Arguments:
+    report_path           Path to .Report folder
+
+Options:
+    --page <page_id>      Only lint this page (folder name)
+    --tolerance <px>      Near-miss distance for alignment and gutters (default: 5)
+    --max-gutter <px>     Largest gap treated as a gutter between neighbours (default: 40)
+    --no-cache            Do not use the extract_visual_layout.py layout cache
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - No layout issues
+    1 - Layout issues found
+    2 - Report or page not found
+
+Examples:
+    python layout_linter.py "Sales.Report"
+    python layout_linter.py "Sales.Report" --page feaad185bc0ca0d442fb --json
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from extract_visual_layout import extract_report_layout
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DECORATIVE_VISUAL_TYPES = {'shape', 'basicShape', 'image'}
+DEFAULT_TOLERANCE = 5.0
+DEFAULT_MAX_GUTTER = 40.0
+GRID_CELL_SIZE = 64.0
+
+
+@dataclass
+class Rect:
+    """Visual rectangle in page coordinates"""
+    name: str
+    visual_type: str
+    x: float
+    y: float
+    width: float
+    height: float
+    z: float = 0
+
+    @property
+    def right(self) -> float:
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> float:
+        return self.y + self.height
+
+    @property
+    def area(self) -> float:
+        return max(self.width, 0) * max(self.height, 0)
+
+    @property
+    def decorative(self) -> bool:
+        return self.visual_type in DECORATIVE_VISUAL_TYPES
+
+    def intersection(self, other: "Rect") -> Tuple[float, float]:
+        """Overlap (width, height); non-positive means no overlap on that axis."""
+        return (min(self.right, other.right) - max(self.x, other.x),
+                min(self.bottom, other.bottom) - max(self.y, other.y))
+
+
+@dataclass
+class LayoutIssue:
+    """One layout finding"""
+    issue_type: str
+    severity: str
+    visuals: List[str]
+    message: str
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+class GridIndex:
+    """Uniform-grid spatial hash over rectangles."""
+
+    def __init__(self, cell_size: float = GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    def _cells(self, x0: float, y0: float, x1: float, y1: float) -> Iterable[Tuple[int, int]]:
+        size = self.cell_size
+        for cx in range(int(x0 // size), int(x1 // size) + 1):
+            for cy in range(int(y0 // size), int(y1 // size) + 1):
+                yield cx, cy
+
+    def insert(self, key: int, rect: Rect) -> None:
+        for cell in self._cells(rect.x, rect.y, rect.right, rect.bottom):
+            self.cells[cell].append(key)
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> Set[int]:
+        found: Set[int] = set()
+        for cell in self._cells(x0, y0, x1, y1):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    def candidate_pairs(self) -> Set[Tuple[int, int]]:
+        pairs = set()
+        for bucket in self.cells.values():
+            for i in range(len(bucket)):
+                for j in range(i + 1, len(bucket)):
+                    a, b = bucket[i], bucket[j]
+                    pairs.add((a, b) if a < b else (b, a))
+        return pairs
+
+
+class PageLayoutLinter:
+    """Lints one page's visual rectangles."""
+
+    def __init__(self, rects: List[Rect], canvas: Tuple[float, float],
+                 tolerance: float = DEFAULT_TOLERANCE, max_gutter: float = DEFAULT_MAX_GUTTER):
+        self.rects = rects
+        self.canvas_width, self.canvas_height = canvas
+        self.tolerance = tolerance
+        self.max_gutter = max_gutter
+        self.issues: List[LayoutIssue] = []
+        self.snaps: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.reasons: Dict[str, List[str]] = defaultdict(list)
+        # Rects clamped by check_canvas, which may include hidden/group visuals not in rects
+        self.clamped: Dict[str, Rect] = {}
+
+        self.index = GridIndex(max(GRID_CELL_SIZE, max_gutter))
+        for i, rect in enumerate(rects):
+            self.index.insert(i, rect)
+
+    def run(self) -> Dict[str, Any]:
+        self.check_overlaps()
+        self.check_alignment()
+        self.check_gutters()
+        return {"issues": [asdict(i) for i in self.issues], "suggestions": self._suggestions()}
+
+    def check_overlaps(self) -> None:
+        tol = self.tolerance
+        for a_idx, b_idx in sorted(self.index.candidate_pairs()):
+            a, b = self.rects[a_idx], self.rects[b_idx]
+            overlap_w, overlap_h = a.intersection(b)
+            if overlap_w <= tol or overlap_h <= tol:
+                continue
+
+            if a.decorative or b.decorative:
+                # Shapes/images behind content are intentional backgrounds
+                deco, content = (a, b) if a.decorative else (b, a)
+                if not content.decorative and deco.z > content.z:
+                    self.issues.append(LayoutIssue(
+                        "z_order_conflict", "warning", [deco.name, content.name],
+                        f"Decorative {deco.visual_type} '{deco.name}' is layered above '{content.name}'",
+                        {"suggested_z": {deco.name: content.z - 1}}
+                    ))
+                continue
+
+            smaller = min(a.area, b.area) or 1
+            ratio = overlap_w * overlap_h / smaller
+            self.issues.append(LayoutIssue(
+                "overlap", "error" if ratio > 0.25 else "warning", [a.name, b.name],
+                f"'{a.name}' and '{b.name}' overlap by {overlap_w:.0f} × {overlap_h:.0f} px ({ratio:.0%} of the smaller visual)",
+                {"overlap_width": round(overlap_w, 2), "overlap_height": round(overlap_h, 2), "ratio": round(ratio, 3)}
+            ))
+            if a.z == b.z:
+                self.issues.append(LayoutIssue(
+                    "z_order_conflict", "warning", [a.name, b.name],
+                    f"Overlapping '{a.name}' and '{b.name}' share z-index {a.z:g}; render order is undefined",
+                    {"z": a.z}
+                ))
+
+    def check_alignment(self) -> None:
+        """Cluster each edge type by sorted sweep; snap near-misses to the dominant line."""
+        edges = {
+            "left": lambda r: r.x,
+            "right": lambda r: r.right,
+            "top": lambda r: r.y,
+            "bottom": lambda r: r.bottom,
+        }
+        content = [r for r in self.rects if not r.decorative]
+        for edge, getter in edges.items():
+            values = sorted(((round(getter(r), 2), r) for r in content), key=lambda item: item[0])
+            cluster: List[Tuple[float, Rect]] = []
+            for item in values + [(float("inf"), None)]:
+                if cluster and item[0] - cluster[-1][0] > self.tolerance:
+                    self._snap_cluster(edge, cluster)
+                    cluster = []
+                if item[1] is not None:
+                    cluster.append(item)
+
+    def _snap_cluster(self, edge: str, cluster: List[Tuple[float, Rect]]) -> None:
+        counts = Counter(value for value, _ in cluster)
+        if len(cluster) < 2 or len(counts) < 2:
+            return
+        # Dominant line: most visuals on it, then the smallest coordinate
+        target = min(counts, key=lambda v: (-counts[v], v))
+        for value, rect in cluster:
+            # Chained clusters can be wider than the tolerance; only snap true near-misses
+            if value == target or abs(value - target) > self.tolerance:
+                continue
+            self.snaps[rect.name][edge] = target
+            self.reasons[rect.name].append(f"{edge} edge {value:g} → {target:g}")
+            self.issues.append(LayoutIssue(
+                "misaligned_edge", "info", [rect.name],
+                f"{edge.capitalize()} edge of '{rect.name}' is at {value:g}, {abs(value - target):g} px off the "
+                f"{edge} line at {target:g}",
+                {"edge": edge, "current": value, "suggested": target,
+                 "aligned_with": [r.name for v, r in cluster if v == target]}
+            ))
+
+    def check_gutters(self) -> None:
+        """Find nearest right/lower neighbours via the grid and compare their gaps to the page's typical gutter."""
+        gaps: List[Tuple[str, float, Rect, Rect]] = []
+        content = [i for i, r in enumerate(self.rects) if not r.decorative]
+        content_set = set(content)
+
+        for i in content:
+            rect = self.rects[i]
+            for axis in ("horizontal", "vertical"):
+                if axis == "horizontal":
+                    window = (rect.right, rect.y, rect.right + self.max_gutter, rect.bottom)
+                else:
+                    window = (rect.x, rect.bottom, rect.right, rect.bottom + self.max_gutter)
+                best = None
+                for j in self.index.query(*window):
+                    if j == i or j not in content_set:
+                        continue
+                    other = self.rects[j]
+                    if axis == "horizontal":
+                        gap = other.x - rect.right
+                        shared = min(rect.bottom, other.bottom) - max(rect.y, other.y)
+                    else:
+                        gap = other.y - rect.bottom
+                        shared = min(rect.right, other.right) - max(rect.x, other.x)
+                    if shared <= 0 or gap < 0 or gap > self.max_gutter:
+                        continue
+                    if best is None or gap < best[0]:
+                        best = (gap, other)
+                if best:
+                    gaps.append((axis, round(best[0], 2), rect, best[1]))
+
+        # Typical gutter per axis (needs at least two gaps on that axis to be meaningful)
+        typical_by_axis = {}
+        for axis in ("horizontal", "vertical"):
+            axis_gaps = [round(g) for a, g, _, _ in gaps if a == axis]
+            if len(axis_gaps) >= 2:
+                counts = Counter(axis_gaps)
+                typical_by_axis[axis] = min(counts, key=lambda g: (-counts[g], g))
+
+        for axis, gap, rect, other in gaps:
+            typical = typical_by_axis.get(axis)
+            if typical is None or abs(gap - typical) <= self.tolerance:
+                continue
+            delta = typical - gap
+            if axis == "horizontal":
+                suggestion = {"visual": other.name, "x": round(other.x + delta, 2)}
+            else:
+                suggestion = {"visual": other.name, "y": round(other.y + delta, 2)}
+            self.issues.append(LayoutIssue(
+                "uneven_gutter", "info", [rect.name, other.name],
+                f"{axis.capitalize()} gap between '{rect.name}' and '{other.name}' is {gap:g} px "
+                f"(page gutter is {typical} px)",
+                {"axis": axis, "gap": gap, "typical_gutter": typical, "suggested": suggestion}
+            ))
+
+    def check_canvas(self, rects: List[Rect]) -> None:
+        for rect in rects:
+            overflow = {
+                "left": -rect.x if rect.x < 0 else 0,
+                "top": -rect.y if rect.y < 0 else 0,
+                "right": rect.right - self.canvas_width if rect.right > self.canvas_width else 0,
+                "bottom": rect.bottom - self.canvas_height if rect.bottom > self.canvas_height else 0,
+            }
+            overflow = {k: round(v, 2) for k, v in overflow.items() if v > 0.5}
+            if not overflow:
+                continue
+            width = min(rect.width, self.canvas_width)
+            height = min(rect.height, self.canvas_height)
+            clamped = {
+                "x": round(min(max(rect.x, 0), self.canvas_width - width), 2),
+                "y": round(min(max(rect.y, 0), self.canvas_height - height), 2),
+                "width": round(width, 2),
+                "height": round(height, 2)
+            }
+            self.snaps[rect.name]["clamp"] = clamped
+            self.clamped[rect.name] = rect
+            self.reasons[rect.name].append("moved inside canvas")
+            self.issues.append(LayoutIssue(
+                "off_canvas", "error", [rect.name],
+                f"'{rect.name}' extends beyond the {self.canvas_width:g} × {self.canvas_height:g} canvas "
+                f"({', '.join(f'{k} {v:g}px' for k, v in overflow.items())})",
+                {"overflow": overflow, "suggested": clamped}
+            ))
+
+    def _suggestions(self) -> List[Dict[str, Any]]:
+        """Combine edge snaps and canvas clamps into one suggested rectangle per visual."""
+        by_name = {r.name: r for r in self.rects}
+        by_name.update(self.clamped)
+        suggestions = []
+        for name, snaps in self.snaps.items():
+            rect = by_name[name]
+            left = snaps.get("left", rect.x)
+            top = snaps.get("top", rect.y)
+            right = snaps.get("right", left + rect.width if "left" in snaps else rect.right)
+            bottom = snaps.get("bottom", top + rect.height if "top" in snaps else rect.bottom)
+            suggested = {"x": left, "y": top, "width": right - left, "height": bottom - top}
+            if "clamp" in snaps:
+                suggested = snaps["clamp"]
+            suggested = {k: round(v, 2) for k, v in suggested.items()}
+            current = {"x": rect.x, "y": rect.y, "width": rect.width, "height": rect.height}
+            if suggested != current and suggested["width"] > 0 and suggested["height"] > 0:
+                suggestions.append({"visual": name, "current": current, "suggested": suggested,
+                                    "reasons": self.reasons[name]})
+        return sorted(suggestions, key=lambda s: (s["current"]["y"], s["current"]["x"]))
+
+
+def lint_page(page: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE,
+              max_gutter: float = DEFAULT_MAX_GUTTER) -> Dict[str, Any]:
+    """Lint one page from extract_report_layout() output."""
+    all_rects, visible = [], []
+    for v in page["visuals"]:
+        rect = Rect(v["container_id"], v["visual_type"], v["x"], v["y"], v["width"], v["height"], v.get("z_index", 0))
+        all_rects.append(rect)
+        if not v.get("is_hidden") and not v.get("is_group"):
+            visible.append(rect)
+
+    linter = PageLayoutLinter(visible, (page["width"], page["height"]), tolerance, max_gutter)
+    linter.check_canvas(all_rects)
+    result = linter.run()
+
+    by_type = Counter(issue["issue_type"] for issue in result["issues"])
+    return {
+        "page_id": page["id"],
+        "display_name": page["name"],
+        "canvas": {"width": page["width"], "height": page["height"]},
+        "visual_count": len(all_rects),
+        "checked_visuals": len(visible),
+        "issue_counts": dict(by_type),
+        **result
+    }
+
+
+def lint_report_layout(report_path, page_id: Optional[str] = None, tolerance: float = DEFAULT_TOLERANCE,
+                       max_gutter: float = DEFAULT_MAX_GUTTER, use_cache: bool = True) -> Dict[str, Any]:
+    """Lint every page (or one page) of a report."""
+    layout = extract_report_layout(report_path, use_cache=use_cache)
+    pages = layout["pages"]
+    if page_id:
+        pages = [p for p in pages if p["id"] == page_id]
+        if not pages:
+            raise FileNotFoundError(f"Page not found: {page_id}")
+
+    results = [lint_page(p, tolerance, max_gutter) for p in pages]
+    totals = Counter()
+    for r in results:
+        totals.update(r["issue_counts"])
+    return {
+        "report_path": str(report_path),
+        "tolerance": tolerance,
+        "max_gutter": max_gutter,
+        "issue_counts": dict(totals),
+        "pages": results
+    }
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    """Generate formatted text report."""
+    icons = {"error": "❌", "warning": "⚠️", "info": "ℹ️"}
+    lines = []
+    lines.append("=" * 100)
+    lines.append("LAYOUT LINT")
+    lines.append("=" * 100)
+    lines.append(f"Report: {result['report_path']}")
+    totals = ", ".join(f"{k}: {v}" for k, v in sorted(result["issue_counts"].items())) or "none"
+    lines.append(f"Issues: {totals}")
+
+    for page in result["pages"]:
+        lines.append("")
+        lines.append(f"--- {page['display_name']} ({page['page_id']}) - {page['checked_visuals']} visuals checked ---")
+        if not page["issues"]:
+            lines.append("  ✅ No layout issues")
+            continue
+        for issue in page["issues"]:
+            lines.append(f"  {icons.get(issue['severity'], '-')} [{issue['issue_type']}] {issue['message']}")
+        if page["suggestions"]:
+            lines.append("  Suggested positions:")
+            for s in page["suggestions"]:
+                cur, new = s["current"], s["suggested"]
+                lines.append(f"    {s['visual']}: ({cur['x']:g}, {cur['y']:g}, {cur['width']:g} × {cur['height']:g}) → "
+                             f"({new['x']:g}, {new['y']:g}, {new['width']:g} × {new['height']:g})")
+
+    lines.append("=" * 100)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Lint visual layout (overlap, alignment, spacing, canvas bounds) on PBIR pages",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("report_path", help="Path to .Report folder")
+    parser.add_argument("--page", help="Only lint this page ID")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Near-miss distance in px")
+    parser.add_argument("--max-gutter", type=float, default=DEFAULT_MAX_GUTTER, help="Largest gap treated as a gutter")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the layout cache")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        result = lint_report_layout(args.report_path, args.page, args.tolerance, args.max_gutter,
+                                    use_cache=not args.no_cache)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(result))
+
+    has_issues = any(p["issues"] for p in result["pages"])
+    sys.exit(1 if has_issues else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Layout Solver
+
+Deterministic grid-aligned layout for Power BI report pages. Given the visuals
+to place (with priority, size limits and grouping hints) and the page canvas,
+returns non-overlapping x/y/width/height for every visual, so page generation
+does not depend on hand-computed coordinates.
+
+Algorithm (shelf packing):
+    1. Order visuals by priority (1 = most important), keeping each group contiguous
+    2. Fill rows left to right at minimum width; start a new row when the next
+       visual (or its whole group, if it fits on an empty row) does not fit, or
+       when the priority tier changes
+    3. Grow widths in each row toward max_width until the row spans the content
+       width; grow row heights toward max_height until rows fill the canvas
+    4. Snap every size to the grid; x/y follow from margin + gutter
+
+Defaults follow the layout standards used by the page-layout-designer agent:
+8 px grid, 24 px margins, 16 px gutters. Priority and size limits default from
+the visual type when not given.
+
+Usage:
+    python layout_solver.py <spec.json | -> [--canvas WxH] [--margin N] [--gutter N] [--grid N]
+                            [--no-priority-rows] [--grow-canvas] [--json]
+
+Spec format:
+    {
+      "canvas": {"width": 1280, "height": 720},
+      "visuals": [
+        {"name": "Total Sales", "visual_type": "card", "priority": 1, "group": "kpis"},
+        {"name": "Trend", "visual_type": "lineChart", "min_width": 520, "max_height": 400},
+        {"name": "Region", "visual_type": "slicer"}
+      ]
+    }
+    A bare list of visuals is also accepted. Optional per-visual keys:
+    priority, group, min_width, min_height, max_width, max_height.
+
+Options:
+    --canvas WxH          Override canvas size (e.g. 1600x900)
+    --margin <px>         Outer margin (default: 24)
+    --gutter <px>         Space between visuals (default: 16)
+    --grid <px>           Grid size all coordinates snap to (default: 8)
+    --no-priority-rows    Allow different priorities to share a row
+    --grow-canvas         Increase canvas height instead of reporting overflow
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - Layout fits the canvas
+    1 - Layout overflows the canvas height (positions still non-overlapping)
+    2 - Invalid spec
+
+Examples:
+    python layout_solver.py page_spec.json --json
+    python layout_solver.py page_spec.json --canvas 1600x900 --grow-canvas
+"""
+
+import sys
+import json
+import time
+import argparse
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DEFAULT_CANVAS = (1280, 720)
+DEFAULT_MARGIN = 24
+DEFAULT_GUTTER = 16
+DEFAULT_GRID = 8
+
+# (priority, min_width, min_height, max_width, max_height) by visual category
+CATEGORY_DEFAULTS = {
+    "card": (1, 200, 120, 360, 240),
+    "chart": (2, 360, 240, 760, 500),
+    "table": (3, 520, 280, 1600, 640),
+    "slicer": (4, 200, 64, 360, 168),
+    "text": (1, 200, 40, 1600, 80),
+    "other": (3, 240, 160, 760, 500),
+}
+CATEGORY_BY_TYPE = {
+    "card": "card", "cardVisual": "card", "multiRowCard": "card", "kpi": "card", "gauge": "card",
+    "tableEx": "table", "pivotTable": "table", "matrix": "table", "table": "table",
+    "slicer": "slicer", "advancedSlicerVisual": "slicer", "listSlicer": "slicer", "textSlicer": "slicer",
+    "textbox": "text", "actionButton": "text", "pageNavigator": "text", "bookmarkNavigator": "text",
+}
+CHART_HINTS = ("Chart", "chart", "map", "Map", "funnel", "treemap", "waterfall", "scatter", "donut", "pie")
+
+
+class LayoutSpecError(ValueError):
+    """Raised when a layout spec is invalid."""
+    pass
+
+
+@dataclass
+class VisualSpec:
+    """A visual to place, with resolved defaults"""
+    name: str
+    visual_type: str
+    priority: int
+    min_width: int
+    min_height: int
+    max_width: int
+    max_height: int
+    group: Optional[str] = None
+    order: int = 0
+
+
+@dataclass
+class Placement:
+    """Solved position for one visual"""
+    name: str
+    visual_type: str
+    x: int
+    y: int
+    width: int
+    height: int
+    z: int
+    tab_order: int
+    row: int
+    group: Optional[str] = None
+
+
+@dataclass
+class LayoutResult:
+    """Solver output"""
+    status: str
+    canvas: Dict[str, int]
+    content_height: int
+    rows: int
+    placements: List[Placement] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def visual_category(visual_type: str) -> str:
+    """Map a PBIR visualType to a layout category (card, chart, table, slicer, text, other)."""
+    if visual_type in CATEGORY_BY_TYPE:
+        return CATEGORY_BY_TYPE[visual_type]
+    if any(hint in visual_type for hint in CHART_HINTS):
+        return "chart"
+    return "other"
+
+
+def _snap_down(value: float, grid: int) -> int:
+    return int(value // grid) * grid
+
+
+def _snap_up(value: float, grid: int) -> int:
+    return int(-(-value // grid)) * grid
+
+
+def resolve_visual(raw: Dict[str, Any], order: int, grid: int, content_width: int) -> Tuple[VisualSpec, List[str]]:
+    """Fill defaults from the visual type, snap limits to the grid and sanity-check them."""
+    if not isinstance(raw, dict) or not raw.get("name"):
+        raise LayoutSpecError(f"Visual #{order + 1} must be an object with a 'name'")
+    warnings = []
+    visual_type = raw.get("visual_type") or raw.get("visualType") or "other"
+    priority, min_w, min_h, max_w, max_h = CATEGORY_DEFAULTS[visual_category(visual_type)]
+
+    hints = {}
+    for key in ("priority", "min_width", "min_height", "max_width", "max_height"):
+        if key in raw:
+            try:
+                hints[key] = int(raw[key])
+            except (TypeError, ValueError, OverflowError):
+                raise LayoutSpecError(f"'{raw['name']}': {key} must be a number, got {raw[key]!r}")
+
+    min_w = _snap_up(hints.get("min_width", min_w), grid)
+    min_h = _snap_up(hints.get("min_height", min_h), grid)
+    max_w = max(_snap_down(hints.get("max_width", max(max_w, min_w)), grid), min_w)
+    max_h = max(_snap_down(hints.get("max_height", max(max_h, min_h)), grid), min_h)
+
+    if min_w > content_width:
+        warnings.append(f"'{raw['name']}' min_width {min_w} exceeds content width {content_width}; clamped")
+        min_w = content_width
+    max_w = min(max_w, content_width)
+
+    spec = VisualSpec(
+        name=str(raw["name"]),
+        visual_type=visual_type,
+        priority=hints.get("priority", priority),
+        min_width=min_w,
+        min_height=min_h,
+        max_width=max_w,
+        max_height=max_h,
+        group=raw.get("group"),
+        order=order
+    )
+    return spec, warnings
+
+
+def _order_visuals(specs: List[VisualSpec]) -> List[VisualSpec]:
+    """Priority order with groups kept contiguous (a group sorts by its most important member)."""
+    group_rank: Dict[str, Tuple[int, int]] = {}
+    for spec in specs:
+        if spec.group is not None:
+            rank = (spec.priority, spec.order)
+            group_rank[spec.group] = min(group_rank.get(spec.group, rank), rank)
+
+    def key(spec: VisualSpec):
+        anchor = group_rank[spec.group] if spec.group is not None else (spec.priority, spec.order)
+        return (anchor[0], anchor[1], spec.priority, spec.order)
+
+    return sorted(specs, key=key)
+
+
+def _fill(sizes: List[int], limits: List[int], target: int, grid: int) -> List[int]:
+    """Grow sizes toward their limits until they sum to target (grid-snapped, deterministic)."""
+    sizes = list(sizes)
+    remaining = target - sum(sizes)
+    while remaining >= grid:
+        growable = [i for i, (s, lim) in enumerate(zip(sizes, limits)) if s < lim]
+        if not growable:
+            break
+        share = max(_snap_down(remaining / len(growable), grid), grid)
+        progressed = False
+        for i in growable:
+            step = min(share, limits[i] - sizes[i], remaining)
+            step = _snap_down(step, grid)
+            if step <= 0:
+                continue
+            sizes[i] += step
+            remaining -= step
+            progressed = True
+            if remaining < grid:
+                break
+        if not progressed:
+            break
+    return sizes
+
+
+def solve_layout(visuals: List[Dict[str, Any]], canvas: Tuple[int, int] = DEFAULT_CANVAS,
+                 margin: int = DEFAULT_MARGIN, gutter: int = DEFAULT_GUTTER, grid: int = DEFAULT_GRID,
+                 priority_rows: bool = True, grow_canvas: bool = False) -> LayoutResult:
+    """
+    Compute non-overlapping, grid-aligned positions for visuals on one page.
+
+    Args:
+        visuals: Visual dicts (name, visual_type, optional priority/group/min_*/max_*)
+        canvas: (width, height) of the page
+        margin: Outer margin in px
+        gutter: Space between visuals in px
+        grid: Grid size all sizes snap to
+        priority_rows: Start a new row whenever the priority tier changes
+        grow_canvas: Extend canvas height to fit instead of reporting overflow
+
+    Returns:
+        LayoutResult with one Placement per visual in reading order
+    """
+    started = time.perf_counter()
+    if grid < 1:
+        raise LayoutSpecError(f"Grid size must be at least 1 px, got {grid}")
+    canvas_w, canvas_h = int(canvas[0]), int(canvas[1])
+    content_w = _snap_down(canvas_w - 2 * margin, grid)
+    content_h = _snap_down(canvas_h - 2 * margin, grid)
+    if content_w <= 0 or content_h <= 0:
+        raise LayoutSpecError(f"Canvas {canvas_w}x{canvas_h} leaves no room inside {margin}px margins")
+
+    warnings: List[str] = []
+    specs = []
+    seen = set()
+    for i, raw in enumerate(visuals):
+        spec, spec_warnings = resolve_visual(raw, i, grid, content_w)
+        if spec.name in seen:
+            raise LayoutSpecError(f"Duplicate visual name: '{spec.name}'")
+        seen.add(spec.name)
+        specs.append(spec)
+        warnings.extend(spec_warnings)
+    ordered = _order_visuals(specs)
+
+    # Shelf packing at minimum widths
+    group_width: Dict[str, int] = {}
+    for spec in ordered:
+        if spec.group is not None:
+            group_width[spec.group] = group_width.get(spec.group, -gutter) + spec.min_width + gutter
+
+    rows: List[List[VisualSpec]] = []
+    row_used = 0
+    for spec in ordered:
+        needed = spec.min_width + (gutter if rows and rows[-1] else 0)
+        start_new = not rows or row_used + needed > content_w
+        if rows and rows[-1] and not start_new:
+            previous = rows[-1][-1]
+            if priority_rows and spec.priority != previous.priority and spec.group is None:
+                start_new = True
+            elif spec.group is not None and spec.group != previous.group:
+                # Keep a group on one shelf when it would fit on an empty row
+                whole = group_width[spec.group]
+                if row_used + gutter + whole > content_w and whole <= content_w:
+                    start_new = True
+        if start_new:
+            rows.append([spec])
+            row_used = spec.min_width
+        else:
+            rows[-1].append(spec)
+            row_used += needed
+
+    # Widths: fill each row to the content width
+    row_widths = []
+    for row in rows:
+        target = content_w - gutter * (len(row) - 1)
+        row_widths.append(_fill([s.min_width for s in row], [s.max_width for s in row], target, grid))
+
+    # Heights: each row starts at its tallest minimum, then rows grow to fill the canvas
+    row_min = [max(s.min_height for s in row) for row in rows]
+    row_max = [max(row_min[i], min(s.max_height for s in row)) for i, row in enumerate(rows)]
+    available = content_h - gutter * (len(rows) - 1)
+    row_heights = _fill(row_min, row_max, available, grid) if sum(row_min) < available else row_min
+
+    used_h = sum(row_heights) + gutter * max(len(rows) - 1, 0)
+    status = "ok"
+    if used_h > content_h:
+        if grow_canvas:
+            canvas_h = _snap_up(used_h + 2 * margin, grid)
+            warnings.append(f"Canvas height increased to {canvas_h} to fit {len(rows)} rows")
+        elif priority_rows:
+            # Tier rows waste width; retry letting priorities share rows before giving up
+            packed = solve_layout(visuals, canvas, margin, gutter, grid, priority_rows=False)
+            if packed.status == "ok":
+                packed.warnings.insert(0, "Priority tiers share rows to fit the canvas height")
+                packed.elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+                return packed
+            status = "overflow"
+            warnings.append(f"Layout needs {used_h + 2 * margin}px of height; canvas is {canvas_h}px")
+        else:
+            status = "overflow"
+            warnings.append(f"Layout needs {used_h + 2 * margin}px of height; canvas is {canvas_h}px")
+
+    placements = []
+    y = margin
+    for row_index, (row, widths, height) in enumerate(zip(rows, row_widths, row_heights)):
+        x = margin
+        for spec, width in zip(row, widths):
+            visual_height = max(min(height, spec.max_height), spec.min_height)
+            order = len(placements)
+            placements.append(Placement(
+                name=spec.name,
+                visual_type=spec.visual_type,
+                x=x,
+                y=y,
+                width=width,
+                height=visual_height,
+                z=order * 1000,
+                tab_order=order * 1000,
+                row=row_index,
+                group=spec.group
+            ))
+            x += width + gutter
+        y += height + gutter
+
+    return LayoutResult(
+        status=status,
+        canvas={"width": canvas_w, "height": canvas_h},
+        content_height=used_h,
+        rows=len(rows),
+        placements=placements,
+        warnings=warnings,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+    )
+
+
+def _parse_canvas(value: str) -> Tuple[int, int]:
+    try:
+        width, height = value.lower().split("x")
+        return int(width), int(height)
+    except ValueError:
+        raise LayoutSpecError(f"Canvas must be WIDTHxHEIGHT, got '{value}'")
+
+
+def format_result(result: LayoutResult) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append(f"LAYOUT SOLUTION ({result.status.upper()})")
+    lines.append("=" * 80)
+    lines.append(f"Canvas: {result.canvas['width']} × {result.canvas['height']} | Rows: {result.rows} | "
+                 f"Solved in {result.elapsed_ms} ms")
+    lines.append("")
+    lines.append(f"{'Visual':<32} {'Type':<22} {'x':>5} {'y':>5} {'width':>6} {'height':>6}")
+    lines.append("-" * 80)
+    for p in result.placements:
+        lines.append(f"{p.name[:31]:<32} {p.visual_type[:21]:<22} {p.x:>5} {p.y:>5} {p.width:>6} {p.height:>6}")
+    for warning in result.warnings:
+        lines.append(f"⚠️ {warning}")
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute non-overlapping, grid-aligned visual positions for a report page",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("spec", help="Layout spec JSON file, or - for stdin")
+    parser.add_argument("--canvas", help="Canvas size WIDTHxHEIGHT")
+    parser.add_argument("--margin", type=int, default=DEFAULT_MARGIN, help="Outer margin in px")
+    parser.add_argument("--gutter", type=int, default=DEFAULT_GUTTER, help="Gutter between visuals in px")
+    parser.add_argument("--grid", type=int, default=DEFAULT_GRID, help="Grid size in px")
+    parser.add_argument("--no-priority-rows", action="store_true", help="Let priorities share a row")
+    parser.add_argument("--grow-canvas", action="store_true", help="Grow canvas height to fit")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+    if args.grid < 1:
+        parser.error("--grid must be a positive integer")
+
+    try:
+        if args.spec == "-":
+            spec = json.load(sys.stdin)
+        else:
+            with open(args.spec, 'r', encoding='utf-8') as f:
+                spec = json.load(f)
+
+        visuals = spec if isinstance(spec, list) else spec.get("visuals", [])
+        canvas = DEFAULT_CANVAS
+        if isinstance(spec, dict) and isinstance(spec.get("canvas"), dict):
+            canvas = (spec["canvas"].get("width", canvas[0]), spec["canvas"].get("height", canvas[1]))
+        if args.canvas:
+            canvas = _parse_canvas(args.canvas)
+
+        result = solve_layout(visuals, canvas, args.margin, args.gutter, args.grid,
+                              priority_rows=not args.no_priority_rows, grow_canvas=args.grow_canvas)
+    except (OSError, json.JSONDecodeError, LayoutSpecError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+    else:
+        print(format_result(result))
+
+    sys.exit(0 if result.status == "ok" else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Legacy Report Converter
+
+Converts a legacy single-file report (.Report/report.json with stringified
+config/filters) into the PBIR folder format (definition/report.json,
+pages/<page>/page.json, pages/<page>/visuals/<visual>/visual.json), so visual
+edits touch one small file instead of rewriting a multi-megabyte report.json
+and pbir_visual_editor.py can be used.
+
+The legacy file is streamed section by section (JsonObjectStream), so memory
+stays bounded by the largest page. Conversion per visual:
+    - config/filters strings become structured JSON
+    - singleVisual.projections + prototypeQuery become queryState projections,
+      with From-aliases resolved to entities (SourceRef.Entity)
+    - prototypeQuery.OrderBy becomes sortDefinition; vcObjects becomes visualContainerObjects
+    - singleVisualGroup becomes visualGroup; display.mode "hidden" becomes isHidden
+    - query/dataTransforms caches are dropped (Power BI Desktop regenerates them)
+
+After writing, the converter re-reads the PBIR files and verifies round-trip
+equivalence against the legacy file: page names, sizes and order, visual
+names, positions, types, resolved field bindings, sorts, formatting objects
+and filters must all match. Open and save the converted project once in
+Power BI Desktop to let it normalize anything it stores differently.
+
+Usage:
+    python legacy_report_converter.py <report_path> [--output <new.Report>] [--in-place]
+                                      [--no-verify] [--json]
+
+Arguments:
+    report_path           Path to a legacy .Report folder (containing report.json)
+
+Options:
+    --output <dir>        Write a converted copy to this .Report folder
+    --in-place            Convert in place; report.json is kept as report.json.legacy
+    --no-verify           Skip the round-trip equivalence check
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - Converted and verified
+    1 - Converted, but round-trip verification found differences
+    2 - Report not found, not a legacy report, or output folder exists
+
+Examples:
+    python legacy_report_converter.py "Sales.Report" --output "Sales PBIR.Report"
+    python legacy_report_converter.py "Sales.Report" --in-place
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pbi_merger_utils import JsonObjectStream
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+SCHEMA_BASE = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition"
+REPORT_SCHEMA = f"{SCHEMA_BASE}/report/1.0.0/schema.json"
+PAGE_SCHEMA = f"{SCHEMA_BASE}/page/1.0.0/schema.json"
+PAGES_SCHEMA = f"{SCHEMA_BASE}/pagesMetadata/1.0.0/schema.json"
+VISUAL_SCHEMA = f"{SCHEMA_BASE}/visualContainer/1.0.0/schema.json"
+VERSION_SCHEMA = f"{SCHEMA_BASE}/versionMetadata/1.0.0/schema.json"
+PBIR_VERSION = "2.0.0"
+
+DISPLAY_OPTIONS = {0: "DeprecatedDynamic", 1: "FitToPage", 2: "FitToWidth", 3: "ActualSize"}
+GROUP_MODES = {0: "ScaleMode", 1: "ScrollMode"}
+SORT_DIRECTIONS = {1: "Ascending", 2: "Descending"}
+FILTER_HOW_CREATED = {0: "Auto", 1: "User", 2: "Drill", 3: "Include", 4: "Exclude"}
+RESOURCE_PACKAGE_TYPES = {1: "RegisteredResources", 2: "SharedResources"}
+RESOURCE_ITEM_TYPES = {100: "Image", 201: "CustomTheme", 202: "BaseTheme"}
+
+
+class ConversionError(Exception):
+    """Raised when a report cannot be converted."""
+    pass
+
+
+def _decode(value: Any, default: Any) -> Any:
+    """Decode a stringified legacy blob (config, filters, ...)."""
+    if value is None or value == "":
+        return default
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def resolve_sources(expression: Any, aliases: Dict[str, str]) -> Any:
+    """Copy an expression with SourceRef {"Source": alias} replaced by {"Entity": table}."""
+    if isinstance(expression, list):
+        return [resolve_sources(item, aliases) for item in expression]
+    if not isinstance(expression, dict):
+        return expression
+    out = {}
+    for key, value in expression.items():
+        if key == "SourceRef" and isinstance(value, dict) and "Source" in value and value["Source"] in aliases:
+            out[key] = {"Entity": aliases[value["Source"]]}
+        else:
+            out[key] = resolve_sources(value, aliases)
+    return out
+
+
+def _aliases(query: Dict[str, Any]) -> Dict[str, str]:
+    return {src["Name"]: src["Entity"] for src in query.get("From") or []
+            if isinstance(src, dict) and "Name" in src and "Entity" in src}
+
+
+def _native_name(field_expr: Dict[str, Any]) -> Optional[str]:
+    for kind in ("Column", "Measure"):
+        node = field_expr.get(kind)
+        if isinstance(node, dict) and isinstance(node.get("Property"), str):
+            return node["Property"]
+    return None
+
+
+def convert_filters(filters: Any) -> List[Dict[str, Any]]:
+    """Legacy filter list (expression/filter/howCreated int) to PBIR filterConfig filters."""
+    out = []
+    for flt in filters or []:
+        if not isinstance(flt, dict):
+            continue
+        converted = {}
+        for key, value in flt.items():
+            if key == "expression":
+                converted["field"] = value
+            elif key == "howCreated" and isinstance(value, int):
+                if value in FILTER_HOW_CREATED:
+                    converted["howCreated"] = FILTER_HOW_CREATED[value]
+            else:
+                converted[key] = value
+        out.append(converted)
+    return out
+
+
+def convert_query(single_visual: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build PBIR query (queryState, sortDefinition) from legacy projections + prototypeQuery."""
+    prototype = single_visual.get("prototypeQuery") or {}
+    aliases = _aliases(prototype)
+    selects = {}
+    for select in prototype.get("Select") or []:
+        if isinstance(select, dict) and "Name" in select:
+            selects[select["Name"]] = select
+    column_properties = single_visual.get("columnProperties") or {}
+
+    query_state = {}
+    for role, projections in (single_visual.get("projections") or {}).items():
+        converted = []
+        for projection in projections or []:
+            query_ref = projection.get("queryRef")
+            select = selects.get(query_ref)
+            if select is None:
+                continue
+            field_expr = resolve_sources({k: v for k, v in select.items()
+                                          if k not in ("Name", "NativeReferenceName")}, aliases)
+            item = {"field": field_expr, "queryRef": query_ref}
+            native = select.get("NativeReferenceName") or _native_name(field_expr)
+            if native:
+                item["nativeQueryRef"] = native
+            display_name = (column_properties.get(query_ref) or {}).get("displayName")
+            if display_name is not None:
+                item["displayName"] = display_name
+            if "active" in projection:
+                item["active"] = projection["active"]
+            converted.append(item)
+        query_state[role] = {"projections": converted}
+
+    query: Dict[str, Any] = {}
+    if query_state:
+        query["queryState"] = query_state
+    order_by = prototype.get("OrderBy") or []
+    if order_by:
+        sort = []
+        for entry in order_by:
+            item = {"field": resolve_sources(entry.get("Expression"), aliases)}
+            if entry.get("Direction") in SORT_DIRECTIONS:
+                item["direction"] = SORT_DIRECTIONS[entry["Direction"]]
+            sort.append(item)
+        query["sortDefinition"] = {"sort": sort}
+        if "hasDefaultSort" in single_visual:
+            query["sortDefinition"]["isDefaultSort"] = bool(single_visual["hasDefaultSort"])
+    return query or None
+
+
+def convert_container(container: Dict[str, Any], warnings: List[str]) -> Dict[str, Any]:
+    """Convert one legacy visual container to a PBIR visual.json document."""
+    config = _decode(container.get("config"), {})
+    name = config.get("name")
+    if not name:
+        raise ConversionError("Visual container without a name in its config")
+
+    layout_position = ((config.get("layouts") or [{}])[0] or {}).get("position") or {}
+    position = {}
+    for key in ("x", "y", "z", "height", "width", "tabOrder"):
+        value = container.get(key, layout_position.get(key))
+        if value is not None:
+            position[key] = value
+    if "angle" in layout_position:
+        position["angle"] = layout_position["angle"]
+
+    visual_json: Dict[str, Any] = {"$schema": VISUAL_SCHEMA, "name": name, "position": position}
+    single = config.get("singleVisual")
+    group = config.get("singleVisualGroup")
+    if isinstance(single, dict):
+        visual: Dict[str, Any] = {"visualType": single.get("visualType", "")}
+        query = convert_query(single)
+        if query:
+            visual["query"] = query
+        if single.get("objects"):
+            visual["objects"] = single["objects"]
+        if single.get("vcObjects"):
+            visual["visualContainerObjects"] = single["vcObjects"]
+        for key in ("drillFilterOtherVisuals", "autoSelectVisualType", "syncGroup"):
+            if key in single:
+                visual[key] = single[key]
+        visual_json["visual"] = visual
+        if (single.get("display") or {}).get("mode") == "hidden":
+            visual_json["isHidden"] = True
+    elif isinstance(group, dict):
+        visual_json["visualGroup"] = {
+            "displayName": group.get("displayName", name),
+            "groupMode": GROUP_MODES.get(group.get("groupMode", 0), "ScaleMode"),
+        }
+        if group.get("objects"):
+            visual_json["visualGroup"]["objects"] = group["objects"]
+        if group.get("isHidden"):
+            visual_json["isHidden"] = True
+    else:
+        warnings.append(f"Visual {name}: no singleVisual or singleVisualGroup; written with position only")
+
+    if config.get("parentGroupName"):
+        visual_json["parentGroupName"] = config["parentGroupName"]
+    filters = convert_filters(_decode(container.get("filters"), []))
+    if filters:
+        visual_json["filterConfig"] = {"filters": filters}
+    return visual_json
+
+
+def convert_section(section: Dict[str, Any], warnings: List[str]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Convert one legacy section to (page.json, [visual.json, ...])."""
+    config = _decode(section.get("config"), {})
+    page = {
+        "$schema": PAGE_SCHEMA,
+        "name": section["name"],
+        "displayName": section.get("displayName", section["name"]),
+        "displayOption": DISPLAY_OPTIONS.get(section.get("displayOption", 1), "FitToPage"),
+    }
+    for key in ("height", "width"):
+        if key in section:
+            page[key] = section[key]
+    filters = convert_filters(_decode(section.get("filters"), []))
+    if filters:
+        page["filterConfig"] = {"filters": filters}
+    if config.get("objects"):
+        page["objects"] = config["objects"]
+    if config.get("visibility") == 1:
+        page["visibility"] = "HiddenInViewMode"
+    unmapped = sorted(set(config) - {"objects", "visibility", "relationships", "filterSortOrder"})
+    if unmapped:
+        warnings.append(f"Page {section['name']}: config keys not converted: {', '.join(unmapped)}")
+
+    visuals = [convert_container(c, warnings) for c in section.get("visualContainers") or []]
+    return page, visuals
+
+
+def convert_report_settings(members: Dict[str, Any], warnings: List[str]) -> Dict[str, Any]:
+    """Build definition/report.json from the legacy top-level members."""
+    config = _decode(members.get("config"), {})
+    report: Dict[str, Any] = {"$schema": REPORT_SCHEMA}
+    themes = {}
+    for key, theme in (config.get("themeCollection") or {}).items():
+        if isinstance(theme, dict) and "name" in theme:
+            converted = {"name": theme["name"]}
+            if "version" in theme:
+                converted["reportVersionAtImport"] = theme["version"]
+            if theme.get("type") in RESOURCE_PACKAGE_TYPES:
+                converted["type"] = RESOURCE_PACKAGE_TYPES[theme["type"]]
+            themes[key] = converted
+    report["themeCollection"] = themes
+    filters = convert_filters(_decode(members.get("filters"), []))
+    if filters:
+        report["filterConfig"] = {"filters": filters}
+    if config.get("objects"):
+        report["objects"] = config["objects"]
+    if config.get("settings"):
+        report["settings"] = config["settings"]
+
+    packages = []
+    for entry in members.get("resourcePackages") or []:
+        package = entry.get("resourcePackage", entry) if isinstance(entry, dict) else {}
+        if "name" not in package:
+            continue
+        items = []
+        for item in package.get("items") or []:
+            item = {k: v for k, v in item.items() if k != "resourcePackageId"}
+            item["type"] = RESOURCE_ITEM_TYPES.get(item.get("type"), item.get("type"))
+            items.append(item)
+        packages.append({
+            "name": package["name"],
+            "type": RESOURCE_PACKAGE_TYPES.get(package.get("type"), package.get("type")),
+            "items": items,
+        })
+    if packages:
+        report["resourcePackages"] = packages
+        if any(isinstance(item.get("type"), int) for p in packages for item in p["items"]):
+            warnings.append("Unknown resourcePackages item types kept as legacy numeric codes; re-save in Power BI Desktop")
+    if members.get("publicCustomVisuals"):
+        report["publicCustomVisuals"] = members["publicCustomVisuals"]
+    return report
+
+
+def _write_json(path: Path, data: Any) -> int:
+    text = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return len(text.encode('utf-8'))
+
+
+# ---------------------------------------------------------------------------
+# Round-trip verification
+# ---------------------------------------------------------------------------
+
+def legacy_signature(section: Dict[str, Any]) -> Dict[str, Any]:
+    """Semantic view of a legacy section, comparable with pbir_signature()."""
+    visuals = {}
+    for container in section.get("visualContainers") or []:
+        config = _decode(container.get("config"), {})
+        single = config.get("singleVisual") or {}
+        prototype = single.get("prototypeQuery") or {}
+        aliases = _aliases(prototype)
+        selects = {s["Name"]: s for s in prototype.get("Select") or [] if isinstance(s, dict) and "Name" in s}
+        roles = {}
+        for role, projections in (single.get("projections") or {}).items():
+            roles[role] = [
+                resolve_sources({k: v for k, v in selects[p["queryRef"]].items()
+                                 if k not in ("Name", "NativeReferenceName")}, aliases)
+                for p in projections or [] if p.get("queryRef") in selects
+            ]
+        visuals[config.get("name")] = {
+            "position": [container.get(k) for k in ("x", "y", "z", "width", "height")],
+            "visualType": single.get("visualType"),
+            "roles": roles,
+            "sort": [resolve_sources(o.get("Expression"), aliases) for o in prototype.get("OrderBy") or []],
+            "objects": single.get("objects") or {},
+            "containerObjects": single.get("vcObjects") or {},
+            "filters": [(f.get("name"), f.get("expression"), f.get("filter"))
+                        for f in _decode(container.get("filters"), []) or []],
+            "parent": config.get("parentGroupName"),
+        }
+    return {
+        "displayName": section.get("displayName", section.get("name")),
+        "size": [section.get("width"), section.get("height")],
+        "filters": [(f.get("name"), f.get("expression"), f.get("filter"))
+                    for f in _decode(section.get("filters"), []) or []],
+        "visuals": visuals,
+    }
+
+
+def pbir_signature(page_dir: Path) -> Dict[str, Any]:
+    """Semantic view of a converted PBIR page folder."""
+    with open(page_dir / "page.json", 'r', encoding='utf-8') as f:
+        page = json.load(f)
+    visuals = {}
+    visuals_dir = page_dir / "visuals"
+    for entry in sorted(os.scandir(visuals_dir), key=lambda e: e.name) if visuals_dir.is_dir() else []:
+        with open(os.path.join(entry.path, "visual.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        visual = data.get("visual") or {}
+        query = visual.get("query") or {}
+        position = data.get("position") or {}
+        visuals[data.get("name")] = {
+            "position": [position.get(k) for k in ("x", "y", "z", "width", "height")],
+            "visualType": visual.get("visualType"),
+            "roles": {role: [p.get("field") for p in state.get("projections") or []]
+                      for role, state in (query.get("queryState") or {}).items()},
+            "sort": [s.get("field") for s in (query.get("sortDefinition") or {}).get("sort") or []],
+            "objects": visual.get("objects") or {},
+            "containerObjects": visual.get("visualContainerObjects") or {},
+            "filters": [(f.get("name"), f.get("field"), f.get("filter"))
+                        for f in (data.get("filterConfig") or {}).get("filters") or []],
+            "parent": data.get("parentGroupName"),
+        }
+    return {
+        "displayName": page.get("displayName"),
+        "size": [page.get("width"), page.get("height")],
+        "filters": [(f.get("name"), f.get("field"), f.get("filter"))
+                    for f in (page.get("filterConfig") or {}).get("filters") or []],
+        "visuals": visuals,
+    }
+
+
+def _diff(expected: Any, actual: Any, path: str, out: List[str], limit: int = 20) -> None:
+    if len(out) >= limit or expected == actual:
+        return
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in list(expected) + [k for k in actual if k not in expected]:
+            _diff(expected.get(key), actual.get(key), f"{path}.{key}" if path else str(key), out, limit)
+        return
+    out.append(f"{path}: legacy={json.dumps(expected, default=str)[:120]} pbir={json.dumps(actual, default=str)[:120]}")
+
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ConversionResult:
+    """Conversion summary"""
+    source: str
+    output: str
+    pages: int = 0
+    visuals: int = 0
+    legacy_bytes: int = 0
+    largest_visual_bytes: int = 0
+    verified: Optional[bool] = None
+    differences: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+def iter_sections(report_json: Path) -> Iterator[Tuple[str, Optional[int], Any]]:
+    return iter(JsonObjectStream(str(report_json), stream_arrays=("sections",)))
+
+
+class LegacyReportConverter:
+    """Stream a legacy report.json into the PBIR folder layout."""
+
+    def __init__(self, report_path, output_path=None, in_place: bool = False):
+        self.report_path = Path(report_path)
+        self.report_json = self.report_path / "report.json"
+        if not self.report_json.is_file():
+            raise FileNotFoundError(f"report.json not found in: {self.report_path}")
+        if (self.report_path / "definition").is_dir() and not output_path:
+            raise ConversionError(f"{self.report_path} already has a PBIR definition folder")
+        if in_place == bool(output_path):
+            raise ConversionError("Specify exactly one of --output or --in-place")
+        self.in_place = in_place
+        self.output_path = self.report_path if in_place else Path(output_path)
+        if not in_place and self.output_path.exists():
+            raise ConversionError(f"Output folder already exists: {self.output_path}")
+
+    def convert(self, verify: bool = True) -> ConversionResult:
+        started = time.perf_counter()
+        result = ConversionResult(source=str(self.report_path), output=str(self.output_path),
+                                  legacy_bytes=self.report_json.stat().st_size)
+
+        if not self.in_place:
+            shutil.copytree(self.report_path, self.output_path, ignore=shutil.ignore_patterns("report.json"))
+        definition = self.output_path / "definition"
+        pages_dir = definition / "pages"
+        pages_dir.mkdir(parents=True)
+
+        members: Dict[str, Any] = {}
+        page_order: List[Tuple[int, int, str]] = []
+        for key, index, value in iter_sections(self.report_json):
+            if index is None:
+                if key != "sections":
+                    members[key] = value
+                continue
+            page, visuals = convert_section(value, result.warnings)
+            page_dir = pages_dir / page["name"]
+            (page_dir / "visuals").mkdir(parents=True)
+            _write_json(page_dir / "page.json", page)
+            for visual in visuals:
+                visual_dir = page_dir / "visuals" / visual["name"]
+                visual_dir.mkdir()
+                size = _write_json(visual_dir / "visual.json", visual)
+                result.largest_visual_bytes = max(result.largest_visual_bytes, size)
+            page_order.append((value.get("ordinal", index), index, page["name"]))
+            result.pages += 1
+            result.visuals += len(visuals)
+
+        config = _decode(members.get("config"), {})
+        order = [name for _, _, name in sorted(page_order)]
+        active = config.get("activeSectionIndex", 0)
+        pages_meta = {"$schema": PAGES_SCHEMA, "pageOrder": order}
+        by_stream_index = {i: name for _, i, name in page_order}
+        if active in by_stream_index:
+            pages_meta["activePageName"] = by_stream_index[active]
+        _write_json(pages_dir / "pages.json", pages_meta)
+        _write_json(definition / "report.json", convert_report_settings(members, result.warnings))
+        _write_json(definition / "version.json", {"$schema": VERSION_SCHEMA, "version": PBIR_VERSION})
+        self._update_definition_pbir()
+
+        if verify:
+            self.verify(definition, result)
+        if self.in_place:
+            self.report_json.rename(self.report_path / "report.json.legacy")
+
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    def _update_definition_pbir(self) -> None:
+        """PBIR folders require definition.pbir version 4.0 or later."""
+        pbir_file = self.output_path / "definition.pbir"
+        if not pbir_file.is_file():
+            return
+        with open(pbir_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        try:
+            major = float(str(data.get("version", "1.0")).split(".")[0])
+        except ValueError:
+            major = 0
+        if major < 4:
+            data["version"] = "4.0"
+            _write_json(pbir_file, data)
+
+    def verify(self, definition: Path, result: ConversionResult) -> None:
+        """Re-stream the legacy file and compare every page with the written PBIR files."""
+        pages_dir = definition / "pages"
+        for key, index, section in iter_sections(self.report_json):
+            if index is None:
+                continue
+            page_dir = pages_dir / section["name"]
+            if not page_dir.is_dir():
+                result.differences.append(f"Page {section['name']}: not written")
+                continue
+            _diff(legacy_signature(section), pbir_signature(page_dir), section["name"], result.differences)
+        result.verified = not result.differences
+
+
+def format_result(result: ConversionResult) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("LEGACY REPORT CONVERSION")
+    lines.append("=" * 80)
+    lines.append(f"Source: {result.source}")
+    lines.append(f"Output: {result.output}")
+    lines.append(f"Pages: {result.pages} | Visuals: {result.visuals} | {result.elapsed_ms} ms")
+    lines.append(f"report.json: {result.legacy_bytes / 1024:,.0f} KB -> largest visual.json: "
+                 f"{result.largest_visual_bytes / 1024:,.1f} KB")
+    if result.verified is True:
+        lines.append("✅ Round-trip verification passed")
+    elif result.verified is False:
+        lines.append(f"❌ Round-trip verification found {len(result.differences)} difference(s):")
+        for diff in result.differences:
+            lines.append(f"  - {diff}")
+    for warning in result.warnings:
+        lines.append(f"⚠️ {warning}")
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a legacy report.json report to the PBIR folder format",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("report_path", help="Path to legacy .Report folder")
+    parser.add_argument("--output", help="Write the converted report to this .Report folder")
+    parser.add_argument("--in-place", action="store_true", help="Convert in place (keeps report.json.legacy)")
+    parser.add_argument("--no-verify", action="store_true", help="Skip round-trip verification")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        converter = LegacyReportConverter(args.report_path, args.output, args.in_place)
+        result = converter.convert(verify=not args.no_verify)
+    except (FileNotFoundError, ConversionError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(asdict(result), indent=2, ensure_ascii=False))
+    else:
+        print(format_result(result))
+
+    sys.exit(1 if result.verified is False else 0)
+
+
+if __name__ == "__main__":
+    main()
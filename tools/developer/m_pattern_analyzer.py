@@ -41,9 +41,7 @@ class MCodePatternAnalyzer:
         """Run full analysis."""
         print(f"Analyzing {len(self.tmdl_files)} TMDL files...\n")
 
-        # Extract all partitions
-        for tmdl_file in self.tmdl_files:
-            self._extract_partitions(tmdl_file)
+        self.extract_partitions()
 
         print(f"Found {len(self.partitions)} M code partitions\n")
 
@@ -56,6 +54,13 @@ class MCodePatternAnalyzer:
 
         return self.patterns
 
+    def extract_partitions(self):
+        """Extract M code partitions from every TMDL file (without analyzing them)."""
+        self.partitions = []
+        for tmdl_file in self.tmdl_files:
+            self._extract_partitions(tmdl_file)
+        return self.partitions
+
     def _extract_partitions(self, tmdl_file):
         """Extract M code partitions from TMDL file."""
         content = tmdl_file.read_text(encoding='utf-8')
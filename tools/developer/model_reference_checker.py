@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Model Reference Checker
+
+Cross-checks every field referenced by a Power BI Report (PBIR) against the
+TMDL semantic model, so broken visuals are found before Power BI Desktop or
+the Service renders an error.
+
+Detected issues:
+    unknown_entity   - Reference points at a table that does not exist
+    dangling         - Table exists but has no such measure/column/hierarchy level
+    wrong_entity     - Field exists, but in a different table than referenced
+    kind_mismatch    - A measure referenced as a column, or a column as a measure
+    unresolved       - Reference has no resolvable table (broken SourceRef alias)
+
+Model names are loaded into per-table sets and report references come from the
+incremental field index (pbir_field_index.py), so every check is a set lookup.
+
+Usage:
+    python model_reference_checker.py <project_path> [--json]
+    python model_reference_checker.py --model <SemanticModel/definition> --report <.Report> [--json]
+
+Arguments:
+    project_path          Path to Power BI Project folder (contains *.SemanticModel and *.Report)
+
+Options:
+    --model <path>        TMDL definition folder (overrides project discovery)
+    --report <path>       .Report folder (overrides project discovery)
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - All references resolve
+    1 - Broken references found
+    2 - Project, model or report not found
+
+Examples:
+    python model_reference_checker.py "C:\\Projects\\Sales"
+    python model_reference_checker.py "C:\\Projects\\Sales" --json
+"""
+
+import sys
+import json
+import time
+import argparse
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from pbi_merger_utils import TmdlParser
+from pbir_field_index import build_index, resolve_definition_path, FieldReference
+
+
+@dataclass
+class ReferenceIssue:
+    """A broken report → model reference (deduplicated across locations)"""
+    issue_type: str
+    kind: str
+    entity: str
+    property: str
+    message: str
+    suggestion: Optional[str] = None
+    locations: List[Dict[str, Optional[str]]] = field(default_factory=list)
+
+
+class ModelNames:
+    """Case-insensitive name sets for one TMDL semantic model."""
+
+    def __init__(self):
+        self.tables: Dict[str, str] = {}  # casefold -> display name
+        self.columns: Dict[str, Set[str]] = {}  # table -> column names
+        self.measures: Dict[str, Set[str]] = {}  # table -> measure names
+        self.levels: Dict[str, Set[str]] = {}  # table -> "hierarchy\x1flevel"
+        self.measure_home: Dict[str, str] = {}  # measure -> table display name
+        self.column_tables: Dict[str, List[str]] = {}  # column -> table display names
+
+    @classmethod
+    def from_tmdl(cls, definition_path: Path) -> "ModelNames":
+        names = cls()
+        for tmdl_file in sorted(definition_path.rglob("*.tmdl")):
+            content = tmdl_file.read_text(encoding='utf-8')
+            hierarchy = None
+            for decl in TmdlParser.iter_declarations(content):
+                kind, name, table = decl['kind'], decl['name'], decl['table']
+                if kind == 'table':
+                    names.tables[name.casefold()] = name
+                    hierarchy = None
+                    continue
+                if table is None:
+                    continue
+                table_key = table.casefold()
+                names.tables.setdefault(table_key, table)
+                if kind == 'column':
+                    names.columns.setdefault(table_key, set()).add(name.casefold())
+                    names.column_tables.setdefault(name.casefold(), []).append(table)
+                elif kind == 'measure':
+                    names.measures.setdefault(table_key, set()).add(name.casefold())
+                    names.measure_home[name.casefold()] = table
+                elif kind == 'hierarchy':
+                    hierarchy = name
+                elif kind == 'level' and hierarchy is not None:
+                    names.levels.setdefault(table_key, set()).add(f"{hierarchy}\x1f{name}".casefold())
+        return names
+
+    def add_report_extensions(self, definition_path: Path) -> int:
+        """
+        Add report-level measures from definition/reportExtensions.json.
+
+        Returns:
+            Number of report measures added (0 if the report has none)
+        """
+        extensions_file = definition_path / "reportExtensions.json"
+        if not extensions_file.is_file():
+            return 0
+        with open(extensions_file, 'r', encoding='utf-8-sig') as f:
+            data = json.load(f)
+        added = 0
+        for entity in data.get("entities") or []:
+            table = entity.get("name")
+            if not table:
+                continue
+            table_key = table.casefold()
+            self.tables.setdefault(table_key, table)
+            for measure in entity.get("measures") or []:
+                name = measure.get("name")
+                if not name:
+                    continue
+                self.measures.setdefault(table_key, set()).add(name.casefold())
+                self.measure_home.setdefault(name.casefold(), table)
+                added += 1
+        return added
+
+    def has_level(self, table_key: str, prop: str) -> bool:
+        """HierarchyLevel properties are "<hierarchy>.<level>"; either part may contain dots."""
+        levels = self.levels.get(table_key)
+        if not levels:
+            return False
+        parts = prop.split(".")
+        return any(
+            (".".join(parts[:i]) + "\x1f" + ".".join(parts[i:])).casefold() in levels
+            for i in range(1, len(parts))
+        )
+
+
+class ModelReferenceChecker:
+    """Checks report field references against model name sets."""
+
+    def __init__(self, model: ModelNames):
+        self.model = model
+        self.issues: "OrderedDict[tuple, ReferenceIssue]" = OrderedDict()
+        self.references_checked = 0
+
+    def check_all(self, references: List[FieldReference]) -> List[ReferenceIssue]:
+        for ref in references:
+            self.references_checked += 1
+            self.check(ref)
+        return list(self.issues.values())
+
+    def check(self, ref: FieldReference) -> None:
+        model = self.model
+        entity_key, prop_key = ref.entity.casefold(), ref.property.casefold()
+
+        if not ref.entity:
+            self._add(ref, "unresolved", f"{ref.kind} '{ref.property}' has no resolvable table (SourceRef alias missing)")
+            return
+
+        in_columns = prop_key in model.columns.get(entity_key, ())
+        in_measures = prop_key in model.measures.get(entity_key, ())
+
+        if entity_key not in model.tables:
+            home = self._home_hint(ref.kind, prop_key)
+            self._add(ref, "unknown_entity", f"Table '{ref.entity}' does not exist in the model", home)
+            return
+
+        if ref.kind == "Measure":
+            if in_measures:
+                return
+            if in_columns:
+                self._add(ref, "kind_mismatch", f"'{ref.entity}'[{ref.property}] is a column but is referenced as a measure",
+                          "Use a Column (or Aggregation) field reference")
+            elif prop_key in model.measure_home:
+                home = model.measure_home[prop_key]
+                self._add(ref, "wrong_entity", f"Measure [{ref.property}] lives in table '{home}', not '{ref.entity}'",
+                          f"Set SourceRef Entity to '{home}'")
+            else:
+                self._add(ref, "dangling", f"Measure '{ref.entity}'[{ref.property}] does not exist")
+            return
+
+        if ref.kind == "HierarchyLevel":
+            # Auto date/time hierarchies reference the underlying date column
+            if in_columns or model.has_level(entity_key, ref.property):
+                return
+            self._add(ref, "dangling", f"Hierarchy level '{ref.entity}'.{ref.property} does not exist")
+            return
+
+        # Column / Aggregation
+        if in_columns:
+            return
+        if in_measures:
+            if ref.kind == "Column":
+                self._add(ref, "kind_mismatch", f"'{ref.entity}'[{ref.property}] is a measure but is referenced as a column",
+                          "Use a Measure field reference")
+            return
+        tables = model.column_tables.get(prop_key)
+        if tables:
+            self._add(ref, "wrong_entity", f"Column [{ref.property}] does not exist in '{ref.entity}'",
+                      f"Column exists in: {', '.join(sorted(set(tables)))}")
+        else:
+            self._add(ref, "dangling", f"Column '{ref.entity}'[{ref.property}] does not exist")
+
+    def _home_hint(self, kind: str, prop_key: str) -> Optional[str]:
+        if kind == "Measure" and prop_key in self.model.measure_home:
+            return f"Measure exists in table '{self.model.measure_home[prop_key]}'"
+        tables = self.model.column_tables.get(prop_key)
+        if tables:
+            return f"Column exists in: {', '.join(sorted(set(tables)))}"
+        return None
+
+    def _add(self, ref: FieldReference, issue_type: str, message: str, suggestion: Optional[str] = None) -> None:
+        key = (issue_type, ref.kind, ref.entity.casefold(), ref.property.casefold())
+        issue = self.issues.get(key)
+        if issue is None:
+            issue = ReferenceIssue(issue_type, ref.kind, ref.entity, ref.property, message, suggestion)
+            self.issues[key] = issue
+        issue.locations.append({"page": ref.page, "visual": ref.visual, "role": ref.role, "file": ref.file})
+
+
+def _find_project_parts(project_path: Path):
+    models = sorted(project_path.glob("*.SemanticModel"))
+    reports = sorted(project_path.glob("*.Report"))
+    if not models:
+        raise FileNotFoundError(f"No .SemanticModel folder found in {project_path}")
+    if not reports:
+        raise FileNotFoundError(f"No .Report folder found in {project_path}")
+    return models[0] / "definition", reports[0]
+
+
+def check_project(model_definition: Path, report_path: Path) -> Dict:
+    """Run the full cross-reference check and return a JSON-serializable result."""
+    started = time.perf_counter()
+    if not model_definition.is_dir():
+        raise FileNotFoundError(f"TMDL definition folder not found: {model_definition}")
+
+    model = ModelNames.from_tmdl(model_definition)
+    report_measures = model.add_report_extensions(resolve_definition_path(report_path))
+    index = build_index(report_path)
+    references = [ref for entry in index.files.values() for ref in entry["refs"]]
+
+    checker = ModelReferenceChecker(model)
+    issues = checker.check_all(references)
+
+    by_type: Dict[str, int] = {}
+    for issue in issues:
+        by_type[issue.issue_type] = by_type.get(issue.issue_type, 0) + 1
+
+    return {
+        "status": "issues_found" if issues else "ok",
+        "model_path": str(model_definition),
+        "report_path": str(report_path),
+        "model": {
+            "tables": len(model.tables),
+            "columns": sum(len(c) for c in model.columns.values()),
+            "measures": sum(len(m) for m in model.measures.values()),
+            "report_measures": report_measures
+        },
+        "files_checked": len(index.files),
+        "references_checked": checker.references_checked,
+        "issue_count": len(issues),
+        "issues_by_type": by_type,
+        "issues": [asdict(issue) for issue in issues],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+
+def format_report(result: Dict) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("MODEL REFERENCE CHECK")
+    lines.append("=" * 80)
+    lines.append(f"Model: {result['model_path']}")
+    lines.append(f"Report: {result['report_path']}")
+    lines.append(f"Model objects: {result['model']['tables']} tables, {result['model']['columns']} columns, "
+                 f"{result['model']['measures']} measures")
+    lines.append(f"References checked: {result['references_checked']} in {result['files_checked']} files "
+                 f"({result['elapsed_ms']} ms)")
+    lines.append("=" * 80)
+
+    if not result["issues"]:
+        lines.append("")
+        lines.append("[OK] Every report reference resolves against the model")
+        return "\n".join(lines)
+
+    lines.append("")
+    lines.append(f"BROKEN REFERENCES: {result['issue_count']}")
+    for issue_type, count in sorted(result["issues_by_type"].items()):
+        lines.append(f"  - {issue_type}: {count}")
+
+    for issue in result["issues"]:
+        lines.append("")
+        lines.append(f"[{issue['issue_type'].upper()}] {issue['message']}")
+        if issue["suggestion"]:
+            lines.append(f"  Suggestion: {issue['suggestion']}")
+        lines.append(f"  Used in {len(issue['locations'])} place(s):")
+        for loc in issue["locations"][:5]:
+            lines.append(f"    - page={loc['page'] or '-'} visual={loc['visual'] or '-'} role={loc['role']}")
+        if len(issue["locations"]) > 5:
+            lines.append(f"    ... and {len(issue['locations']) - 5} more")
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check PBIR field references against the TMDL semantic model",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("project_path", nargs="?", help="Path to Power BI Project folder")
+    parser.add_argument("--model", help="TMDL definition folder")
+    parser.add_argument("--report", help=".Report folder")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        if args.model and args.report:
+            model_definition, report_path = Path(args.model), Path(args.report)
+        elif args.project_path:
+            model_definition, report_path = _find_project_parts(Path(args.project_path))
+            model_definition = Path(args.model) if args.model else model_definition
+            report_path = Path(args.report) if args.report else report_path
+        else:
+            parser.print_help()
+            sys.exit(2)
+
+        result = check_project(model_definition, report_path)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(result))
+
+    sys.exit(1 if result["issues"] else 0)
+
+
+if __name__ == "__main__":
+    main()
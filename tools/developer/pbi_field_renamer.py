@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Power BI Field Renamer
+
+Renames a measure or column across a Power BI Project (.pbip) in one pass:
+the TMDL semantic model (declaration, DAX references, sortByColumn, hierarchy
+levels, relationships) and the PBIR report (Measure/Column field references,
+queryRef and nativeQueryRef strings in visuals, filters and bookmarks).
+
+Affected report files are found through the field reference index
+(pbir_field_index.py), so only files that actually reference the field are read.
+All rewrites are staged in memory and committed as one batch; if any file fails
+to write, every file already replaced is restored.
+
+Usage:
+    python pbi_field_renamer.py <project_path> --table <table> --old <name> --new <name> [options]
+
+Arguments:
+    project_path          Path to Power BI Project folder (contains *.SemanticModel)
+
+Options:
+    --table <table>       Table that owns the measure/column
+    --old <name>          Current measure/column name
+    --new <name>          New measure/column name
+    --dry-run             Report the files that would change without writing
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - Rename applied (or dry run completed)
+    1 - Rename rejected (field not found, name collision, write failure)
+    2 - Project structure not found
+
+Examples:
+    python pbi_field_renamer.py "C:\\Projects\\Sales" --table Sales --old "Total Sales" --new "Revenue"
+    python pbi_field_renamer.py "C:\\Projects\\Sales" --table Sales --old Amount --new "Net Amount" --dry-run
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pbi_merger_utils import TmdlParser
+from pbir_field_index import build_index, iter_field_nodes
+from json_splice import render_json_minimal
+
+
+class RenameError(Exception):
+    """Raised when a rename cannot be applied"""
+    pass
+
+
+@dataclass
+class RenameResult:
+    """Structured rename result"""
+    status: str  # "applied", "dry_run", "error"
+    table: str
+    old_name: str
+    new_name: str
+    kind: Optional[str] = None  # "measure" or "column"
+    changed_files: List[Dict[str, Any]] = field(default_factory=list)
+    error_message: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _dax_name(name: str) -> str:
+    """Escape a name for use inside DAX [brackets]."""
+    return name.replace("]", "]]")
+
+
+def _table_token_pattern(table: str) -> str:
+    """Regex for a DAX table reference: 'Sales Data' or Sales (bare only when legal)."""
+    quoted = "'" + re.escape(table.replace("'", "''")) + "'"
+    if re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', table):
+        return f"(?:{quoted}|{re.escape(table)})"
+    return quoted
+
+
+class FieldRenamer:
+    """
+    Plans and applies a measure/column rename across TMDL and PBIR files.
+
+    Planning is read-only and produces {path: new_text}; apply() commits the plan
+    as a single batch with rollback.
+    """
+
+    def __init__(self, project_path: str, table: str, old_name: str, new_name: str):
+        self.project_path = Path(project_path).resolve()
+        self.table = table
+        self.old_name = old_name
+        self.new_name = new_name
+        self.kind: Optional[str] = None
+        self.changes: Dict[Path, str] = {}
+        self.change_counts: Dict[Path, int] = {}
+
+        self.model_path = self._find_one("*.SemanticModel") / "definition"
+        if not self.model_path.is_dir():
+            raise FileNotFoundError(f"TMDL definition folder not found: {self.model_path}")
+        report_folders = sorted(self.project_path.glob("*.Report"))
+        self.report_path = report_folders[0] if report_folders else None
+
+    def _find_one(self, pattern: str) -> Path:
+        matches = sorted(self.project_path.glob(pattern))
+        if not matches:
+            raise FileNotFoundError(f"No {pattern} folder found in {self.project_path}")
+        return matches[0]
+
+    # -- planning ----------------------------------------------------------
+
+    def plan(self) -> Dict[Path, str]:
+        """Compute the new content of every affected file without writing anything."""
+        if self.old_name == self.new_name:
+            raise RenameError("New name is identical to the old name")
+
+        tmdl_files = {p: self._read(p) for p in sorted(self.model_path.rglob("*.tmdl"))}
+        owner_file, declaration = self._find_declaration(tmdl_files)
+        self.kind = declaration['kind']
+        self._check_collision(tmdl_files)
+
+        for path, content in tmdl_files.items():
+            new_content, count = self._rewrite_tmdl(content, is_owner=(path == owner_file),
+                                                    declaration=declaration if path == owner_file else None)
+            if count:
+                self._stage(path, new_content, count)
+
+        if self.report_path is not None:
+            self._plan_report()
+
+        return self.changes
+
+    def _find_declaration(self, tmdl_files: Dict[Path, str]) -> Tuple[Path, Dict]:
+        table_key, old_key = self.table.casefold(), self.old_name.casefold()
+        for path, content in tmdl_files.items():
+            for decl in TmdlParser.iter_declarations(content):
+                if (decl['kind'] in ('measure', 'column')
+                        and (decl['table'] or '').casefold() == table_key
+                        and decl['name'].casefold() == old_key):
+                    return path, decl
+        raise RenameError(f"No measure or column '{self.old_name}' found in table '{self.table}'")
+
+    def _check_collision(self, tmdl_files: Dict[Path, str]) -> None:
+        new_key, table_key = self.new_name.casefold(), self.table.casefold()
+        for content in tmdl_files.values():
+            for decl in TmdlParser.iter_declarations(content):
+                if decl['name'].casefold() != new_key or decl['kind'] not in ('measure', 'column'):
+                    continue
+                # Measure names are model-wide; column names are per table
+                if decl['kind'] == 'measure' or self.kind == 'measure' or (decl['table'] or '').casefold() == table_key:
+                    raise RenameError(
+                        f"Name collision: {decl['kind']} '{decl['name']}' already exists in table '{decl['table']}'"
+                    )
+
+    def _rewrite_tmdl(self, content: str, is_owner: bool, declaration: Optional[Dict]) -> Tuple[str, int]:
+        count = 0
+        if declaration is not None:
+            content = (content[:declaration['name_start']]
+                       + TmdlParser.quote_name(self.new_name)
+                       + content[declaration['name_end']:])
+            count += 1
+
+        old_dax, new_dax = re.escape(_dax_name(self.old_name)), _dax_name(self.new_name)
+        replacement = lambda m: m.group(1) + '[' + new_dax + ']'
+
+        # Table-qualified references: Sales[Amount], 'Sales Data'[Amount]
+        qualified = re.compile(r"(" + _table_token_pattern(self.table) + r"\s*)\[" + old_dax + r"\]", re.IGNORECASE)
+        content, n = qualified.subn(replacement, content)
+        count += n
+
+        # Unqualified references: measures are model-unique; columns only inside their own table
+        if self.kind == 'measure' or is_owner:
+            unqualified = re.compile(r"((?<![\w'\]]))\[" + old_dax + r"\]", re.IGNORECASE)
+            content, n = unqualified.subn(replacement, content)
+            count += n
+
+        if self.kind == 'column':
+            new_token = TmdlParser.quote_name(self.new_name)
+            old_token = "(?:'" + re.escape(self.old_name.replace("'", "''")) + "'|" + re.escape(self.old_name) + ")"
+            if is_owner:
+                # sortByColumn: Amount / hierarchy level "column: Amount"
+                prop = re.compile(r"^(\s*(?:sortByColumn|column):\s*)" + old_token + r"[ \t]*$",
+                                  re.IGNORECASE | re.MULTILINE)
+                content, n = prop.subn(lambda m: m.group(1) + new_token, content)
+                count += n
+            # relationships: fromColumn: Sales.Amount / toColumn: 'Sales Data'.Amount
+            table_token = "(?:'" + re.escape(self.table.replace("'", "''")) + "'|" + re.escape(self.table) + ")"
+            rel = re.compile(r"^(\s*(?:fromColumn|toColumn):\s*" + table_token + r"\.)" + old_token + r"[ \t]*$",
+                             re.IGNORECASE | re.MULTILINE)
+            content, n = rel.subn(lambda m: m.group(1) + new_token, content)
+            count += n
+
+        return content, count
+
+    def _plan_report(self) -> None:
+        index = build_index(self.report_path)
+        definition = index.definition_path
+
+        for rel_path in index.files_referencing(self.table, self.old_name):
+            path = definition / rel_path
+            original = self._read(path)
+            data = json.loads(original)
+            changed_paths: List[Tuple] = []
+            count = self._rewrite_pbir(data, changed_paths)
+            if count:
+                # Splice only the renamed values so the rest of the file keeps its formatting
+                self._stage(path, render_json_minimal(original, data, changed_paths), count)
+
+    def _rewrite_pbir(self, data: Any, changed_paths: List[Tuple]) -> int:
+        table_key, old_key = self.table.casefold(), self.old_name.casefold()
+        wanted = ('Measure',) if self.kind == 'measure' else ('Column', 'Aggregation')
+        count = 0
+
+        for path, parent, kind, entity, prop in list(iter_field_nodes(data)):
+            if kind not in wanted or entity.casefold() != table_key or prop.casefold() != old_key:
+                continue
+            node = parent[kind]
+            if kind == 'Aggregation':
+                inner = node.get('Expression', {})
+                inner_kind = 'Column' if 'Column' in inner else 'Measure'
+                node = inner[inner_kind]
+                path = path + ('Expression', inner_kind)
+            node['Property'] = self.new_name
+            changed_paths.append(path + ('Property',))
+            count += 1
+
+        count += self._rewrite_query_refs(data, changed_paths)
+        return count
+
+    def _rewrite_query_refs(self, data: Any, changed_paths: List[Tuple]) -> int:
+        """Rewrite queryRef ("Sales.Amount", "Sum(Sales.Amount)") and nativeQueryRef strings."""
+        query_ref = re.compile(r"(^|\()" + re.escape(self.table) + r"\." + re.escape(self.old_name) + r"(\)|$)",
+                               re.IGNORECASE)
+        native_ref = re.compile(r"^((?:\w+ of )?)" + re.escape(self.old_name) + r"$", re.IGNORECASE)
+        count = 0
+        stack = [((), data)]
+        while stack:
+            path, node = stack.pop()
+            if isinstance(node, dict):
+                ref = node.get('queryRef')
+                if isinstance(ref, str) and query_ref.search(ref):
+                    node['queryRef'] = query_ref.sub(lambda m: f"{m.group(1)}{self.table}.{self.new_name}{m.group(2)}", ref)
+                    changed_paths.append(path + ('queryRef',))
+                    count += 1
+                    native = node.get('nativeQueryRef')
+                    if isinstance(native, str) and native_ref.match(native):
+                        node['nativeQueryRef'] = native_ref.sub(lambda m: m.group(1) + self.new_name, native)
+                        changed_paths.append(path + ('nativeQueryRef',))
+                        count += 1
+                stack.extend((path + (k,), v) for k, v in node.items() if isinstance(v, (dict, list)))
+            elif isinstance(node, list):
+                stack.extend((path + (i,), v) for i, v in enumerate(node) if isinstance(v, (dict, list)))
+        return count
+
+    # -- applying ----------------------------------------------------------
+
+    def apply(self) -> None:
+        """
+        Commit the planned changes as one batch.
+
+        New content is written to sibling temp files first, then swapped in with
+        os.replace. If any step fails, already-replaced files are restored.
+        """
+        originals: Dict[Path, bytes] = {}
+        temps: Dict[Path, Path] = {}
+        try:
+            for path, content in self.changes.items():
+                originals[path] = path.read_bytes()
+                tmp = path.with_name(path.name + ".rename-tmp")
+                with open(tmp, 'w', encoding='utf-8', newline='') as f:
+                    f.write(content)
+                temps[path] = tmp
+
+            replaced = []
+            try:
+                for path, tmp in temps.items():
+                    os.replace(tmp, path)
+                    replaced.append(path)
+            except OSError:
+                for path in replaced:
+                    path.write_bytes(originals[path])
+                raise
+        finally:
+            for tmp in temps.values():
+                if tmp.exists():
+                    tmp.unlink()
+
+    # -- helpers -----------------------------------------------------------
+
+    @staticmethod
+    def _read(path: Path) -> str:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def _stage(self, path: Path, content: str, count: int) -> None:
+        self.changes[path] = content
+        self.change_counts[path] = count
+
+
+def rename_field(project_path: str, table: str, old_name: str, new_name: str,
+                 dry_run: bool = False) -> RenameResult:
+    """
+    Entry point: plan and (unless dry_run) apply a rename. Never raises for rename errors.
+
+    Raises:
+        FileNotFoundError: If the project or its *.SemanticModel definition is missing
+    """
+    started = time.perf_counter()
+    result = RenameResult(status="error", table=table, old_name=old_name, new_name=new_name)
+    renamer = FieldRenamer(project_path, table, old_name, new_name)
+    try:
+        renamer.plan()
+        result.kind = renamer.kind
+        result.changed_files = [
+            {"path": str(path.relative_to(renamer.project_path)).replace(os.sep, "/"),
+             "replacements": renamer.change_counts[path]}
+            for path in renamer.changes
+        ]
+        if not dry_run:
+            renamer.apply()
+        result.status = "dry_run" if dry_run else "applied"
+    except (RenameError, OSError, json.JSONDecodeError) as e:
+        result.error_message = str(e)
+    result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rename a measure or column across TMDL and PBIR files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument("project_path", help="Path to Power BI Project folder")
+    parser.add_argument("--table", required=True, help="Table that owns the field")
+    parser.add_argument("--old", required=True, dest="old_name", help="Current name")
+    parser.add_argument("--new", required=True, dest="new_name", help="New name")
+    parser.add_argument("--dry-run", action="store_true", dest="dry_run", help="Do not write files")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        result = rename_field(args.project_path, args.table, args.old_name, args.new_name, args.dry_run)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        label = {"applied": "[APPLIED]", "dry_run": "[DRY RUN]", "error": "[ERROR]"}[result.status]
+        print(f"{label} {result.table}[{result.old_name}] -> {result.table}[{result.new_name}]")
+        if result.error_message:
+            print(f"  {result.error_message}")
+        else:
+            print(f"  Kind: {result.kind}")
+            print(f"  Files changed: {len(result.changed_files)} ({result.elapsed_ms} ms)")
+            for item in result.changed_files:
+                print(f"    - {item['path']} ({item['replacements']} replacement(s))")
+
+    sys.exit(1 if result.status == "error" else 0)
+
+
+if __name__ == "__main__":
+    main()
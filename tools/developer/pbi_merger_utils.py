@@ -5,18 +5,69 @@ This module provides utility functions for comparing and merging Power BI projec
 Used by the powerbi-compare-project-code, powerbi-code-understander, and powerbi-code-merger agents.
 """
 
+import hashlib
 import json
 import os
 import re
 import shutil
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 
+from json_splice import render_json_minimal
+
 
 class TmdlParser:
     """Parser for TMDL (Tabular Model Definition Language) files."""
 
+    # Object declaration line: keyword followed by a bare or 'quoted' name
+    DECLARATION_PATTERN = re.compile(
+        r"^(?P<indent>\s*)(?P<kind>table|column|measure|hierarchy|level|partition|calculationGroup|calculationItem)"
+        r"\s+(?P<name>'(?:[^']|'')*'|[^\s=:']+)"
+    )
+
+    @staticmethod
+    def unquote_name(token: str) -> str:
+        """Decode a TMDL object name token ('Total Sales' -> Total Sales)."""
+        if len(token) >= 2 and token.startswith("'") and token.endswith("'"):
+            return token[1:-1].replace("''", "'")
+        return token
+
+    @staticmethod
+    def quote_name(name: str) -> str:
+        """Encode an object name for TMDL, quoting only when required."""
+        if re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', name):
+            return name
+        return "'" + name.replace("'", "''") + "'"
+
+    @staticmethod
+    def iter_declarations(tmdl_content: str):
+        """
+        Yield every object declaration in a TMDL file.
+
+        Yields dicts with: kind, name, table (enclosing table name), line_number (1-based),
+        line_start (character offset of the line), name_start/name_end (character
+        offsets of the name token within the content).
+        """
+        current_table = None
+        offset = 0
+        for line_number, line in enumerate(tmdl_content.splitlines(keepends=True), start=1):
+            match = TmdlParser.DECLARATION_PATTERN.match(line)
+            if match:
+                name = TmdlParser.unquote_name(match.group('name'))
+                if match.group('kind') == 'table' and not match.group('indent'):
+                    current_table = name
+                yield {
+                    'kind': match.group('kind'),
+                    'name': name,
+                    'table': current_table,
+                    'line_number': line_number,
+                    'line_start': offset,
+                    'name_start': offset + match.start('name'),
+                    'name_end': offset + match.end('name')
+                }
+            offset += len(line)
+
     @staticmethod
     def extract_measures(tmdl_content: str) -> List[Dict[str, Any]]:
         """Extract all measures from a TMDL file."""
@@ -99,6 +150,36 @@ class BimParser:
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
+    @staticmethod
+    def iter_model(file_path: str) -> Iterator[Tuple[str, Optional[int], Any]]:
+        """
+        Stream a model.bim without loading it whole.
+
+        Yields (key, index, value): tables one at a time as ("model.tables", i, table),
+        every other member once with a dotted key ("name", "model.relationships", ...).
+        Memory is bounded by the largest single table.
+        """
+        return iter(JsonObjectStream(file_path, stream_arrays=("model.tables",)))
+
+    @staticmethod
+    def iter_tables(file_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield the tables of a model.bim one at a time."""
+        for key, index, value in BimParser.iter_model(file_path):
+            if key == "model.tables" and index is not None:
+                yield value
+
+    @staticmethod
+    def load_table(file_path: str, table_name: str) -> Optional[Dict[str, Any]]:
+        """Read a single table from a model.bim, stopping as soon as it is found."""
+        tables = BimParser.iter_tables(file_path)
+        try:
+            for table in tables:
+                if table.get('name') == table_name:
+                    return table
+        finally:
+            tables.close()
+        return None
+
     @staticmethod
     def save_bim(file_path: str, bim_data: Dict[str, Any]) -> None:
         """Save model.bim with proper formatting."""
@@ -107,7 +188,7 @@ class BimParser:
 
     @staticmethod
     def find_table(bim_data: Dict[str, Any], table_name: str) -> Optional[Dict[str, Any]]:
-        """Find a table by name in the BIM model."""
+        """Find a table by name in the BIM model (linear scan; use BimModel for repeated lookups)."""
         tables = bim_data.get('model', {}).get('tables', [])
         for table in tables:
             if table.get('name') == table_name:
@@ -133,6 +214,375 @@ class BimParser:
         return None
 
 
+class BimModel:
+    """
+    Indexed, editable view of a model.bim.
+
+    BimParser.find_* scan lists on every call, which turns a batch of edits
+    into O(n²). This class builds name → index maps once (tables on load,
+    a table's measures/columns/... on first access) and keeps them in step
+    with every insert, rename and delete, so lookups are O(1) and a batch
+    of thousands of edits runs in linear time. Write back once with save().
+
+    Appends and renames are O(1); inserting or removing in the middle of a
+    list shifts the index entries after it. Use remove_children() to drop
+    many objects in one pass.
+
+    Usage:
+        model = BimModel.load("Sales.SemanticModel/model.bim")
+        model.set_measure("Sales", {"name": "Total Sales", "expression": "SUM(Sales[Amount])"})
+        model.rename_measure("Sales", "Total Sales", "Revenue")
+        model.save()
+    """
+
+    def __init__(self, bim_data: Dict[str, Any], file_path: Optional[str] = None):
+        self.data = bim_data
+        self.file_path = file_path
+        self._tables = self._build_index(self.tables)
+        # (id(table), collection) -> {name: index}
+        self._children: Dict[Tuple[int, str], Dict[str, int]] = {}
+
+    @classmethod
+    def load(cls, file_path: str) -> 'BimModel':
+        """Load a model.bim and index its tables."""
+        return cls(BimParser.load_bim(file_path), file_path)
+
+    @staticmethod
+    def _build_index(items: List[Dict[str, Any]]) -> Dict[str, int]:
+        index = {}
+        for i, item in enumerate(items):
+            index.setdefault(item.get('name'), i)
+        return index
+
+    @staticmethod
+    def _shift(items: List[Dict[str, Any]], index: Dict[str, int], start: int) -> None:
+        """Re-point index entries for items from start onward after an insert/delete."""
+        for i in range(start, len(items)):
+            index[items[i].get('name')] = i
+
+    @property
+    def tables(self) -> List[Dict[str, Any]]:
+        return self.data.setdefault('model', {}).setdefault('tables', [])
+
+    # Tables
+
+    def table_index(self, table_name: str) -> Optional[int]:
+        """Return the position of a table in model.tables."""
+        return self._tables.get(table_name)
+
+    def table(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Return a table by name."""
+        i = self._tables.get(table_name)
+        return None if i is None else self.tables[i]
+
+    def table_names(self) -> List[str]:
+        return [t.get('name') for t in self.tables]
+
+    def add_table(self, table: Dict[str, Any], index: Optional[int] = None) -> None:
+        """Insert a table (appended by default); raises ValueError on a duplicate name."""
+        name = table.get('name')
+        if name in self._tables:
+            raise ValueError(f"Table already exists: {name}")
+        tables = self.tables
+        if index is None or index >= len(tables):
+            self._tables[name] = len(tables)
+            tables.append(table)
+        else:
+            tables.insert(index, table)
+            self._shift(tables, self._tables, index)
+
+    def remove_table(self, table_name: str) -> Dict[str, Any]:
+        """Remove a table and return it; raises KeyError if absent."""
+        i = self._require(self._tables, table_name, "Table")
+        table = self.tables.pop(i)
+        del self._tables[table_name]
+        self._shift(self.tables, self._tables, i)
+        self._drop_child_indexes(table)
+        return table
+
+    def rename_table(self, old_name: str, new_name: str) -> Dict[str, Any]:
+        """
+        Rename a table in place.
+
+        Only the table object and the index change; relationships and DAX
+        references to the old name are left for the caller to update.
+        """
+        if new_name in self._tables:
+            raise ValueError(f"Table already exists: {new_name}")
+        i = self._require(self._tables, old_name, "Table")
+        table = self.tables[i]
+        table['name'] = new_name
+        del self._tables[old_name]
+        self._tables[new_name] = i
+        return table
+
+    # Table children (measures, columns, partitions, hierarchies)
+
+    def _child_index(self, table: Dict[str, Any], collection: str) -> Dict[str, int]:
+        key = (id(table), collection)
+        if key not in self._children:
+            self._children[key] = self._build_index(table.get(collection, []))
+        return self._children[key]
+
+    def _drop_child_indexes(self, table: Dict[str, Any]) -> None:
+        for key in [k for k in self._children if k[0] == id(table)]:
+            del self._children[key]
+
+    def _require_table(self, table_name: str) -> Dict[str, Any]:
+        return self.tables[self._require(self._tables, table_name, "Table")]
+
+    @staticmethod
+    def _require(index: Dict[str, int], name: str, kind: str) -> int:
+        i = index.get(name)
+        if i is None:
+            raise KeyError(f"{kind} not found: {name}")
+        return i
+
+    def child_index(self, table_name: str, name: str, collection: str = 'measures') -> Optional[int]:
+        """Return the position of a named object in a table collection."""
+        table = self.table(table_name)
+        if table is None:
+            return None
+        return self._child_index(table, collection).get(name)
+
+    def child(self, table_name: str, name: str, collection: str = 'measures') -> Optional[Dict[str, Any]]:
+        """Return a named object from a table collection (measures by default)."""
+        table = self.table(table_name)
+        if table is None:
+            return None
+        i = self._child_index(table, collection).get(name)
+        return None if i is None else table[collection][i]
+
+    def children(self, table_name: str, collection: str = 'measures') -> Dict[str, Dict[str, Any]]:
+        """Return a table collection as a name → object dict (built from the cached index)."""
+        table = self.table(table_name)
+        if table is None:
+            return {}
+        items = table.get(collection, [])
+        return {name: items[i] for name, i in self._child_index(table, collection).items()}
+
+    def add_child(self, table_name: str, obj: Dict[str, Any], collection: str = 'measures',
+                  index: Optional[int] = None) -> None:
+        """Insert an object into a table collection; raises ValueError on a duplicate name."""
+        table = self._require_table(table_name)
+        names = self._child_index(table, collection)
+        name = obj.get('name')
+        if name in names:
+            raise ValueError(f"{collection[:-1].capitalize()} already exists in {table_name}: {name}")
+        items = table.setdefault(collection, [])
+        if index is None or index >= len(items):
+            names[name] = len(items)
+            items.append(obj)
+        else:
+            items.insert(index, obj)
+            self._shift(items, names, index)
+
+    def set_child(self, table_name: str, obj: Dict[str, Any], collection: str = 'measures') -> bool:
+        """
+        Replace the object with the same name, or append it if absent.
+
+        Returns:
+            True if an existing object was replaced
+        """
+        table = self._require_table(table_name)
+        i = self._child_index(table, collection).get(obj.get('name'))
+        if i is None:
+            self.add_child(table_name, obj, collection)
+            return False
+        table[collection][i] = obj
+        return True
+
+    def remove_child(self, table_name: str, name: str, collection: str = 'measures') -> Dict[str, Any]:
+        """Remove a named object from a table collection and return it; raises KeyError if absent."""
+        table = self._require_table(table_name)
+        names = self._child_index(table, collection)
+        i = self._require(names, name, collection[:-1].capitalize())
+        items = table[collection]
+        obj = items.pop(i)
+        del names[name]
+        self._shift(items, names, i)
+        return obj
+
+    def remove_children(self, table_name: str, names: List[str], collection: str = 'measures') -> int:
+        """Remove many objects from a table collection in one pass; returns the number removed."""
+        table = self._require_table(table_name)
+        drop = set(names)
+        items = table.get(collection, [])
+        kept = [item for item in items if item.get('name') not in drop]
+        removed = len(items) - len(kept)
+        if removed:
+            items[:] = kept
+            self._children[(id(table), collection)] = self._build_index(items)
+        return removed
+
+    def rename_child(self, table_name: str, old_name: str, new_name: str,
+                     collection: str = 'measures') -> Dict[str, Any]:
+        """Rename an object in a table collection in place."""
+        table = self._require_table(table_name)
+        names = self._child_index(table, collection)
+        kind = collection[:-1].capitalize()
+        if new_name in names:
+            raise ValueError(f"{kind} already exists in {table_name}: {new_name}")
+        i = self._require(names, old_name, kind)
+        obj = table[collection][i]
+        obj['name'] = new_name
+        del names[old_name]
+        names[new_name] = i
+        return obj
+
+    # Measure shorthands
+
+    def measure(self, table_name: str, measure_name: str) -> Optional[Dict[str, Any]]:
+        return self.child(table_name, measure_name)
+
+    def measure_index(self, table_name: str, measure_name: str) -> Optional[int]:
+        return self.child_index(table_name, measure_name)
+
+    def measures(self, table_name: str) -> Dict[str, Dict[str, Any]]:
+        return self.children(table_name)
+
+    def add_measure(self, table_name: str, measure: Dict[str, Any], index: Optional[int] = None) -> None:
+        self.add_child(table_name, measure, index=index)
+
+    def set_measure(self, table_name: str, measure: Dict[str, Any]) -> bool:
+        return self.set_child(table_name, measure)
+
+    def remove_measure(self, table_name: str, measure_name: str) -> Dict[str, Any]:
+        return self.remove_child(table_name, measure_name)
+
+    def rename_measure(self, table_name: str, old_name: str, new_name: str) -> Dict[str, Any]:
+        return self.rename_child(table_name, old_name, new_name)
+
+    def save(self, file_path: Optional[str] = None) -> None:
+        """Write the model back with a single BimParser.save_bim."""
+        target = file_path or self.file_path
+        if target is None:
+            raise ValueError("No file path to save to")
+        BimParser.save_bim(target, self.data)
+        self.file_path = target
+
+
+class JsonObjectStream:
+    """
+    Incremental reader for a large JSON object file.
+
+    Top-level members are decoded one at a time from a bounded buffer, and
+    members named in stream_arrays are yielded item by item, so a multi-MB
+    report.json can be processed section by section without holding the
+    whole document. Dotted paths (e.g. "model.tables") stream arrays nested
+    in objects; members of the enclosing objects are yielded with dotted keys.
+
+    file_path may also be an already-open text stream (e.g. a zip member
+    wrapped in io.TextIOWrapper); it is read once and left open.
+
+    Usage:
+        for key, index, value in JsonObjectStream("report.json", stream_arrays=("sections",)):
+            # index is None for ordinary members, the item index for streamed arrays
+            ...
+    """
+
+    def __init__(self, file_path: Any, stream_arrays: Tuple[str, ...] = (), chunk_size: int = 1 << 20):
+        self.file_path = file_path
+        self.stream_arrays = set(stream_arrays)
+        # Objects on the way to a nested streamed array are walked member by member
+        self._descend = {path.rsplit('.', i)[0] for path in self.stream_arrays
+                         for i in range(1, path.count('.') + 1)}
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+
+    def __iter__(self):
+        if hasattr(self.file_path, 'read'):
+            yield from self._iter_stream(self.file_path)
+        else:
+            with open(self.file_path, 'r', encoding='utf-8-sig') as f:
+                yield from self._iter_stream(f)
+
+    def _iter_stream(self, f):
+        self._file = f
+        self._label = getattr(f, 'name', self.file_path)
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        try:
+            yield from self._iter_object()
+        finally:
+            self._file = None
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Append more text to the buffer; False at end of file."""
+        if self._eof:
+            return False
+        if self._pos > self.chunk_size:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        chunk = self._file.read(size or self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _next_char(self) -> str:
+        """Skip whitespace and return the next significant character (not consumed)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError(f"Unexpected end of JSON in {self._label}")
+
+    def _expect(self, chars: str) -> str:
+        char = self._next_char()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self._pos} in {self._label}, found {char!r}")
+        self._pos += 1
+        return char
+
+    def _decode_value(self) -> Any:
+        self._next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A scalar is only complete once a delimiter follows it; a number
+                # cut at the buffer edge (e.g. "2." of "2.5e3") continues in the next chunk
+                if self._eof or self._buf[self._pos] in '"{[' or (
+                        end < len(self._buf) and self._buf[end] in ',]} \t\r\n'):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Grow geometrically so very large values are re-scanned only a few times
+            self._fill(max(self.chunk_size, len(self._buf) - self._pos))
+
+    def _iter_object(self, prefix: str = ''):
+        self._expect('{')
+        if self._next_char() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = prefix + self._decode_value()
+            self._expect(':')
+            if key in self._descend and self._next_char() == '{':
+                yield from self._iter_object(key + '.')
+            elif key in self.stream_arrays and self._next_char() == '[':
+                self._pos += 1
+                index = 0
+                if self._next_char() != ']':
+                    while True:
+                        yield key, index, self._decode_value()
+                        index += 1
+                        if self._expect(',]') == ']':
+                            break
+                else:
+                    self._pos += 1
+            else:
+                yield key, None, self._decode_value()
+            if self._expect(',}') == '}':
+                return
+
+
 class ReportJsonParser:
     """Parser for report.json files."""
 
@@ -154,21 +604,232 @@ class ReportJsonParser:
         return report_data.get('sections', [])
 
     @staticmethod
-    def find_visual(page: Dict[str, Any], visual_name: str) -> Optional[Dict[str, Any]]:
-        """Find a visual by name in a page."""
-        containers = page.get('visualContainers', [])
-        for container in containers:
-            config = container.get('config', '')
-            # Parse the config JSON string
-            try:
-                config_data = json.loads(config) if isinstance(config, str) else config
-                if config_data.get('name') == visual_name:
-                    return container
-            except json.JSONDecodeError:
-                continue
+    def load_layout(file_path: str) -> 'LegacyReportLayout':
+        """Load report.json as an indexed, lazily-decoded LegacyReportLayout."""
+        return LegacyReportLayout.load(file_path)
+
+    @staticmethod
+    def find_visual(source: Any, visual_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a visual container by name.
+
+        Args:
+            source: A LegacyReportLayout (indexed lookup across the report) or a
+                single page dict (scanned without decoding configs)
+        """
+        if isinstance(source, LegacyReportLayout):
+            return source.container(visual_name)
+        for container in source.get('visualContainers', []):
+            if config_name(container.get('config', '')) == visual_name:
+                return container
         return None
 
 
+_LEADING_NAME = re.compile(r'\s*\{\s*"name"\s*:\s*"([^"\\]*(?:\\.[^"\\]*)*)"')
+
+
+def config_name(config: Any) -> Optional[str]:
+    """
+    Return the visual name from a legacy container config (JSON string or dict).
+
+    Desktop writes "name" as the first key, so it is read with a regex without
+    decoding the rest of the blob; other layouts fall back to a full decode.
+    """
+    if isinstance(config, dict):
+        return config.get('name')
+    if not isinstance(config, str):
+        return None
+    match = _LEADING_NAME.match(config)
+    if match:
+        return json.loads(f'"{match.group(1)}"')
+    try:
+        data = json.loads(config)
+    except json.JSONDecodeError:
+        return None
+    return data.get('name') if isinstance(data, dict) else None
+
+
+class LegacyReportLayout:
+    """
+    Indexed, lazily-decoded view of a legacy (non-PBIR) report.json.
+
+    Legacy layouts store each visual's config, filters, query and
+    dataTransforms as JSON strings. This class maps visual names to
+    (section index, container index) on first lookup, decodes a string only
+    when it is accessed (caching the result), and on save re-encodes only the
+    strings that were changed, splicing them into the original file text.
+
+    Usage:
+        layout = LegacyReportLayout.load("Sales.Report/report.json")
+        config = layout.blob("abc123")            # decoded visual config
+        config["singleVisual"]["visualType"] = "barChart"
+        layout.mark_changed("abc123")
+        layout.save()
+    """
+
+    ENCODED_FIELDS = ('config', 'filters', 'query', 'dataTransforms')
+
+    def __init__(self, report_data: Dict[str, Any], file_path: Optional[str] = None,
+                 original_text: Optional[str] = None):
+        self.data = report_data
+        self.file_path = file_path
+        self.original_text = original_text
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None
+        self._decoded: Dict[Tuple, Any] = {}
+        self._changed: set = set()
+        self.bom = False
+
+    @classmethod
+    def load(cls, file_path: str) -> 'LegacyReportLayout':
+        """Load report.json, keeping the raw text for minimal write-back."""
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        layout = cls(json.loads(text.lstrip('\ufeff')), file_path, text.lstrip('\ufeff'))
+        layout.bom = text.startswith('\ufeff')
+        return layout
+
+    @property
+    def sections(self) -> List[Dict[str, Any]]:
+        return self.data.get('sections', [])
+
+    def _build_index(self) -> Dict[str, Tuple[int, int]]:
+        index = {}
+        for si, section in enumerate(self.sections):
+            for ci, container in enumerate(section.get('visualContainers', [])):
+                cached = self._decoded.get((si, ci, 'config'))
+                name = cached.get('name') if isinstance(cached, dict) else config_name(container.get('config'))
+                if name is not None:
+                    index.setdefault(name, (si, ci))
+        return index
+
+    def locate(self, visual_name: str) -> Optional[Tuple[int, int]]:
+        """Return (section index, container index) for a visual name."""
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index.get(visual_name)
+
+    def visual_names(self, section: int) -> List[str]:
+        """Names of the visuals in one section, in container order."""
+        if self._index is None:
+            self._index = self._build_index()
+        located = sorted((ci, name) for name, (si, ci) in self._index.items() if si == section)
+        return [name for _, name in located]
+
+    def container(self, visual_name: str) -> Optional[Dict[str, Any]]:
+        """Return the raw visual container for a visual name."""
+        location = self.locate(visual_name)
+        if location is None:
+            return None
+        return self.sections[location[0]]['visualContainers'][location[1]]
+
+    def _owner(self, key: Tuple) -> Dict[str, Any]:
+        si, ci, _ = key
+        if si is None:
+            return self.data
+        if ci is None:
+            return self.sections[si]
+        return self.sections[si]['visualContainers'][ci]
+
+    def _key(self, visual_name: Optional[str], field: str, section: Optional[int]) -> Tuple:
+        if field not in self.ENCODED_FIELDS:
+            raise ValueError(f"Not an encoded field: {field}")
+        if visual_name is None:
+            return (section, None, field)
+        location = self.locate(visual_name)
+        if location is None:
+            raise KeyError(f"Visual not found: {visual_name}")
+        return (location[0], location[1], field)
+
+    def blob(self, visual_name: Optional[str] = None, field: str = 'config',
+             section: Optional[int] = None) -> Any:
+        """
+        Decoded value of an encoded field, cached after the first access.
+
+        Args:
+            visual_name: Visual to read; None for a section (by index) or the report itself
+            field: One of ENCODED_FIELDS
+            section: Section index when visual_name is None (None = report level)
+
+        Returns:
+            The decoded value, or None if the field is absent
+        """
+        key = self._key(visual_name, field, section)
+        if key not in self._decoded:
+            raw = self._owner(key).get(field)
+            self._decoded[key] = json.loads(raw) if isinstance(raw, str) else raw
+        return self._decoded[key]
+
+    def set_blob(self, value: Any, visual_name: Optional[str] = None, field: str = 'config',
+                 section: Optional[int] = None) -> None:
+        """Replace the decoded value of an encoded field and mark it changed."""
+        key = self._key(visual_name, field, section)
+        self._decoded[key] = value
+        self._changed.add(key)
+
+    def mark_changed(self, visual_name: Optional[str] = None, field: str = 'config',
+                     section: Optional[int] = None) -> None:
+        """Flag a blob returned by blob() as modified in place."""
+        key = self._key(visual_name, field, section)
+        if key not in self._decoded:
+            self.blob(visual_name, field, section)
+        self._changed.add(key)
+
+    def encode_changes(self) -> List[Tuple]:
+        """Re-encode changed blobs into the report data; returns their JSON paths."""
+        paths = []
+        for key in sorted(self._changed, key=str):
+            si, ci, field = key
+            self._owner(key)[field] = json.dumps(self._decoded[key], ensure_ascii=False, separators=(',', ':'))
+            if si is None:
+                paths.append((field,))
+            elif ci is None:
+                paths.append(('sections', si, field))
+            else:
+                paths.append(('sections', si, 'visualContainers', ci, field))
+            if field == 'config' and ci is not None:
+                # A renamed visual invalidates the name index
+                self._index = None
+        self._changed.clear()
+        return paths
+
+    def save(self, file_path: Optional[str] = None) -> int:
+        """
+        Write the report, re-encoding only changed blobs.
+
+        When the original text is available, changed strings are spliced into it
+        so the rest of the file is left byte-for-byte unchanged.
+
+        Returns:
+            Number of blobs re-encoded
+        """
+        target = file_path or self.file_path
+        if target is None:
+            raise ValueError("No file path to save to")
+        paths = self.encode_changes()
+        if self.original_text is not None:
+            text = render_json_minimal(self.original_text, self.data, paths)
+        else:
+            text = json.dumps(self.data, indent=2, ensure_ascii=False)
+        with open(target, 'w', encoding='utf-8', newline='') as f:
+            f.write('\ufeff' + text if self.bom else text)
+        self.original_text = text
+        self.file_path = target
+        return len(paths)
+
+
+def canonical_hash(obj: Any) -> str:
+    """Hash of a JSON value with sorted keys, so key order alone never registers as a change."""
+    text = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def bim_expression(value: Any) -> str:
+    """model.bim stores long expressions as a list of lines; join them back to text."""
+    if isinstance(value, list):
+        return '\n'.join(value)
+    return value or ''
+
+
 class ProjectComparer:
     """Main comparison logic for Power BI projects."""
 
@@ -347,43 +1008,166 @@ class ProjectComparer:
                     }
                 })
 
-    def _compare_bim_model(self, main_model: Path, comp_model: Path) -> None:
-        """Compare BIM-format models."""
-        main_bim = BimParser.load_bim(str(main_model / 'model.bim'))
-        comp_bim = BimParser.load_bim(str(comp_model / 'model.bim'))
+    # model.bim collections diffed object by object; everything else on a table
+    # is compared as one table-level property set
+    BIM_TABLE_COLLECTIONS = ('columns', 'measures', 'partitions')
 
-        # Compare tables
-        main_tables = {t['name']: t for t in main_bim.get('model', {}).get('tables', [])}
-        comp_tables = {t['name']: t for t in comp_bim.get('model', {}).get('tables', [])}
-
-        # Compare measures in each table
-        for table_name in main_tables.keys() & comp_tables.keys():
-            self._compare_bim_table_measures(
-                table_name,
-                main_tables[table_name],
-                comp_tables[table_name]
+    def _compare_bim_model(self, main_model: Path, comp_model: Path) -> None:
+        """
+        Compare BIM-format models.
+
+        Every object is hashed in canonical form and equal subtrees are skipped,
+        so unchanged tables cost one hash each. Diffs use the same schema as the
+        TMDL comparison.
+        """
+        main_bim = BimModel.load(str(main_model / 'model.bim'))
+        comp_bim = BimModel.load(str(comp_model / 'model.bim'))
+        self._bim_files = (
+            str((main_model / 'model.bim').relative_to(self.main_path.parent)),
+            str((comp_model / 'model.bim').relative_to(self.comparison_path.parent)),
+        )
+
+        # Tables
+        comp_names = set()
+        for comp_table in comp_bim.tables:
+            table_name = comp_table.get('name')
+            comp_names.add(table_name)
+            main_table = main_bim.table(table_name)
+            if main_table is None:
+                self._add_bim_diff(self._bim_table_type(comp_table), table_name, 'Added',
+                                   None, self._bim_table_code(comp_table))
+            elif canonical_hash(main_table) != canonical_hash(comp_table):
+                self._compare_bim_table(table_name, main_bim, comp_bim)
+        for main_table in main_bim.tables:
+            if main_table.get('name') not in comp_names:
+                self._add_bim_diff(self._bim_table_type(main_table), main_table.get('name'), 'Deleted',
+                                   self._bim_table_code(main_table), None)
+
+        # Model-level collections
+        main = main_bim.data.get('model', {})
+        comp = comp_bim.data.get('model', {})
+        self._compare_bim_objects(main.get('relationships', []), comp.get('relationships', []),
+                                  self._bim_relationship_key, lambda r: 'Relationship')
+        self._compare_bim_objects(main.get('roles', []), comp.get('roles', []),
+                                  lambda r: r.get('name'), lambda r: 'Role')
+        self._compare_bim_objects(main.get('expressions', []), comp.get('expressions', []),
+                                  lambda e: e.get('name'), self._bim_expression_type,
+                                  lambda e: bim_expression(e.get('expression')))
+
+    def _compare_bim_table(self, table_name: str, main_bim: BimModel, comp_bim: BimModel) -> None:
+        """Diff a changed table: its own properties, then columns, measures and partitions."""
+        main_table = main_bim.table(table_name)
+        comp_table = comp_bim.table(table_name)
+
+        main_props = {k: v for k, v in main_table.items() if k not in self.BIM_TABLE_COLLECTIONS}
+        comp_props = {k: v for k, v in comp_table.items() if k not in self.BIM_TABLE_COLLECTIONS}
+        if canonical_hash(main_props) != canonical_hash(comp_props):
+            self._add_bim_diff('Table', table_name, 'Modified',
+                               self._bim_json(main_props), self._bim_json(comp_props))
+
+        for collection in self.BIM_TABLE_COLLECTIONS:
+            main_items = main_table.get(collection, [])
+            comp_items = comp_table.get(collection, [])
+            if canonical_hash(main_items) == canonical_hash(comp_items):
+                continue
+            self._compare_bim_objects(
+                main_items, comp_items,
+                lambda o: o.get('name'),
+                lambda o, c=collection, t=comp_table: self._bim_child_type(c, o, t),
+                self._bim_child_code,
+                parent_table=table_name,
+                main_lookup=lambda name, c=collection: main_bim.child(table_name, name, c),
             )
 
-    def _compare_bim_table_measures(self, table_name: str, main_table: Dict, comp_table: Dict) -> None:
-        """Compare measures in a BIM table."""
-        main_measures = {m['name']: m for m in main_table.get('measures', [])}
-        comp_measures = {m['name']: m for m in comp_table.get('measures', [])}
+    def _compare_bim_objects(self, main_items: List[Dict], comp_items: List[Dict], key, type_of,
+                             code_of=None, parent_table: Optional[str] = None, main_lookup=None) -> None:
+        """Emit Added/Modified/Deleted diffs for two lists of named BIM objects."""
+        code_of = code_of or self._bim_json
+        if main_lookup is None:
+            main_index = {}
+            for item in main_items:
+                main_index.setdefault(key(item), item)
+            main_lookup = main_index.get
+        metadata = {'parent_table': parent_table} if parent_table else {}
+
+        comp_keys = set()
+        for comp_item in comp_items:
+            name = key(comp_item)
+            comp_keys.add(name)
+            main_item = main_lookup(name)
+            if main_item is None:
+                self._add_bim_diff(type_of(comp_item), name, 'Added', None, code_of(comp_item), metadata)
+            elif canonical_hash(main_item) != canonical_hash(comp_item):
+                main_code, comp_code = code_of(main_item), code_of(comp_item)
+                if main_code == comp_code:
+                    # Only properties outside the expression changed (formatString, isHidden, ...)
+                    main_code, comp_code = self._bim_json(main_item), self._bim_json(comp_item)
+                changed = sorted(k for k in set(main_item) | set(comp_item) if main_item.get(k) != comp_item.get(k))
+                self._add_bim_diff(type_of(comp_item), name, 'Modified', main_code, comp_code,
+                                   dict(metadata, changed_properties=changed))
+        for main_item in main_items:
+            name = key(main_item)
+            if name not in comp_keys:
+                self._add_bim_diff(type_of(main_item), name, 'Deleted', code_of(main_item), None, metadata)
+
+    def _add_bim_diff(self, component_type: str, component_name: str, status: str,
+                      main_code: Optional[str], comp_code: Optional[str],
+                      metadata: Optional[Dict[str, Any]] = None) -> None:
+        main_file, comp_file = self._bim_files
+        self.diffs.append({
+            'diff_id': self.generate_diff_id(),
+            'component_type': component_type,
+            'component_name': component_name,
+            'file_path': main_file if status == 'Deleted' else comp_file,
+            'status': status,
+            'main_version_code': main_code,
+            'comparison_version_code': comp_code,
+            'metadata': dict(metadata or {})
+        })
 
-        for measure_name in comp_measures:
-            if measure_name in main_measures:
-                if main_measures[measure_name].get('expression') != comp_measures[measure_name].get('expression'):
-                    self.diffs.append({
-                        'diff_id': self.generate_diff_id(),
-                        'component_type': 'Measure',
-                        'component_name': measure_name,
-                        'file_path': 'model.bim',
-                        'status': 'Modified',
-                        'main_version_code': main_measures[measure_name].get('expression', ''),
-                        'comparison_version_code': comp_measures[measure_name].get('expression', ''),
-                        'metadata': {
-                            'parent_table': table_name
-                        }
-                    })
+    @staticmethod
+    def _bim_json(obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def _bim_table_type(table: Dict) -> str:
+        sources = [p.get('source', {}).get('type') for p in table.get('partitions', [])]
+        return 'CalculatedTable' if 'calculated' in sources else 'Table'
+
+    def _bim_table_code(self, table: Dict) -> str:
+        # Same 500-character preview as added TMDL tables
+        content = self._bim_json(table)
+        return content[:500] + '...' if len(content) > 500 else content
+
+    @staticmethod
+    def _bim_child_type(collection: str, obj: Dict, table: Dict) -> str:
+        if collection == 'measures':
+            return 'Measure'
+        if collection == 'columns':
+            return 'CalculatedColumn' if obj.get('type') == 'calculated' else 'Column'
+        # Partitions carry the table's M query, or the DAX of a calculated table
+        return 'CalculatedTable' if obj.get('source', {}).get('type') == 'calculated' else 'Expression'
+
+    def _bim_child_code(self, obj: Dict) -> str:
+        """Measure/column expression or partition query; other objects as JSON."""
+        if 'source' in obj:
+            source = obj['source']
+            if 'expression' in source or 'query' in source:
+                return bim_expression(source.get('expression', source.get('query')))
+        if obj.get('expression') is not None:
+            return bim_expression(obj['expression'])
+        return self._bim_json(obj)
+
+    @staticmethod
+    def _bim_relationship_key(relationship: Dict) -> str:
+        # Relationship names are GUIDs that differ between copies; match on endpoints
+        return (f"'{relationship.get('fromTable')}'[{relationship.get('fromColumn')}] -> "
+                f"'{relationship.get('toTable')}'[{relationship.get('toColumn')}]")
+
+    @staticmethod
+    def _bim_expression_type(expression: Dict) -> str:
+        text = bim_expression(expression.get('expression'))
+        return 'Parameter' if re.search(r'IsParameterQuery\s*=\s*true', text) else 'Expression'
 
     def _compare_report(self) -> None:
         """Compare report.json files."""
@@ -393,12 +1177,12 @@ class ProjectComparer:
         if not main_report_path or not comp_report_path:
             return
 
-        main_report = ReportJsonParser.load_report(str(main_report_path))
-        comp_report = ReportJsonParser.load_report(str(comp_report_path))
+        main_layout = ReportJsonParser.load_layout(str(main_report_path))
+        comp_layout = ReportJsonParser.load_layout(str(comp_report_path))
 
         # Compare pages
-        main_pages = {p.get('displayName', p.get('name', '')): p for p in ReportJsonParser.get_pages(main_report)}
-        comp_pages = {p.get('displayName', p.get('name', '')): p for p in ReportJsonParser.get_pages(comp_report)}
+        main_pages = {p.get('displayName', p.get('name', '')): p for p in ReportJsonParser.get_pages(main_layout.data)}
+        comp_pages = {p.get('displayName', p.get('name', '')): p for p in ReportJsonParser.get_pages(comp_layout.data)}
 
         # Added pages
         for page_name in comp_pages.keys() - main_pages.keys():
@@ -413,6 +1197,50 @@ class ProjectComparer:
                 'metadata': {}
             })
 
+        # Visuals on pages present in both reports, matched by name through the layout index
+        main_sections = {p.get('displayName', p.get('name', '')): i for i, p in enumerate(main_layout.sections)}
+        comp_sections = {p.get('displayName', p.get('name', '')): i for i, p in enumerate(comp_layout.sections)}
+        for page_name in sorted(main_pages.keys() & comp_pages.keys()):
+            main_si, comp_si = main_sections[page_name], comp_sections[page_name]
+            metadata = {'page_name': page_name}
+            comp_names = comp_layout.visual_names(comp_si)
+            for name in comp_names:
+                location = main_layout.locate(name)
+                comp_code = self._legacy_visual_code(comp_layout, name)
+                if location is None or location[0] != main_si:
+                    self._add_report_diff(comp_report_path, 'Added', name, None, comp_code, metadata)
+                elif canonical_hash(main_layout.container(name)) != canonical_hash(comp_layout.container(name)):
+                    self._add_report_diff(comp_report_path, 'Modified', name,
+                                          self._legacy_visual_code(main_layout, name), comp_code, metadata)
+            comp_set = set(comp_names)
+            for name in main_layout.visual_names(main_si):
+                if name not in comp_set:
+                    self._add_report_diff(main_report_path, 'Deleted', name,
+                                          self._legacy_visual_code(main_layout, name), None, metadata)
+
+    def _add_report_diff(self, report_path: Path, status: str, visual_name: str,
+                         main_code: Optional[str], comp_code: Optional[str], metadata: Dict[str, Any]) -> None:
+        root = self.main_path if status == 'Deleted' else self.comparison_path
+        self.diffs.append({
+            'diff_id': self.generate_diff_id(),
+            'component_type': 'Visual',
+            'component_name': visual_name,
+            'file_path': str(report_path.relative_to(root.parent)),
+            'status': status,
+            'main_version_code': main_code,
+            'comparison_version_code': comp_code,
+            'metadata': dict(metadata, visual_id=visual_name)
+        })
+
+    @staticmethod
+    def _legacy_visual_code(layout: 'LegacyReportLayout', visual_name: str) -> str:
+        """Visual container as JSON, with its encoded strings decoded for review."""
+        container = dict(layout.container(visual_name))
+        for field in LegacyReportLayout.ENCODED_FIELDS:
+            if isinstance(container.get(field), str):
+                container[field] = layout.blob(visual_name, field)
+        return json.dumps(container, indent=2, ensure_ascii=False)
+
     def _find_report_json(self, project_path: Path) -> Optional[Path]:
         """Find report.json in project."""
         for folder in project_path.iterdir():
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Power BI Project Doctor
+
+Runs the project health checks that agents otherwise call one by one
+(pbi_project_validator.py, tmdl_format_validator.py, the path-length audit,
+pbir_schema_validator.py, model_reference_checker.py) as one staged pipeline
+and returns a single combined result.
+
+The project folder is listed once (ProjectManifest) and that listing is shared
+by format detection, structure validation, the path audit and the file lists
+for TMDL and schema validation. Stages run in order and a fatal failure stops
+the later stages:
+
+    1. structure    Format detection and required folders/files (fatal on error)
+    2. files        path_audit, tmdl_format, pbir_schema - run concurrently;
+                    TMDL or schema errors are fatal (the project will not open)
+    3. references   model_references - report fields resolved against the model
+
+Usage:
+    python pbi_project_doctor.py <project_path> [--visual-changes] [--new-base <path>]
+                                 [--workers N] [--json]
+
+Arguments:
+    project_path          Path to a Power BI project folder or PBIX file
+
+Options:
+    --visual-changes      Visual property changes are expected (requires .Report folder)
+    --new-base <path>     Also project path lengths under this base folder
+    --workers N           Worker processes for schema validation (default: CPU count)
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - Healthy (warnings allowed)
+    1 - Issues found, or action required (e.g. PBIX needs conversion)
+    2 - Path not found or not a valid Power BI project
+
+Examples:
+    python pbi_project_doctor.py "C:\\Projects\\SalesReport"
+    python pbi_project_doctor.py "C:\\Projects\\SalesReport" --new-base "C:\\PBI" --json
+"""
+
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from pbi_project_validator import PbiProjectValidator, ProjectManifest, ValidationResult
+from tmdl_format_validator import TmdlFormatValidator, Severity
+from pbir_schema_validator import schema_for_file, validate_files
+from model_reference_checker import check_project
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Per-check cap on issue details carried in the combined result
+DETAIL_LIMIT = 50
+
+STATUS_ICONS = {"passed": "✅", "warning": "⚠️", "failed": "❌", "skipped": "⏭️"}
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one check"""
+    name: str
+    stage: str
+    status: str  # "passed", "warning", "failed", "skipped"
+    fatal: bool = False  # Failure stops later stages
+    summary: str = ""
+    details: Dict[str, Any] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class DoctorReport:
+    """Combined result of all stages"""
+    project_path: str
+    status: str  # "healthy", "warnings", "issues_found", "action_required", "fatal"
+    format: Optional[str]
+    manifest: Dict[str, Any]
+    checks: List[CheckResult]
+    validation: Dict[str, Any]
+    stopped_after: Optional[str] = None  # Stage whose fatal failure skipped later stages
+    elapsed_ms: float = 0.0
+
+
+def _timed(check: Callable[[], CheckResult]) -> CheckResult:
+    started = time.perf_counter()
+    result = check()
+    result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+class ProjectDoctor:
+    """Staged, single-manifest health check for a Power BI project."""
+
+    def __init__(self, project_path: str, visual_changes_expected: bool = False,
+                 new_base_path: Optional[str] = None, workers: Optional[int] = None):
+        self.project_path = Path(project_path).resolve()
+        self.visual_changes_expected = visual_changes_expected
+        self.new_base_path = new_base_path
+        self.workers = workers
+        self.manifest: Optional[ProjectManifest] = None
+        self.validator: Optional[PbiProjectValidator] = None
+        self.validation: Optional[ValidationResult] = None
+
+    # ------------------------------------------------------------------
+    # Stage 1: structure
+    # ------------------------------------------------------------------
+
+    def check_structure(self) -> CheckResult:
+        if self.project_path.is_dir():
+            self.manifest = ProjectManifest.build(self.project_path, PbiProjectValidator.AUDIT_SKIP_DIRS)
+        self.validator = PbiProjectValidator(str(self.project_path), self.visual_changes_expected,
+                                             manifest=self.manifest)
+        self.validation = self.validator.validate()
+        v = self.validation
+        if v.status == "validated":
+            return CheckResult("structure", "structure", "passed",
+                               summary=f"{v.format} project; model at {v.semantic_model_path}",
+                               details={"semantic_model_path": v.semantic_model_path, "report_path": v.report_path})
+        if v.status == "action_required":
+            return CheckResult("structure", "structure", "failed", fatal=True,
+                               summary=f"Action required: {v.action_type}",
+                               details={"pbix_inspection": v.pbix_inspection})
+        return CheckResult("structure", "structure", "failed", fatal=True,
+                           summary=f"{v.action_type}: {(v.error_message or '').splitlines()[0]}",
+                           details={"suggested_fix": v.suggested_fix})
+
+    # ------------------------------------------------------------------
+    # Stage 2: files
+    # ------------------------------------------------------------------
+
+    def check_path_audit(self) -> CheckResult:
+        audit = self.validator.audit_path_lengths(new_base_path=self.new_base_path).to_dict()
+        level = audit["warning_level"]
+        status = {"ok": "passed", "caution": "warning", "warning": "warning"}.get(level, "failed")
+        summary = (f"Longest path {audit['max_path_length']} of {PbiProjectValidator.MAX_PATH} "
+                   f"({audit['over_limit_count']} over, {audit['near_limit_count']} near the limit)")
+        if audit["projected_max_length"] is not None:
+            summary += f"; {audit['projected_max_length']} under {self.new_base_path}"
+        return CheckResult("path_audit", "files", status, summary=summary, details=audit)
+
+    def _tmdl_root(self) -> Optional[Path]:
+        if not self.validation.semantic_model_path:
+            return None
+        return Path(self.validation.semantic_model_path)
+
+    def check_tmdl_format(self) -> CheckResult:
+        root = self._tmdl_root()
+        files = self.manifest.files(root, ".tmdl") if root else []
+        if not files:
+            return CheckResult("tmdl_format", "files", "skipped", summary="No TMDL files")
+
+        def validate(path: Path) -> TmdlFormatValidator:
+            validator = TmdlFormatValidator(str(path))
+            validator.validate()
+            return validator
+
+        errors, warnings = [], 0
+        with ThreadPoolExecutor() as pool:
+            for validator in pool.map(validate, files):
+                for issue in validator.issues:
+                    if issue.severity == Severity.ERROR:
+                        errors.append({"file": str(validator.file_path.relative_to(root)),
+                                       "line": issue.line_number, "code": issue.code, "message": issue.message})
+                    elif issue.severity == Severity.WARNING:
+                        warnings += 1
+        status = "failed" if errors else ("warning" if warnings else "passed")
+        return CheckResult("tmdl_format", "files", status, fatal=bool(errors),
+                           summary=f"{len(files)} files, {len(errors)} errors, {warnings} warnings",
+                           details={"files_checked": len(files), "error_count": len(errors),
+                                    "warning_count": warnings, "errors": errors[:DETAIL_LIMIT]})
+
+    def _legacy_report(self) -> bool:
+        """True when the report folder has no PBIR definition (legacy report.json)."""
+        report_path = self.validation.report_path
+        return bool(report_path) and not Path(report_path).is_dir()
+
+    def check_pbir_schema(self) -> CheckResult:
+        if self._legacy_report():
+            return CheckResult("pbir_schema", "files", "skipped",
+                               summary="Report is in legacy format (report.json), not PBIR")
+        report_path = self.validation.report_path
+        definition = Path(report_path) if report_path else None
+        files = [str(p) for p in self.manifest.files(definition, ".json") if schema_for_file(p)] if definition else []
+        if not files:
+            return CheckResult("pbir_schema", "files", "skipped", summary="No PBIR definition files")
+        errors = [asdict(error) for error in validate_files(files, definition, self.workers)]
+        return CheckResult("pbir_schema", "files", "failed" if errors else "passed", fatal=bool(errors),
+                           summary=f"{len(files)} files, {len(errors)} schema errors",
+                           details={"files_checked": len(files), "error_count": len(errors),
+                                    "errors": errors[:DETAIL_LIMIT]})
+
+    # ------------------------------------------------------------------
+    # Stage 3: references
+    # ------------------------------------------------------------------
+
+    def check_model_references(self) -> CheckResult:
+        v = self.validation
+        if v.format != "pbip" or not v.report_path:
+            return CheckResult("model_references", "references", "skipped",
+                               summary="Requires a PBIP project with a PBIR report")
+        if self._legacy_report():
+            return CheckResult("model_references", "references", "skipped",
+                               summary="Report is in legacy format (report.json), not PBIR")
+        try:
+            result = check_project(Path(v.semantic_model_path), Path(v.report_path).parent)
+        except (FileNotFoundError, ValueError) as e:
+            return CheckResult("model_references", "references", "failed", summary=str(e))
+        issues = result.pop("issues")
+        result["issues"] = issues[:DETAIL_LIMIT]
+        return CheckResult("model_references", "references", "failed" if issues else "passed",
+                           summary=f"{result['references_checked']} references, {len(issues)} broken",
+                           details=result)
+
+    # ------------------------------------------------------------------
+
+    def run(self) -> DoctorReport:
+        started = time.perf_counter()
+        checks: List[CheckResult] = []
+        stopped_after = None
+
+        stages = [
+            ("structure", [self.check_structure]),
+            ("files", [self.check_path_audit, self.check_tmdl_format, self.check_pbir_schema]),
+            ("references", [self.check_model_references]),
+        ]
+        for stage, stage_checks in stages:
+            if stopped_after:
+                checks.extend(CheckResult(c.__name__[len("check_"):], stage, "skipped",
+                                          summary=f"Skipped after fatal failure in '{stopped_after}'")
+                              for c in stage_checks)
+                continue
+            if len(stage_checks) == 1:
+                results = [_timed(stage_checks[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=len(stage_checks)) as pool:
+                    results = list(pool.map(_timed, stage_checks))
+            checks.extend(results)
+            if any(r.fatal and r.status == "failed" for r in results):
+                stopped_after = stage
+
+        v = self.validation
+        if v.status == "action_required":
+            status = "action_required"
+        elif v.status == "error":
+            status = "fatal"
+        elif any(c.status == "failed" for c in checks):
+            status = "issues_found"
+        elif any(c.status == "warning" for c in checks):
+            status = "warnings"
+        else:
+            status = "healthy"
+
+        manifest = {"files": 0, "directories": 0, "elapsed_ms": 0.0}
+        if self.manifest:
+            manifest = {"files": self.manifest.file_count, "directories": self.manifest.directory_count,
+                        "elapsed_ms": self.manifest.elapsed_ms}
+
+        return DoctorReport(
+            project_path=str(self.project_path),
+            status=status,
+            format=v.format if v.status != "error" else None,
+            manifest=manifest,
+            checks=checks,
+            validation=v.to_dict(),
+            stopped_after=stopped_after,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        )
+
+
+def format_report(report: DoctorReport) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("POWER BI PROJECT DOCTOR")
+    lines.append("=" * 80)
+    lines.append(f"Project: {report.project_path}")
+    lines.append(f"Format: {report.format or 'unknown'} | Manifest: {report.manifest['files']} files, "
+                 f"{report.manifest['directories']} folders | {report.elapsed_ms} ms")
+    lines.append("=" * 80)
+
+    current_stage = None
+    for check in report.checks:
+        if check.stage != current_stage:
+            current_stage = check.stage
+            lines.append("")
+            lines.append(f"[{current_stage.upper()}]")
+        lines.append(f"  {STATUS_ICONS[check.status]} {check.name}: {check.summary}")
+        for error in check.details.get("errors", [])[:5]:
+            if "code" in error:
+                lines.append(f"      {error['file']}:{error['line']} {error['code']} {error['message']}")
+            else:
+                lines.append(f"      {error.get('file')} {error.get('pointer')}: {error.get('message')}")
+        for issue in check.details.get("issues", [])[:5]:
+            lines.append(f"      {issue.get('issue_type')}: {issue.get('message')}")
+        if check.status == "failed" and check.details.get("suggested_fix"):
+            lines.append(f"      Fix: {check.details['suggested_fix'].splitlines()[0]}")
+
+    lines.append("")
+    if report.stopped_after:
+        lines.append(f"Stopped after fatal failure in stage '{report.stopped_after}'")
+    lines.append(f"STATUS: {report.status.upper()}")
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run staged structure, path, TMDL, schema and reference checks in one call",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("project_path", help="Path to Power BI project folder or PBIX file")
+    parser.add_argument("--visual-changes", action="store_true", dest="visual_changes",
+                        help="Visual property changes are expected")
+    parser.add_argument("--new-base", dest="new_base", help="Project path lengths under this base folder")
+    parser.add_argument("--workers", type=int, help="Worker processes for schema validation")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    doctor = ProjectDoctor(args.project_path, args.visual_changes, args.new_base, args.workers)
+    report = doctor.run()
+
+    if args.json:
+        print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+    else:
+        print(format_report(report))
+
+    if report.status in ("healthy", "warnings"):
+        sys.exit(0)
+    sys.exit(2 if report.status == "fatal" else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,8 @@ This script replaces LLM-based file existence checks with efficient Python code,
 reducing token usage by 80-90% for project validation tasks.
 
 Usage:
-    python pbi_project_validator.py <project_path> [--visual-changes] [--json]
+    python pbi_project_validator.py <project_path> [--visual-changes] [--audit-paths]
+                                    [--top N] [--new-base <path>] [--json]
 
 Arguments:
     project_path          Path to Power BI project folder or PBIX file
@@ -17,6 +18,11 @@ Arguments:
 Options:
     --visual-changes      Flag indicating visual property changes are expected
                           (requires .Report folder for pbip format)
+    --audit-paths         Walk the project once and measure real path lengths
+                          against MAX_PATH (longest paths, remaining budget)
+    --top N               Longest paths to report with --audit-paths (default: 10)
+    --new-base <path>     With --audit-paths, project lengths if the project is
+                          moved under this folder
     --json                Output results as JSON (default: human-readable)
 
 Exit Codes:
@@ -35,18 +41,33 @@ Examples:
     # Get JSON output for programmatic use
     python pbi_project_validator.py "C:\\Projects\\SalesReport" --json
 
+    # Measure real path lengths and check a move to C:\\PBI
+    python pbi_project_validator.py "C:\\Projects\\SalesReport" --audit-paths --new-base "C:\\PBI"
+
 Author: Power BI Analyst Agent
 Version: 1.0.0
 """
 
+import os
 import sys
 import json
+import time
+import heapq
+import fnmatch
+import zipfile
 import argparse
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+try:
+    from pbix_reader import PbixReader
+    from legacy_report_converter import ConversionError
+except ImportError:  # pbix_reader.py not deployed alongside this script
+    PbixReader = None
+    ConversionError = ValueError
+
 
 @dataclass
 class PathLengthInfo:
@@ -73,6 +94,99 @@ class PathLengthInfo:
         }
 
 
+@dataclass
+class PathAuditInfo:
+    """Measured path lengths from a walk of the actual project folder"""
+    root_path: str
+    base_path: str
+    files_scanned: int
+    directories_scanned: int
+    max_path_length: int
+    remaining_budget: int  # MAX_PATH minus the longest measured path
+    over_limit_count: int  # Paths at or beyond MAX_PATH
+    near_limit_count: int  # Paths within NEAR_LIMIT_MARGIN of MAX_PATH
+    longest_paths: List[Dict]  # [{"path", "length", "projected_length"}], longest first
+    warning_level: str  # "ok", "caution", "warning", "critical"
+    projected_base_path: Optional[str] = None
+    projected_max_length: Optional[int] = None
+    projected_over_limit_count: Optional[int] = None
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class ProjectManifest:
+    """
+    Every file and folder under a project, from a single os.scandir walk.
+
+    Shared by format detection, structure validation and the path audit (and by
+    pbi_project_doctor.py across all of its checks) so the project is listed
+    once instead of re-globbed by each step.
+    """
+
+    def __init__(self, root: Path, skip_dirs: Optional[set] = None):
+        self.root = Path(root)
+        self.skip_dirs = skip_dirs or set()
+        self.entries: List[Tuple[str, bool]] = []  # (full path, is_dir)
+        self._children: Dict[str, List[Tuple[str, bool]]] = {}
+        self.elapsed_ms = 0.0
+
+    @classmethod
+    def build(cls, root, skip_dirs: Optional[set] = None) -> 'ProjectManifest':
+        manifest = cls(root, skip_dirs)
+        started = time.perf_counter()
+        stack = [str(manifest.root)]
+        while stack:
+            folder = stack.pop()
+            children = manifest._children.setdefault(folder, [])
+            try:
+                entries = os.scandir(folder)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    if is_dir and entry.name in manifest.skip_dirs:
+                        continue
+                    children.append((entry.name, is_dir))
+                    manifest.entries.append((entry.path, is_dir))
+                    if is_dir:
+                        stack.append(entry.path)
+        manifest.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return manifest
+
+    @property
+    def file_count(self) -> int:
+        return sum(1 for _, is_dir in self.entries if not is_dir)
+
+    @property
+    def directory_count(self) -> int:
+        return sum(1 for _, is_dir in self.entries if is_dir)
+
+    def glob(self, folder: Path, pattern: str, dirs: Optional[bool] = None) -> List[Path]:
+        """Immediate children of folder matching pattern (Path.glob semantics, sorted)."""
+        return [Path(folder) / name
+                for name, is_dir in sorted(self._children.get(str(folder), []))
+                if fnmatch.fnmatch(name, pattern) and (dirs is None or is_dir == dirs)]
+
+    def exists(self, path: Path) -> bool:
+        path = Path(path)
+        if path == self.root:
+            return True
+        wanted = os.path.normcase(path.name)
+        return any(os.path.normcase(name) == wanted for name, _ in self._children.get(str(path.parent), []))
+
+    def files(self, folder: Path, suffix: str = "") -> List[Path]:
+        """All files below folder (recursive) ending with suffix."""
+        prefix = str(folder) + os.sep
+        return sorted(Path(p) for p, is_dir in self.entries
+                      if not is_dir and p.startswith(prefix) and p.endswith(suffix))
+
+
 @dataclass
 class ValidationResult:
     """Structured validation result"""
@@ -98,6 +212,12 @@ class ValidationResult:
     # Path length analysis
     path_length_info: Optional[Dict] = None
 
+    # Direct PBIX contents (pages, visuals, measures, M queries) read without conversion
+    pbix_inspection: Optional[Dict] = None
+
+    # Measured path lengths (--audit-paths)
+    path_audit: Optional[Dict] = None
+
     def to_dict(self) -> Dict:
         return asdict(self)
 
@@ -118,12 +238,36 @@ class PbiProjectValidator:
     # Path length constants
     RESERVED_STRUCTURE = 120  # Characters reserved for deepest nested PBIP paths
     MAX_PATH = 260  # Windows MAX_PATH limit
+    NEAR_LIMIT_MARGIN = 20  # Measured paths this close to MAX_PATH count as near the limit
+    AUDIT_SKIP_DIRS = {".git", ".pbi-squire-cache"}  # Not written by Power BI Desktop
 
-    def __init__(self, project_path: str, visual_changes_expected: bool = False):
+    def __init__(self, project_path: str, visual_changes_expected: bool = False,
+                 audit_paths: bool = False, audit_top_n: int = 10, new_base_path: Optional[str] = None,
+                 manifest: Optional[ProjectManifest] = None):
         self.project_path = Path(project_path).resolve()
         self.visual_changes_expected = visual_changes_expected
+        self.audit_paths = audit_paths
+        self.audit_top_n = audit_top_n
+        self.new_base_path = new_base_path
+        self.manifest = manifest
         self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+    def get_manifest(self) -> ProjectManifest:
+        """Walk the project folder once; reused by every later lookup."""
+        if self.manifest is None:
+            self.manifest = ProjectManifest.build(self.project_path, self.AUDIT_SKIP_DIRS)
+        return self.manifest
+
+    def _glob(self, folder: Path, pattern: str, dirs: Optional[bool] = None) -> List[Path]:
+        if self.manifest is not None:
+            return self.manifest.glob(folder, pattern, dirs)
+        return [p for p in folder.glob(pattern) if dirs is None or p.is_dir() == dirs]
+
+    def _exists(self, path: Path) -> bool:
+        if self.manifest is not None:
+            return self.manifest.exists(path)
+        return path.exists()
+
     def _analyze_path_length(self, project_name: Optional[str] = None) -> PathLengthInfo:
         """
         Analyze path length and provide recommendations for PBIP projects.
@@ -217,18 +361,95 @@ class PbiProjectValidator:
                 suggested_fix="Verify the project path is correct and accessible"
             )
 
+        # With an audit requested, list the project once up front so detection reuses the walk
+        if self.audit_paths and self.project_path.is_dir():
+            self.get_manifest()
+
         # Detect format and validate accordingly
         detected_format = self._detect_format()
 
         if detected_format == "pbip":
-            return self._validate_pbip()
+            result = self._validate_pbip()
         elif detected_format == "pbi-tools":
-            return self._validate_pbitools()
+            result = self._validate_pbitools()
         elif detected_format == "pbix":
             return self._handle_pbix()
         else:
             return self._handle_invalid_format()
 
+        if self.audit_paths and result.status != "error":
+            result.path_audit = self.audit_path_lengths(self.audit_top_n, self.new_base_path).to_dict()
+        return result
+
+    def audit_path_lengths(self, top_n: int = 10, new_base_path: Optional[str] = None) -> PathAuditInfo:
+        """
+        Measure real full-path lengths from the project manifest (a single
+        os.scandir walk, shared with the other checks).
+
+        Unlike _analyze_path_length (a worst-case estimate), this sees the actual
+        page, visual and bookmark folder names. The top_n longest paths are kept
+        in a bounded heap, so selection stays cheap on 50k-file reports. With
+        new_base_path, lengths are also projected for the project moved under
+        that folder (the project folder name is kept).
+        """
+        started = time.perf_counter()
+        root = str(self.project_path)
+        base_path = str(self.project_path.parent)
+        # Moving the project only changes the base prefix, so every path shifts by the same amount
+        delta = len(os.path.normpath(new_base_path)) - len(base_path) if new_base_path else 0
+        limit = self.MAX_PATH
+        near = limit - self.NEAR_LIMIT_MARGIN
+        projected_limit = limit - delta
+
+        manifest = self.get_manifest()
+        longest: List[Tuple[int, str]] = []
+        over = near_count = projected_over = 0
+        max_length = len(root)
+        for path, _ in manifest.entries:
+            length = len(path)
+            if length > max_length:
+                max_length = length
+            if length >= limit:
+                over += 1
+            elif length >= near:
+                near_count += 1
+            if length >= projected_limit:
+                projected_over += 1
+            if len(longest) < top_n:
+                heapq.heappush(longest, (length, path))
+            elif longest and length > longest[0][0]:
+                heapq.heapreplace(longest, (length, path))
+
+        if over:
+            warning_level = "critical"
+        elif near_count:
+            warning_level = "warning"
+        elif max_length >= limit - 2 * self.NEAR_LIMIT_MARGIN:
+            warning_level = "caution"
+        else:
+            warning_level = "ok"
+
+        return PathAuditInfo(
+            root_path=root,
+            base_path=base_path,
+            files_scanned=manifest.file_count,
+            directories_scanned=manifest.directory_count,
+            max_path_length=max_length,
+            remaining_budget=limit - max_length,
+            over_limit_count=over,
+            near_limit_count=near_count,
+            longest_paths=[
+                {"path": path, "length": length,
+                 "projected_length": length + delta if new_base_path else None}
+                for length, path in sorted(longest, reverse=True)
+            ],
+            warning_level=warning_level,
+            projected_base_path=new_base_path,
+            projected_max_length=max_length + delta if new_base_path else None,
+            projected_over_limit_count=projected_over if new_base_path else None,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        )
+
     def _detect_format(self) -> str:
         """
         Detect the Power BI project format.
@@ -241,8 +462,8 @@ class PbiProjectValidator:
             return "invalid"
 
         # Check for Power BI Project (.pbip)
-        pbip_files = list(self.project_path.glob("*.pbip"))
-        semantic_model_folders = list(self.project_path.glob("*.SemanticModel"))
+        pbip_files = self._glob(self.project_path, "*.pbip")
+        semantic_model_folders = self._glob(self.project_path, "*.SemanticModel")
 
         if pbip_files and semantic_model_folders:
             return "pbip"
@@ -251,12 +472,12 @@ class PbiProjectValidator:
         pbixproj_file = self.project_path / ".pbixproj.json"
         model_folder = self.project_path / "Model"
 
-        if pbixproj_file.exists() and model_folder.exists():
+        if self._exists(pbixproj_file) and self._exists(model_folder):
             return "pbi-tools"
 
         # Also check without leading dot (some versions)
         pbixproj_alt = self.project_path / "pbixproj.json"
-        if pbixproj_alt.exists() and model_folder.exists():
+        if self._exists(pbixproj_alt) and self._exists(model_folder):
             return "pbi-tools"
 
         return "invalid"
@@ -264,9 +485,9 @@ class PbiProjectValidator:
     def _validate_pbip(self) -> ValidationResult:
         """Validate a Power BI Project (.pbip) format"""
         # Find the .pbip file and SemanticModel folder
-        pbip_files = list(self.project_path.glob("*.pbip"))
-        semantic_model_folders = list(self.project_path.glob("*.SemanticModel"))
-        report_folders = list(self.project_path.glob("*.Report"))
+        pbip_files = self._glob(self.project_path, "*.pbip")
+        semantic_model_folders = self._glob(self.project_path, "*.SemanticModel")
+        report_folders = self._glob(self.project_path, "*.Report")
 
         if not pbip_files:
             return self._error_result(
@@ -287,7 +508,7 @@ class PbiProjectValidator:
 
         # Validate TMDL structure
         definition_folder = semantic_model_path / "definition"
-        if not definition_folder.exists():
+        if not self._exists(definition_folder):
             return self._error_result(
                 action_type="invalid_tmdl_structure",
                 error_message="Missing 'definition' folder in SemanticModel",
@@ -299,21 +520,21 @@ class PbiProjectValidator:
         tables_folder = definition_folder / "tables"
 
         tmdl_files_found = []
-        if model_tmdl.exists():
+        if self._exists(model_tmdl):
             tmdl_files_found.append("model.tmdl")
-        if tables_folder.exists():
+        if self._exists(tables_folder):
             tmdl_files_found.append("tables/")
             # Count table files
-            table_files = list(tables_folder.glob("*.tmdl"))
+            table_files = self._glob(tables_folder, "*.tmdl")
             tmdl_files_found.extend([f"tables/{f.name}" for f in table_files[:5]])
             if len(table_files) > 5:
                 tmdl_files_found.append(f"... and {len(table_files) - 5} more")
 
         relationships_tmdl = definition_folder / "relationships.tmdl"
-        if relationships_tmdl.exists():
+        if self._exists(relationships_tmdl):
             tmdl_files_found.append("relationships.tmdl")
 
-        if not model_tmdl.exists():
+        if not self._exists(model_tmdl):
             return self._error_result(
                 action_type="invalid_tmdl_structure",
                 error_message="Missing model.tmdl in definition folder",
@@ -339,11 +560,11 @@ class PbiProjectValidator:
             report_json = report_path / "definition" / "report.json"
             pages_folder = report_path / "definition" / "pages"
 
-            if report_json.exists():
+            if self._exists(report_json):
                 report_files_found.append("report.json")
-            if pages_folder.exists():
+            if self._exists(pages_folder):
                 report_files_found.append("pages/")
-                page_folders = [f for f in pages_folder.iterdir() if f.is_dir()]
+                page_folders = self._glob(pages_folder, "*", dirs=True)
                 report_files_found.extend([f"pages/{f.name}/" for f in page_folders[:3]])
                 if len(page_folders) > 3:
                     report_files_found.append(f"... and {len(page_folders) - 3} more pages")
@@ -394,7 +615,7 @@ class PbiProjectValidator:
 
         tmdl_files_found = []
 
-        if not model_tmdl.exists():
+        if not self._exists(model_tmdl):
             return self._error_result(
                 action_type="invalid_tmdl_structure",
                 error_message="Missing model.tmdl in Model folder",
@@ -402,12 +623,12 @@ class PbiProjectValidator:
             )
         tmdl_files_found.append("model.tmdl")
 
-        if database_tmdl.exists():
+        if self._exists(database_tmdl):
             tmdl_files_found.append("database.tmdl")
 
-        if tables_folder.exists():
+        if self._exists(tables_folder):
             tmdl_files_found.append("tables/")
-            table_files = list(tables_folder.glob("*.tmdl"))
+            table_files = self._glob(tables_folder, "*.tmdl")
             tmdl_files_found.extend([f"tables/{f.name}" for f in table_files[:5]])
             if len(table_files) > 5:
                 tmdl_files_found.append(f"... and {len(table_files) - 5} more")
@@ -450,9 +671,20 @@ class PbiProjectValidator:
             validation_timestamp=self.timestamp,
             tmdl_files_found=[],
             report_files_found=[],
-            path_length_info=path_length_info.to_dict()
+            path_length_info=path_length_info.to_dict(),
+            pbix_inspection=self._inspect_pbix()
         )
 
+    def _inspect_pbix(self) -> Optional[Dict]:
+        """Read the PBIX archive directly so analysis can start before any conversion"""
+        if PbixReader is None:
+            return None
+        try:
+            with PbixReader(self.project_path) as reader:
+                return asdict(reader.summary())
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile, ConversionError) as e:
+            return {"error": f"Could not read PBIX archive: {e}"}
+
     def _handle_invalid_format(self) -> ValidationResult:
         """Handle unrecognized format"""
         # Gather info about what exists at the path
@@ -539,13 +771,19 @@ class PbiProjectValidator:
                 print("\nOptions:")
                 print("  [Y] Convert to PBIP format (recommended)")
                 print("  [N] Show manual conversion instructions")
-                print("  [I] Continue with PBIX (limited analysis)")
+                print("  [I] Continue with PBIX (read-only analysis via pbix_reader.py)")
+
+                if result.pbix_inspection:
+                    self._print_pbix_inspection(result.pbix_inspection)
 
                 # Show path length recommendations for PBIP conversion
                 if result.path_length_info:
                     self._print_pbix_path_recommendations(result.path_length_info)
 
-        elif result.status == "error":
+        if result.path_audit:
+            self._print_path_audit(result.path_audit)
+
+        if result.status == "error":
             print(f"\n[ERROR] {result.action_type}")
             print(f"\n{result.error_message}")
             if result.suggested_fix:
@@ -574,6 +812,51 @@ class PbiProjectValidator:
         if warning_message:
             print(f"\n{warning_message}")
 
+    def _print_path_audit(self, audit: Dict):
+        """Print measured path lengths from --audit-paths"""
+        print("\n" + "-" * 70)
+        print("PATH LENGTH AUDIT (measured)")
+        print("-" * 70)
+
+        print(f"\nScanned: {audit['files_scanned']} files, {audit['directories_scanned']} folders "
+              f"({audit['elapsed_ms']} ms)")
+        print(f"Longest path: {audit['max_path_length']} characters "
+              f"(budget remaining: {audit['remaining_budget']} of {self.MAX_PATH})")
+        print(f"At or over limit: {audit['over_limit_count']} | Within {self.NEAR_LIMIT_MARGIN} of limit: "
+              f"{audit['near_limit_count']} | Level: {audit['warning_level']}")
+
+        if audit.get("projected_base_path"):
+            print(f"\nProjected under {audit['projected_base_path']}:")
+            print(f"  Longest path: {audit['projected_max_length']} characters "
+                  f"(budget remaining: {self.MAX_PATH - audit['projected_max_length']})")
+            print(f"  At or over limit: {audit['projected_over_limit_count']}")
+
+        if audit["longest_paths"]:
+            print("\nLongest paths:")
+            base_length = len(audit["base_path"]) + 1
+            for entry in audit["longest_paths"]:
+                projected = entry.get("projected_length")
+                suffix = f" -> {projected}" if projected is not None else ""
+                print(f"  {entry['length']:>4}{suffix}  ...{os.sep}{entry['path'][base_length:]}")
+
+    def _print_pbix_inspection(self, inspection: Dict):
+        """Print what could be read directly from the PBIX archive"""
+        print("\n" + "-" * 70)
+        print("PBIX CONTENTS (read without conversion)")
+        print("-" * 70)
+
+        if inspection.get("error"):
+            print(f"\n{inspection['error']}")
+            return
+
+        print(f"\nPages: {inspection.get('pages', 0)}")
+        print(f"Visuals: {inspection.get('visuals', 0)}")
+        print(f"Tables: {inspection.get('tables', 0)}")
+        print(f"Measures: {inspection.get('measures', 0)}")
+        print(f"M Queries: {inspection.get('m_queries', 0)}")
+        for note in inspection.get("notes", []):
+            print(f"  Note: {note}")
+
     def _print_pbix_path_recommendations(self, path_info: Dict):
         """Print path length recommendations when converting PBIX to PBIP"""
         warning_level = path_info.get("warning_level", "ok")
@@ -620,6 +903,7 @@ Examples:
   python pbi_project_validator.py "C:\\Projects\\SalesReport"
   python pbi_project_validator.py "C:\\Projects\\SalesReport" --visual-changes
   python pbi_project_validator.py "C:\\Projects\\SalesReport" --json
+  python pbi_project_validator.py "C:\\Projects\\SalesReport" --audit-paths --new-base "C:\\PBI"
         """
     )
 
@@ -635,6 +919,26 @@ Examples:
         help="Flag indicating visual property changes are expected"
     )
 
+    parser.add_argument(
+        "--audit-paths",
+        action="store_true",
+        dest="audit_paths",
+        help="Measure actual path lengths of every file in the project"
+    )
+
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of longest paths to report with --audit-paths (default: 10)"
+    )
+
+    parser.add_argument(
+        "--new-base",
+        dest="new_base",
+        help="With --audit-paths, project path lengths if the project moved under this folder"
+    )
+
     parser.add_argument(
         "--json",
         action="store_true",
@@ -642,11 +946,16 @@ Examples:
     )
 
     args = parser.parse_args()
+    if args.top < 1:
+        parser.error("--top must be a positive integer")
 
     # Run validation
     validator = PbiProjectValidator(
         project_path=args.project_path,
-        visual_changes_expected=args.visual_changes
+        visual_changes_expected=args.visual_changes,
+        audit_paths=args.audit_paths,
+        audit_top_n=args.top,
+        new_base_path=args.new_base
     )
 
     result = validator.validate()
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+PBIR Field Reference Index
+
+Builds a report-wide index of every semantic model field referenced by a Power BI
+Report (PBIR) definition, so impact analysis ("which visuals use [Total Sales]?")
+is a dictionary lookup instead of a walk over every visual.json.
+
+Indexed reference kinds:
+    Measure, Column, Aggregation (aggregated column/measure), HierarchyLevel
+
+Indexed locations:
+    - visual.json: query.queryState roles, sortDefinition, objects,
+      visualContainerObjects and visual-level filters
+    - page.json: page-level filters
+    - report.json: report-level filters
+    - bookmarks/*.bookmark.json: bookmark exploration state
+
+Each reference maps to (page, visual, role). The index is persisted next to the
+report folder (.pbi-squire-cache/) and refreshed incrementally: only files whose
+size or modification time changed since the last run are re-parsed.
+
+Usage:
+    python pbir_field_index.py <report_path> [--who-uses "<field>"] [--rebuild] [--json]
+
+Arguments:
+    report_path           Path to .Report folder (or its definition/ folder)
+
+Options:
+    --who-uses <field>    Field to look up. Accepts "Total Sales", "[Total Sales]",
+                          "Sales[Total Sales]", "'Sales'[Total Sales]" or "Sales.Total Sales"
+    --rebuild             Ignore the persisted index and re-parse every file
+    --index-file <path>   Override the persisted index location
+    --json                Output as JSON instead of formatted text
+
+Exit Codes:
+    0 - Success (lookup found references, or index summary printed)
+    1 - Lookup found no references
+    2 - Report path not found
+
+Examples:
+    python pbir_field_index.py "Sales.Report"
+    python pbir_field_index.py "Sales.Report" --who-uses "[Total Sales]"
+    python pbir_field_index.py "Sales.Report" --who-uses "Sales[Amount]" --json
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from collections import Counter
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+INDEX_VERSION = 1
+CACHE_DIR_NAME = ".pbi-squire-cache"
+FIELD_KINDS = ("Measure", "Column", "Aggregation", "HierarchyLevel")
+
+# "Sales[Total Sales]" / "'Sales Data'[Total Sales]" / "[Total Sales]"
+_BRACKET_FIELD = re.compile(r"^\s*(?:'((?:[^']|'')*)'|([^\[\]']*?))\s*\[(.+)\]\s*$")
+
+
+@dataclass(frozen=True)
+class FieldReference:
+    """A single field reference found in a report definition file"""
+    kind: str  # Measure, Column, Aggregation, HierarchyLevel
+    entity: str
+    property: str  # For HierarchyLevel: "<hierarchy>.<level>"
+    page: Optional[str]
+    visual: Optional[str]
+    role: str  # queryState role, "sort", "filter", "objects.<name>", "bookmark", ...
+    file: str  # Path relative to the definition folder (forward slashes)
+
+    @property
+    def key(self) -> str:
+        return field_key(self.entity, self.property)
+
+    def to_row(self) -> List[Any]:
+        return [self.kind, self.entity, self.property, self.page, self.visual, self.role]
+
+
+def field_key(entity: str, prop: str) -> str:
+    """Case-insensitive lookup key for a model field (model names are case-insensitive)"""
+    return f"{entity}\x1f{prop}".casefold()
+
+
+def resolve_definition_path(report_path) -> Path:
+    """Return the PBIR definition/ folder for a .Report folder or a definition folder."""
+    path = Path(report_path)
+    if (path / "definition").is_dir():
+        return path / "definition"
+    if path.name == "definition" and path.is_dir():
+        return path
+    raise FileNotFoundError(f"PBIR definition folder not found under: {path}")
+
+
+def default_index_path(definition_path: Path) -> Path:
+    """Persisted index location: <project>/.pbi-squire-cache/<report>.field_index.json"""
+    report_folder = definition_path.parent
+    return report_folder.parent / CACHE_DIR_NAME / f"{report_folder.name}.field_index.json"
+
+
+# ---------------------------------------------------------------------------
+# Reference extraction
+# ---------------------------------------------------------------------------
+
+def _resolve_source(expression: Any, aliases: Dict[str, str]) -> str:
+    """Resolve the entity of a field Expression (SourceRef by Entity or by From-alias)."""
+    if not isinstance(expression, dict):
+        return ""
+    source_ref = expression.get("SourceRef")
+    if isinstance(source_ref, dict):
+        if "Entity" in source_ref:
+            return source_ref["Entity"]
+        return aliases.get(source_ref.get("Source", ""), "")
+    # Auto date/time hierarchies wrap the column in a PropertyVariationSource
+    variation = expression.get("PropertyVariationSource")
+    if isinstance(variation, dict):
+        return _resolve_source(variation.get("Expression"), aliases)
+    return ""
+
+
+def _field_from_node(kind: str, node: Dict, aliases: Dict[str, str]) -> Optional[Tuple[str, str, str]]:
+    """Decode one Measure/Column/Aggregation/HierarchyLevel node into (kind, entity, property)."""
+    if kind in ("Measure", "Column"):
+        prop = node.get("Property")
+        if prop is None:
+            return None
+        return kind, _resolve_source(node.get("Expression"), aliases), prop
+
+    if kind == "Aggregation":
+        inner = node.get("Expression", {})
+        for inner_kind in ("Column", "Measure"):
+            if isinstance(inner, dict) and isinstance(inner.get(inner_kind), dict):
+                field = _field_from_node(inner_kind, inner[inner_kind], aliases)
+                if field:
+                    return "Aggregation", field[1], field[2]
+        return None
+
+    if kind == "HierarchyLevel":
+        hierarchy = node.get("Expression", {}).get("Hierarchy", {})
+        if not isinstance(hierarchy, dict):
+            return None
+        source = hierarchy.get("Expression", {})
+        variation = source.get("PropertyVariationSource") if isinstance(source, dict) else None
+        if isinstance(variation, dict):
+            # Auto date/time hierarchy: the model object that matters is the date column
+            return "HierarchyLevel", _resolve_source(variation.get("Expression"), aliases), variation.get("Property", "")
+        level = node.get("Level", "")
+        return "HierarchyLevel", _resolve_source(source, aliases), f"{hierarchy.get('Hierarchy', '')}.{level}"
+
+    return None
+
+
+def iter_field_nodes(data: Any, path: Tuple = (), aliases: Optional[Dict[str, str]] = None
+                     ) -> Iterator[Tuple[Tuple, Dict, str, str, str]]:
+    """
+    Walk a PBIR JSON document and yield every field reference node.
+
+    Yields:
+        (path, parent, kind, entity, property) where path is the JSON path of the
+        field node (a tuple of keys/indexes) and parent is the dict holding it.
+    """
+    if aliases is None:
+        aliases = {}
+
+    if isinstance(data, dict):
+        from_clause = data.get("From")
+        if isinstance(from_clause, list):
+            aliases = dict(aliases)
+            for source in from_clause:
+                if isinstance(source, dict) and "Name" in source and "Entity" in source:
+                    aliases[source["Name"]] = source["Entity"]
+
+        for key, value in data.items():
+            if key in FIELD_KINDS and isinstance(value, dict):
+                field = _field_from_node(key, value, aliases)
+                if field:
+                    yield path + (key,), data, field[0], field[1], field[2]
+                    continue
+            if isinstance(value, (dict, list)):
+                yield from iter_field_nodes(value, path + (key,), aliases)
+
+    elif isinstance(data, list):
+        for i, item in enumerate(data):
+            if isinstance(item, (dict, list)):
+                yield from iter_field_nodes(item, path + (i,), aliases)
+
+
+def role_for_path(file_kind: str, path: Tuple) -> str:
+    """Describe where in the document a reference sits."""
+    if "filterConfig" in path[:1]:
+        return "filter"
+    if file_kind == "bookmark":
+        return "bookmark"
+    if file_kind != "visual":
+        return file_kind
+    if path[:3] == ("visual", "query", "queryState") and len(path) > 3:
+        return str(path[3])
+    if path[:3] == ("visual", "query", "sortDefinition"):
+        return "sort"
+    if path[:2] in (("visual", "objects"), ("visual", "visualContainerObjects")) and len(path) > 2:
+        return f"{path[1]}.{path[2]}"
+    return ".".join(str(p) for p in path[:2])
+
+
+def _classify_file(rel_path: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Return (file_kind, page, visual) for a definition-relative path."""
+    parts = rel_path.split("/")
+    if len(parts) == 5 and parts[0] == "pages" and parts[2] == "visuals":
+        return "visual", parts[1], parts[3]
+    if len(parts) == 3 and parts[0] == "pages":
+        return "page", parts[1], None
+    if parts[0] == "bookmarks":
+        return "bookmark", None, None
+    return "report", None, None
+
+
+def extract_references(data: Dict, rel_path: str) -> List[FieldReference]:
+    """Extract all field references from one parsed definition file."""
+    file_kind, page, visual = _classify_file(rel_path)
+    if file_kind == "visual":
+        visual = data.get("name", visual)
+
+    refs = []
+    for path, _, kind, entity, prop in iter_field_nodes(data):
+        ref_page, ref_visual = page, visual
+        if file_kind == "bookmark":
+            # explorationState.sections.<page>.visualContainers.<visual>...
+            if "sections" in path:
+                idx = path.index("sections")
+                ref_page = path[idx + 1] if idx + 1 < len(path) else None
+            if "visualContainers" in path:
+                idx = path.index("visualContainers")
+                ref_visual = path[idx + 1] if idx + 1 < len(path) else None
+        refs.append(FieldReference(kind, entity, prop, ref_page, ref_visual,
+                                   role_for_path(file_kind, path), rel_path))
+    return refs
+
+
+def iter_definition_files(definition_path: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (relative_path, stat) for every indexable file under definition/."""
+    report_json = definition_path / "report.json"
+    if report_json.is_file():
+        yield "report.json", report_json.stat()
+
+    bookmarks = definition_path / "bookmarks"
+    if bookmarks.is_dir():
+        with os.scandir(bookmarks) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".bookmark.json"):
+                    yield f"bookmarks/{entry.name}", entry.stat()
+
+    pages = definition_path / "pages"
+    if not pages.is_dir():
+        return
+    with os.scandir(pages) as page_entries:
+        for page in page_entries:
+            if not page.is_dir():
+                continue
+            page_json = os.path.join(page.path, "page.json")
+            if os.path.isfile(page_json):
+                yield f"pages/{page.name}/page.json", os.stat(page_json)
+            visuals = os.path.join(page.path, "visuals")
+            if not os.path.isdir(visuals):
+                continue
+            with os.scandir(visuals) as visual_entries:
+                for visual in visual_entries:
+                    visual_json = os.path.join(visual.path, "visual.json")
+                    if visual.is_dir() and os.path.isfile(visual_json):
+                        yield f"pages/{page.name}/visuals/{visual.name}/visual.json", os.stat(visual_json)
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class FieldReferenceIndex:
+    """
+    Persistent, incrementally refreshed field → (page, visual, role) index.
+
+    Lookups are dictionary hits: by (entity, property) key, or by bare
+    property name when the table is not known.
+    """
+
+    def __init__(self, report_path, index_path: Optional[str] = None):
+        self.definition_path = resolve_definition_path(report_path)
+        self.index_path = Path(index_path) if index_path else default_index_path(self.definition_path)
+        self.files: Dict[str, Dict[str, Any]] = {}  # rel_path -> {mtime_ns, size, refs}
+        self._by_key: Dict[str, Dict[str, List[FieldReference]]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._dirty = False
+
+    # -- persistence -------------------------------------------------------
+
+    def load(self) -> bool:
+        """Load the persisted index. Returns False if missing, stale-format or unreadable."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if payload.get("version") != INDEX_VERSION:
+            return False
+
+        for rel_path, entry in payload.get("files", {}).items():
+            refs = [FieldReference(*row, file=rel_path) for row in entry.get("refs", [])]
+            self._set_file(rel_path, entry["mtime_ns"], entry["size"], refs)
+        self._dirty = False
+        return True
+
+    def save(self) -> None:
+        """Persist the index if anything changed since it was loaded."""
+        if not self._dirty:
+            return
+        payload = {
+            "version": INDEX_VERSION,
+            "definition_path": str(self.definition_path),
+            "files": {
+                rel_path: {
+                    "mtime_ns": entry["mtime_ns"],
+                    "size": entry["size"],
+                    "refs": [ref.to_row() for ref in entry["refs"]]
+                }
+                for rel_path, entry in self.files.items()
+            }
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+
+    # -- maintenance -------------------------------------------------------
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the files on disk.
+
+        Only new or changed files (by size/mtime) are parsed; deleted files are dropped.
+
+        Returns:
+            Counts of {"parsed", "removed", "unchanged", "errors"}
+        """
+        stats = {"parsed": 0, "removed": 0, "unchanged": 0, "errors": 0}
+        seen = set()
+
+        for rel_path, st in iter_definition_files(self.definition_path):
+            seen.add(rel_path)
+            known = self.files.get(rel_path)
+            if known and known["mtime_ns"] == st.st_mtime_ns and known["size"] == st.st_size:
+                stats["unchanged"] += 1
+                continue
+            try:
+                with open(self.definition_path / rel_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                refs = extract_references(data, rel_path)
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+                refs = []
+                stats["errors"] += 1
+            self._set_file(rel_path, st.st_mtime_ns, st.st_size, refs)
+            stats["parsed"] += 1
+
+        for rel_path in [p for p in self.files if p not in seen]:
+            self._drop_file(rel_path)
+            stats["removed"] += 1
+
+        return stats
+
+    def _set_file(self, rel_path: str, mtime_ns: int, size: int, refs: List[FieldReference]) -> None:
+        if rel_path in self.files:
+            self._drop_file(rel_path)
+        self.files[rel_path] = {"mtime_ns": mtime_ns, "size": size, "refs": refs}
+        for ref in refs:
+            key = ref.key
+            self._by_key.setdefault(key, {}).setdefault(rel_path, []).append(ref)
+            self._by_name.setdefault(ref.property.casefold(), set()).add(key)
+        self._dirty = True
+
+    def _drop_file(self, rel_path: str) -> None:
+        entry = self.files.pop(rel_path, None)
+        if not entry:
+            return
+        for ref in entry["refs"]:
+            key = ref.key
+            by_file = self._by_key.get(key)
+            if by_file is None:
+                continue
+            by_file.pop(rel_path, None)
+            if not by_file:
+                del self._by_key[key]
+                names = self._by_name.get(ref.property.casefold())
+                if names is not None:
+                    names.discard(key)
+                    if not names:
+                        del self._by_name[ref.property.casefold()]
+        self._dirty = True
+
+    # -- queries -----------------------------------------------------------
+
+    def references(self, entity: str, prop: str) -> List[FieldReference]:
+        """All references to a fully-qualified field."""
+        by_file = self._by_key.get(field_key(entity, prop), {})
+        return [ref for refs in by_file.values() for ref in refs]
+
+    def files_referencing(self, entity: str, prop: str) -> List[str]:
+        """Definition-relative paths of files referencing a fully-qualified field."""
+        return sorted(self._by_key.get(field_key(entity, prop), {}))
+
+    def who_uses(self, field: str) -> List[FieldReference]:
+        """
+        Look up a field by any common notation.
+
+        "Sales[Total Sales]" and "Sales.Total Sales" are table-qualified; "[Total Sales]"
+        and "Total Sales" match the name in every table (measures are model-unique).
+        A table-qualified lookup only ever matches that table.
+        """
+        entity, prop = parse_field_name(field)
+        if entity is not None:
+            return self.references(entity, prop)
+
+        keys = self._by_name.get(prop.casefold(), set())
+        if not keys and entity is None and "." in field:
+            # "Table.Field" without brackets (names may themselves contain dots)
+            head, _, tail = field.partition(".")
+            return self.references(head.strip("'"), tail)
+        return [ref for key in sorted(keys) for refs in self._by_key[key].values() for ref in refs]
+
+    def fields(self) -> Counter:
+        """Reference counts per (entity, property)."""
+        counts = Counter()
+        for by_file in self._by_key.values():
+            for refs in by_file.values():
+                for ref in refs:
+                    counts[(ref.entity, ref.property)] += 1
+        return counts
+
+
+def parse_field_name(field: str) -> Tuple[Optional[str], str]:
+    """Split a DAX-style field name into (entity or None, property)."""
+    match = _BRACKET_FIELD.match(field)
+    if match:
+        quoted, bare, prop = match.groups()
+        entity = quoted.replace("''", "'") if quoted is not None else bare
+        return (entity or None), prop
+    return None, field.strip()
+
+
+def build_index(report_path, index_path: Optional[str] = None, rebuild: bool = False) -> FieldReferenceIndex:
+    """Load (unless rebuild), refresh and persist the field index for a report."""
+    index = FieldReferenceIndex(report_path, index_path)
+    if not rebuild:
+        index.load()
+    index.refresh()
+    index.save()
+    return index
+
+
+def format_references(field: str, refs: List[FieldReference]) -> str:
+    """Generate formatted text for a who-uses lookup."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append(f"Field References: {field}")
+    lines.append(f"Total References: {len(refs)}")
+    lines.append("=" * 80)
+
+    if not refs:
+        lines.append("No references found")
+        return "\n".join(lines)
+
+    by_page: Dict[str, List[FieldReference]] = {}
+    for ref in refs:
+        by_page.setdefault(ref.page or "(report level)", []).append(ref)
+
+    for page, page_refs in sorted(by_page.items()):
+        lines.append("")
+        lines.append(f"Page: {page}")
+        for ref in sorted(page_refs, key=lambda r: (r.visual or "", r.role)):
+            target = ref.visual or "-"
+            lines.append(f"  - [{ref.kind}] {ref.entity}.{ref.property}  visual={target}  role={ref.role}")
+            lines.append(f"      {ref.file}")
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Index field references across a Power BI Report (PBIR) definition",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument("report_path", help="Path to .Report folder")
+    parser.add_argument("--who-uses", dest="who_uses", help="Field to look up")
+    parser.add_argument("--rebuild", action="store_true", help="Re-parse every file")
+    parser.add_argument("--index-file", dest="index_file", help="Override persisted index location")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        index = build_index(args.report_path, args.index_file, rebuild=args.rebuild)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.who_uses:
+        refs = index.who_uses(args.who_uses)
+        if args.json:
+            print(json.dumps({
+                "field": args.who_uses,
+                "reference_count": len(refs),
+                "references": [asdict(ref) for ref in refs]
+            }, indent=2, ensure_ascii=False))
+        else:
+            print(format_references(args.who_uses, refs))
+        sys.exit(0 if refs else 1)
+
+    counts = index.fields()
+    summary = {
+        "definition_path": str(index.definition_path),
+        "index_path": str(index.index_path),
+        "files_indexed": len(index.files),
+        "reference_count": sum(counts.values()),
+        "distinct_fields": len(counts),
+        "top_fields": [
+            {"entity": entity, "property": prop, "references": n}
+            for (entity, prop), n in counts.most_common(10)
+        ]
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print(f"Index: {summary['index_path']}")
+        print(f"Files indexed: {summary['files_indexed']}")
+        print(f"References: {summary['reference_count']} ({summary['distinct_fields']} distinct fields)")
+        print("Most referenced fields:")
+        for item in summary["top_fields"]:
+            print(f"  - {item['entity']}.{item['property']}: {item['references']}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
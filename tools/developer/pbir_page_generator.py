@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+PBIR Page Generator
+
+Creates complete Power BI Report (PBIR) pages from the bundled visual
+templates in one call: page.json, one visual.json per visual and the
+pages.json registration, instead of filling in templates one file at a time.
+
+The template catalog is loaded and precompiled once: each template's text is
+split into literal segments and typed placeholder slots ("{{X}}" or a bare
+{{X}} becomes a number, '{{TITLE}}' a DAX-escaped string fragment,
+{{TABLE_NAME}}.{{MEASURE_NAME}} an escaped JSON string fragment), so rendering
+a visual is a single join.
+
+Visual and filter names are generated as 20-character hex IDs. Visuals without
+an explicit position are placed with layout_solver.py.
+
+Usage:
+    python pbir_page_generator.py <report_path> <page_spec.json | -> [--templates <dir>]
+                                  [--dry-run] [--json]
+    python pbir_page_generator.py --list-templates [--templates <dir>]
+
+Arguments:
+    report_path           Path to .Report folder (or its definition/ folder)
+    page_spec             Page spec JSON file, or - for stdin
+
+Page spec:
+    {
+      "name": "Q4 Dashboard",
+      "width": 1280, "height": 720,
+      "visuals": [
+        {"template": "card-single-measure", "title": "Total Sales",
+         "bindings": {"TABLE_NAME": "Sales", "MEASURE_NAME": "Total Sales"}, "group": "kpis"},
+        {"template": "line-chart-category-y", "title": "Trend",
+         "bindings": {"CATEGORY_TABLE": "Date", "CATEGORY_COLUMN": "Month",
+                      "MEASURE_TABLE": "Sales", "MEASURE_NAME": "Total Sales"},
+         "position": {"x": 24, "y": 200, "width": 600, "height": 376}}
+      ]
+    }
+    Use {"pages": [...]} to create several pages in one call. Optional visual
+    keys: priority, min_width, min_height, max_width, max_height (layout hints).
+
+Options:
+    --templates <dir>     Visual template folder (default: the plugin's
+                          skills/pbi-squire/resources/visual-templates)
+    --list-templates      List templates and their required bindings
+    --dry-run             Validate and render without writing files
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - Pages created (or validated with --dry-run)
+    1 - Spec errors (unknown template, missing bindings); nothing written
+    2 - Report or template folder not found
+
+Examples:
+    python pbir_page_generator.py "Sales.Report" q4_page.json
+    python pbir_page_generator.py "Sales.Report" q4_page.json --dry-run --json
+"""
+
+import re
+import sys
+import json
+import time
+import secrets
+import argparse
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from layout_solver import LayoutSpecError, solve_layout
+from pbir_field_index import resolve_definition_path
+from json_splice import render_json_minimal
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+PAGE_SCHEMA = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/page/2.0.0/schema.json"
+PAGES_SCHEMA = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/pagesMetadata/1.0.0/schema.json"
+DEFAULT_CANVAS = (1280, 720)
+
+# Placeholders written as JSON numbers rather than strings
+NUMERIC_PLACEHOLDERS = {"X", "Y", "Z", "WIDTH", "HEIGHT", "TAB_ORDER"}
+# Formatting placeholders with sensible defaults; field bindings have none
+FORMAT_DEFAULTS = {
+    "FONT_SIZE": "12",
+    "DISPLAY_UNITS": "0",
+    "STROKE_WIDTH": "3",
+    "BACKGROUND_TRANSPARENCY": "0",
+    "LEGEND_POSITION": "Top",
+    "LABEL_STYLE": "Data",
+    "MEASURE_1_COLOR": "#118DFF",
+    "MAP_STYLE": "road",
+    "MAP_TRANSPARENCY": "0",
+    "ENABLE_CLUSTERING": "false",
+    "CLUSTER_RADIUS": "20",
+    "MIN_BUBBLE_RADIUS": "8",
+}
+PLACEHOLDER_PATTERN = re.compile(r'"\{\{(\w+)\}\}"|\{\{(\w+)\}\}')
+VISUAL_TYPE_PATTERN = re.compile(r'"visualType"\s*:\s*"([^"]+)"')
+
+# Slot modes
+NUMBER, STRING, FRAGMENT, DAX_FRAGMENT = "number", "string", "fragment", "dax_fragment"
+
+
+def default_template_dir() -> Path:
+    """Bundled templates when running from the plugin: <plugin>/skills/pbi-squire/resources/visual-templates"""
+    return Path(__file__).resolve().parents[2] / "skills" / "pbi-squire" / "resources" / "visual-templates"
+
+
+def new_object_name() -> str:
+    """20-character hex name, as Power BI Desktop generates for pages, visuals and filters."""
+    return secrets.token_hex(10)
+
+
+@dataclass
+class CompiledTemplate:
+    """A visual template precompiled into literal segments and typed placeholder slots"""
+    template_id: str
+    visual_type: str
+    segments: List[str]
+    slots: List[Tuple[str, str]]
+    default_size: Optional[Tuple[int, int]] = None
+
+    @property
+    def placeholders(self) -> List[str]:
+        return sorted({name for name, _ in self.slots})
+
+    @property
+    def required_bindings(self) -> List[str]:
+        """Placeholders the caller has to bind (not generated, positioned or defaulted)."""
+        generated = NUMERIC_PLACEHOLDERS | {"VISUAL_NAME", "TITLE", "HEADER_TEXT"}
+        return [name for name in self.placeholders
+                if name not in generated and name not in FORMAT_DEFAULTS
+                and not name.startswith("SHOW_") and not name.startswith("FILTER_GUID")]
+
+    @classmethod
+    def compile(cls, template_id: str, text: str) -> "CompiledTemplate":
+        default_size = None
+        if '"visualStructure"' in text:
+            # Harvested template layout: metadata wrapper around the visual.json body
+            data = json.loads(text)
+            if isinstance(data.get("defaultSize"), dict):
+                default_size = (data["defaultSize"].get("width"), data["defaultSize"].get("height"))
+            text = json.dumps(data["visualStructure"], indent=2, ensure_ascii=False)
+        match = VISUAL_TYPE_PATTERN.search(text)
+        visual_type = match.group(1) if match else ""
+
+        segments, slots = [], []
+        last = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            whole, inner = match.group(1), match.group(2)
+            if whole:
+                mode = NUMBER if whole in NUMERIC_PLACEHOLDERS else STRING
+                name = whole
+            else:
+                name = inner
+                before = text[last:match.start()].rstrip()[-1:]
+                if before in (":", ",", "["):
+                    # Bare placeholder in value position, e.g. "x": {{X}}
+                    mode = NUMBER
+                elif text[match.start() - 1:match.start()] == "'" and text[match.end():match.end() + 1] == "'":
+                    mode = DAX_FRAGMENT
+                else:
+                    mode = FRAGMENT
+            segments.append(text[last:match.start()])
+            slots.append((name, mode))
+            last = match.end()
+        segments.append(text[last:])
+        template = cls(template_id, visual_type, segments, slots, default_size)
+        if "VISUAL_NAME" not in template.placeholders:
+            raise ValueError("not a visual template (no {{VISUAL_NAME}} placeholder)")
+
+        # Rendering sample values must give valid JSON, so broken templates fail at load time
+        json.loads(template.render({name: 0 if mode == NUMBER else "x" for name, mode in slots}))
+        return template
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Substitute values into the template. Every placeholder must be present in values."""
+        parts = []
+        for segment, (name, mode) in zip(self.segments, self.slots):
+            parts.append(segment)
+            value = values[name]
+            if mode == NUMBER:
+                parts.append(value if isinstance(value, str) else json.dumps(value))
+            elif mode == STRING:
+                parts.append(json.dumps(str(value), ensure_ascii=False))
+            elif mode == DAX_FRAGMENT:
+                parts.append(json.dumps(str(value).replace("'", "''"), ensure_ascii=False)[1:-1])
+            else:
+                parts.append(json.dumps(str(value), ensure_ascii=False)[1:-1])
+        parts.append(self.segments[-1])
+        return "".join(parts)
+
+
+class TemplateCatalog:
+    """All templates in a folder, compiled once"""
+
+    def __init__(self, template_dir: Path):
+        self.template_dir = Path(template_dir)
+        if not self.template_dir.is_dir():
+            raise FileNotFoundError(f"Template folder not found: {self.template_dir}")
+        self.templates: Dict[str, CompiledTemplate] = {}
+        self.errors: Dict[str, str] = {}
+        for path in sorted(self.template_dir.glob("*.json")):
+            try:
+                self.templates[path.stem] = CompiledTemplate.compile(path.stem, path.read_text(encoding='utf-8'))
+            except (ValueError, UnicodeDecodeError, AttributeError, KeyError) as e:
+                self.errors[path.stem] = str(e)
+
+    def get(self, template_id: str) -> Optional[CompiledTemplate]:
+        return self.templates.get(template_id[:-5] if template_id.endswith(".json") else template_id)
+
+
+@dataclass
+class GeneratedPage:
+    """Result for one generated page"""
+    page_id: str
+    display_name: str
+    page_path: str
+    visuals: List[Dict[str, Any]] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+
+@dataclass
+class GenerationResult:
+    """Result of one generator call"""
+    report_path: str
+    dry_run: bool
+    pages: List[GeneratedPage] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class PageGenerator:
+    """Render and write PBIR pages from page specs against a compiled template catalog."""
+
+    def __init__(self, catalog: TemplateCatalog):
+        self.catalog = catalog
+
+    def _layout(self, page_spec: Dict[str, Any], resolved: List[Dict[str, Any]],
+                canvas: Tuple[int, int], warnings: List[str]) -> None:
+        """Fill missing positions with the layout solver."""
+        pending = [v for v in resolved if v["position"] is None]
+        if not pending:
+            return
+        solver_input = []
+        for v in pending:
+            hints = {k: v["spec"][k] for k in ("priority", "group", "min_width", "min_height", "max_width", "max_height")
+                     if k in v["spec"]}
+            if v["template"].default_size and "min_width" not in hints:
+                hints["min_width"], hints["min_height"] = v["template"].default_size
+            solver_input.append(dict(hints, name=v["name"], visual_type=v["template"].visual_type))
+        result = solve_layout(solver_input, canvas, grow_canvas=bool(page_spec.get("grow_canvas")))
+        warnings.extend(result.warnings)
+        if len(pending) < len(resolved):
+            warnings.append(f"{len(pending)} visual(s) placed by the layout solver alongside explicit positions; "
+                            f"check for overlaps")
+        by_name = {p.name: p for p in result.placements}
+        for v in pending:
+            p = by_name[v["name"]]
+            v["position"] = {"x": p.x, "y": p.y, "width": p.width, "height": p.height}
+        page_spec["_canvas_height"] = result.canvas["height"]
+
+    def prepare_page(self, page_spec: Dict[str, Any], errors: List[str]) -> Optional[Tuple[GeneratedPage, Dict, List]]:
+        """Resolve templates, bindings and positions for one page; None if the spec has errors."""
+        display_name = page_spec.get("name") or page_spec.get("displayName")
+        if not display_name:
+            errors.append("Page spec is missing 'name'")
+            return None
+        canvas = (int(page_spec.get("width", DEFAULT_CANVAS[0])), int(page_spec.get("height", DEFAULT_CANVAS[1])))
+        page = GeneratedPage(page_id=page_spec.get("id") or new_object_name(), display_name=display_name, page_path="")
+
+        resolved = []
+        page_errors = []
+        seen_names = set()
+        for i, spec in enumerate(page_spec.get("visuals", [])):
+            label = f"{display_name} / visual #{i + 1}"
+            if spec.get("name"):
+                if spec["name"] in seen_names:
+                    page_errors.append(f"{label}: duplicate visual name '{spec['name']}'")
+                    continue
+                seen_names.add(spec["name"])
+            template = self.catalog.get(str(spec.get("template", "")))
+            if template is None:
+                page_errors.append(f"{label}: unknown template '{spec.get('template')}'")
+                continue
+            bindings = dict(spec.get("bindings") or {})
+            missing = [name for name in template.required_bindings if name not in bindings]
+            if missing:
+                page_errors.append(f"{label} ({template.template_id}): missing bindings {', '.join(missing)}")
+                continue
+            position = spec.get("position")
+            if position is not None and not all(k in position for k in ("x", "y", "width", "height")):
+                page_errors.append(f"{label}: position needs x, y, width and height")
+                continue
+            resolved.append({
+                "name": spec.get("name") or new_object_name(),
+                "template": template,
+                "spec": spec,
+                "bindings": bindings,
+                "position": position,
+            })
+        if page_errors:
+            errors.extend(page_errors)
+            return None
+
+        try:
+            self._layout(page_spec, resolved, canvas, page.warnings)
+        except LayoutSpecError as e:
+            errors.append(f"{display_name}: {e}")
+            return None
+
+        rendered = []
+        for order, v in enumerate(resolved):
+            title = v["spec"].get("title") or v["bindings"].get("TITLE") or v["template"].visual_type
+            values = dict(FORMAT_DEFAULTS)
+            values.update({name: "true" for name in v["template"].placeholders if name.startswith("SHOW_")})
+            values.update({name: new_object_name() for name in v["template"].placeholders
+                           if name.startswith("FILTER_GUID")})
+            values.update({"TITLE": title, "HEADER_TEXT": title})
+            values.update(v["bindings"])
+            values.update({
+                "VISUAL_NAME": v["name"],
+                "X": v["position"]["x"],
+                "Y": v["position"]["y"],
+                "Z": v["position"].get("z", order * 1000),
+                "WIDTH": v["position"]["width"],
+                "HEIGHT": v["position"]["height"],
+                "TAB_ORDER": v["position"].get("tabOrder", order * 1000),
+            })
+            rendered.append((v["name"], v["template"].render(values)))
+            page.visuals.append({
+                "name": v["name"],
+                "template": v["template"].template_id,
+                "visual_type": v["template"].visual_type,
+                "title": title,
+                "position": {k: v["position"][k] for k in ("x", "y", "width", "height")},
+            })
+
+        page_json = {
+            "$schema": PAGE_SCHEMA,
+            "name": page.page_id,
+            "displayName": display_name,
+            "displayOption": page_spec.get("displayOption", "FitToPage"),
+            "height": page_spec.get("_canvas_height", canvas[1]),
+            "width": canvas[0],
+        }
+        return page, page_json, rendered
+
+    def generate(self, report_path, page_specs: List[Dict[str, Any]], dry_run: bool = False) -> GenerationResult:
+        """
+        Validate every page spec, then write all pages and register them in pages.json.
+
+        Nothing is written if any page spec has errors.
+        """
+        started = time.perf_counter()
+        definition = resolve_definition_path(report_path)
+        pages_path = definition / "pages"
+        result = GenerationResult(report_path=str(report_path), dry_run=dry_run)
+
+        prepared = [self.prepare_page(spec, result.errors) for spec in page_specs]
+        existing = {p.name for p in pages_path.iterdir()} if pages_path.is_dir() else set()
+        planned = set()
+        for item in prepared:
+            if not item:
+                continue
+            page_id = item[0].page_id
+            if page_id in existing:
+                result.errors.append(f"Page folder already exists: {page_id}")
+            elif page_id in planned:
+                result.errors.append(f"Duplicate page id in specs: {page_id}")
+            planned.add(page_id)
+        if result.errors:
+            result.elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+            return result
+
+        for page, page_json, rendered in prepared:
+            page_dir = pages_path / page.page_id
+            page.page_path = str(page_dir)
+            result.pages.append(page)
+            if dry_run:
+                continue
+            (page_dir / "visuals").mkdir(parents=True)
+            with open(page_dir / "page.json", 'w', encoding='utf-8') as f:
+                f.write(json.dumps(page_json, indent=2, ensure_ascii=False) + "\n")
+            for name, text in rendered:
+                visual_dir = page_dir / "visuals" / name
+                visual_dir.mkdir()
+                with open(visual_dir / "visual.json", 'w', encoding='utf-8') as f:
+                    f.write(text if text.endswith("\n") else text + "\n")
+
+        if not dry_run and result.pages:
+            register_pages(pages_path, [p.page_id for p in result.pages], existing)
+
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+
+def register_pages(pages_path: Path, page_ids: List[str], existing: set) -> None:
+    """Append page IDs to pages.json pageOrder, creating pages.json if needed."""
+    pages_json = pages_path / "pages.json"
+    if pages_json.is_file():
+        with open(pages_json, 'r', encoding='utf-8', newline='') as f:
+            original = f.read()
+        data = json.loads(original)
+        data["pageOrder"] = list(data.get("pageOrder") or []) + page_ids
+        text = render_json_minimal(original, data, [("pageOrder",)])
+    else:
+        folders = sorted(name for name in existing if (pages_path / name).is_dir())
+        data = {"$schema": PAGES_SCHEMA, "pageOrder": folders + page_ids, "activePageName": (folders + page_ids)[0]}
+        text = json.dumps(data, indent=2) + "\n"
+    with open(pages_json, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def format_result(result: GenerationResult) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("PBIR PAGE GENERATION" + (" (DRY RUN)" if result.dry_run else ""))
+    lines.append("=" * 80)
+    lines.append(f"Report: {result.report_path}")
+    if result.errors:
+        lines.append("")
+        lines.append(f"❌ {len(result.errors)} spec error(s) - nothing written:")
+        for error in result.errors:
+            lines.append(f"  - {error}")
+    for page in result.pages:
+        lines.append("")
+        lines.append(f"✅ {page.display_name} ({page.page_id}) - {len(page.visuals)} visuals")
+        for v in page.visuals:
+            pos = v["position"]
+            lines.append(f"  {v['name']}  {v['template']:<34} {v['title'][:24]:<24} "
+                         f"({pos['x']}, {pos['y']}) {pos['width']}×{pos['height']}")
+        for warning in page.warnings:
+            lines.append(f"  ⚠️ {warning}")
+    lines.append("")
+    lines.append(f"Completed in {result.elapsed_ms} ms")
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate PBIR pages from visual templates",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("report_path", nargs="?", help="Path to .Report folder")
+    parser.add_argument("page_spec", nargs="?", help="Page spec JSON file, or - for stdin")
+    parser.add_argument("--templates", help="Visual template folder")
+    parser.add_argument("--list-templates", action="store_true", help="List templates and required bindings")
+    parser.add_argument("--dry-run", action="store_true", help="Validate without writing files")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        catalog = TemplateCatalog(Path(args.templates) if args.templates else default_template_dir())
+    except FileNotFoundError as e:
+        print(f"Error: {e} (use --templates)", file=sys.stderr)
+        sys.exit(2)
+
+    if args.list_templates:
+        listing = {tid: {"visual_type": t.visual_type, "required_bindings": t.required_bindings}
+                   for tid, t in catalog.templates.items()}
+        if args.json:
+            print(json.dumps(listing, indent=2))
+        else:
+            for tid, info in listing.items():
+                print(f"{tid:<36} {info['visual_type']:<22} {', '.join(info['required_bindings'])}")
+        sys.exit(0)
+
+    if not args.report_path or not args.page_spec:
+        parser.error("report_path and page_spec are required")
+
+    try:
+        if args.page_spec == "-":
+            spec = json.load(sys.stdin)
+        else:
+            with open(args.page_spec, 'r', encoding='utf-8') as f:
+                spec = json.load(f)
+        page_specs = spec["pages"] if isinstance(spec, dict) and "pages" in spec else [spec]
+        result = PageGenerator(catalog).generate(args.report_path, page_specs, dry_run=args.dry_run)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    except (json.JSONDecodeError, TypeError) as e:
+        print(f"Error: invalid page spec: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(format_result(result))
+
+    sys.exit(1 if result.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+PBIR Schema Validator
+
+Validates Power BI Report (PBIR) definition files offline against the bundled
+schemas in pbir_definition_schemas.json (visualContainer, page, report,
+bookmark, pages/bookmarks metadata, version).
+
+Each schema is compiled once into a tree of small validator functions and
+cached for the life of the process, so validating thousands of files costs
+one schema load. In --report mode every file under definition/ is validated
+in parallel worker processes and errors are streamed as they are found, each
+with a JSON pointer to the offending value.
+
+Usage:
+    python pbir_schema_validator.py <file.json> [--json]
+    python pbir_schema_validator.py --report <report_path> [--workers N] [--json]
+
+Arguments:
+    file.json             A single PBIR file (schema chosen by file name)
+
+Options:
+    --report <path>       Validate every file under <path>/definition/
+    --workers N           Worker processes for --report (default: CPU count)
+    --json                Emit one JSON object per error (JSON Lines)
+
+Exit Codes:
+    0 - All files valid
+    1 - Schema errors found
+    2 - Path not found
+
+Examples:
+    python pbir_schema_validator.py "Sales.Report/definition/pages/ReportSection1/page.json"
+    python pbir_schema_validator.py --report "Sales.Report"
+    python pbir_schema_validator.py --report "Sales.Report" --json > schema_errors.jsonl
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+SCHEMA_FILE = Path(__file__).with_name("pbir_definition_schemas.json")
+
+# Below this many files, process start-up costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+# Validator signature: (instance, pointer, errors) -> None
+Validator = Callable[[Any, str, List["SchemaError"]], None]
+
+_JSON_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+}
+
+
+@dataclass
+class SchemaError:
+    """A single schema violation"""
+    pointer: str  # JSON pointer (RFC 6901) to the offending value
+    message: str
+    file: str = ""
+
+    def __str__(self):
+        return f"{self.file}#{self.pointer or '/'}: {self.message}"
+
+
+def _child_pointer(pointer: str, token) -> str:
+    return f"{pointer}/{str(token).replace('~', '~0').replace('/', '~1')}"
+
+
+@lru_cache(maxsize=1)
+def load_schema_definitions() -> Dict[str, Any]:
+    """Load the bundled schema definitions (once per process)."""
+    with open(SCHEMA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)["definitions"]
+
+
+class SchemaCompiler:
+    """
+    Compiles a JSON schema (draft-07 subset) into nested validator closures.
+
+    Supported keywords: $ref (#/definitions/...), type, enum, const, required,
+    properties, additionalProperties, minProperties, items, minItems, minLength,
+    maxLength, pattern, minimum, maximum, allOf, anyOf, oneOf.
+    """
+
+    def __init__(self, definitions: Dict[str, Any]):
+        self.definitions = definitions
+        self._compiled: Dict[str, Validator] = {}
+
+    def compile_definition(self, name: str) -> Validator:
+        # $refs are resolved on first use, so recursive definitions compile fine
+        if name not in self._compiled:
+            self._compiled[name] = self.compile(self.definitions[name])
+        return self._compiled[name]
+
+    def compile(self, schema: Dict[str, Any]) -> Validator:
+        checks: List[Validator] = []
+
+        if "$ref" in schema:
+            ref_name = schema["$ref"].rsplit("/", 1)[-1]
+            checks.append(lambda inst, ptr, errs: self.compile_definition(ref_name)(inst, ptr, errs))
+
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            predicates = [_JSON_TYPES[t] for t in types]
+            expected = " or ".join(types)
+
+            def check_type(inst, ptr, errs):
+                if not any(p(inst) for p in predicates):
+                    errs.append(SchemaError(ptr, f"Expected {expected}, got {type(inst).__name__}"))
+            checks.append(check_type)
+
+        if "enum" in schema:
+            allowed = schema["enum"]
+
+            def check_enum(inst, ptr, errs):
+                if inst not in allowed:
+                    errs.append(SchemaError(ptr, f"Value {inst!r} not in {allowed}"))
+            checks.append(check_enum)
+
+        if "const" in schema:
+            const = schema["const"]
+
+            def check_const(inst, ptr, errs):
+                if inst != const:
+                    errs.append(SchemaError(ptr, f"Value must be {const!r}"))
+            checks.append(check_const)
+
+        checks.extend(self._compile_object(schema))
+        checks.extend(self._compile_array(schema))
+        checks.extend(self._compile_scalar(schema))
+        checks.extend(self._compile_combinators(schema))
+
+        if len(checks) == 1:
+            return checks[0]
+
+        def validate(inst, ptr, errs):
+            for check in checks:
+                check(inst, ptr, errs)
+        return validate
+
+    def _compile_object(self, schema: Dict[str, Any]) -> List[Validator]:
+        checks = []
+        required = schema.get("required")
+        properties = {k: self.compile(v) for k, v in schema.get("properties", {}).items()}
+        additional = schema.get("additionalProperties", True)
+        additional_check = self.compile(additional) if isinstance(additional, dict) else None
+        min_props = schema.get("minProperties")
+
+        if required:
+            def check_required(inst, ptr, errs):
+                if isinstance(inst, dict):
+                    for key in required:
+                        if key not in inst:
+                            errs.append(SchemaError(ptr, f"Missing required property '{key}'"))
+            checks.append(check_required)
+
+        if properties or additional is not True:
+            def check_properties(inst, ptr, errs):
+                if not isinstance(inst, dict):
+                    return
+                for key, value in inst.items():
+                    check = properties.get(key)
+                    if check is not None:
+                        check(value, _child_pointer(ptr, key), errs)
+                    elif additional is False:
+                        errs.append(SchemaError(_child_pointer(ptr, key), f"Unexpected property '{key}'"))
+                    elif additional_check is not None:
+                        additional_check(value, _child_pointer(ptr, key), errs)
+            checks.append(check_properties)
+
+        if min_props is not None:
+            def check_min_props(inst, ptr, errs):
+                if isinstance(inst, dict) and len(inst) < min_props:
+                    errs.append(SchemaError(ptr, f"Expected at least {min_props} properties"))
+            checks.append(check_min_props)
+
+        return checks
+
+    def _compile_array(self, schema: Dict[str, Any]) -> List[Validator]:
+        checks = []
+        if "items" in schema:
+            item_check = self.compile(schema["items"])
+
+            def check_items(inst, ptr, errs):
+                if isinstance(inst, list):
+                    for i, item in enumerate(inst):
+                        item_check(item, _child_pointer(ptr, i), errs)
+            checks.append(check_items)
+
+        if "minItems" in schema:
+            min_items = schema["minItems"]
+
+            def check_min_items(inst, ptr, errs):
+                if isinstance(inst, list) and len(inst) < min_items:
+                    errs.append(SchemaError(ptr, f"Expected at least {min_items} items"))
+            checks.append(check_min_items)
+        return checks
+
+    def _compile_scalar(self, schema: Dict[str, Any]) -> List[Validator]:
+        checks = []
+        min_len, max_len = schema.get("minLength"), schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        minimum, maximum = schema.get("minimum"), schema.get("maximum")
+
+        if min_len is not None or max_len is not None or pattern is not None:
+            def check_string(inst, ptr, errs):
+                if not isinstance(inst, str):
+                    return
+                if min_len is not None and len(inst) < min_len:
+                    errs.append(SchemaError(ptr, f"String shorter than {min_len}"))
+                if max_len is not None and len(inst) > max_len:
+                    errs.append(SchemaError(ptr, f"String longer than {max_len} ({len(inst)})"))
+                if pattern is not None and not pattern.search(inst):
+                    errs.append(SchemaError(ptr, f"String {inst!r} does not match {pattern.pattern}"))
+            checks.append(check_string)
+
+        if minimum is not None or maximum is not None:
+            def check_range(inst, ptr, errs):
+                if not _JSON_TYPES["number"](inst):
+                    return
+                if minimum is not None and inst < minimum:
+                    errs.append(SchemaError(ptr, f"Value {inst} is below minimum {minimum}"))
+                if maximum is not None and inst > maximum:
+                    errs.append(SchemaError(ptr, f"Value {inst} is above maximum {maximum}"))
+            checks.append(check_range)
+        return checks
+
+    def _compile_combinators(self, schema: Dict[str, Any]) -> List[Validator]:
+        checks = []
+        for sub in schema.get("allOf", []):
+            checks.append(self.compile(sub))
+
+        if "anyOf" in schema or "oneOf" in schema:
+            keyword = "anyOf" if "anyOf" in schema else "oneOf"
+            branches = [self.compile(sub) for sub in schema[keyword]]
+
+            def check_branches(inst, ptr, errs):
+                passing = 0
+                for branch in branches:
+                    branch_errors: List[SchemaError] = []
+                    branch(inst, ptr, branch_errors)
+                    if not branch_errors:
+                        passing += 1
+                if keyword == "anyOf" and passing == 0:
+                    errs.append(SchemaError(ptr, "Value does not match any allowed shape (anyOf)"))
+                elif keyword == "oneOf" and passing != 1:
+                    errs.append(SchemaError(ptr, f"Value must match exactly one allowed shape (oneOf), matched {passing}"))
+            checks.append(check_branches)
+        return checks
+
+
+@lru_cache(maxsize=None)
+def get_validator(definition: str) -> Validator:
+    """Compiled validator for a schema definition, cached per process."""
+    return SchemaCompiler(load_schema_definitions()).compile_definition(definition)
+
+
+def schema_for_file(path: Path) -> Optional[str]:
+    """Select the schema definition for a PBIR file by its name."""
+    name = path.name
+    if name == "visual.json":
+        return "visualContainer"
+    if name == "page.json":
+        return "page"
+    if name == "pages.json":
+        return "pagesMetadata"
+    if name == "report.json":
+        return "report"
+    if name == "bookmarks.json":
+        return "bookmarksMetadata"
+    if name.endswith(".bookmark.json"):
+        return "bookmark"
+    if name == "version.json":
+        return "version"
+    return None
+
+
+def validate_instance(instance: Any, definition: str) -> List[SchemaError]:
+    """Validate an already-parsed document against a schema definition."""
+    errors: List[SchemaError] = []
+    get_validator(definition)(instance, "", errors)
+    return errors
+
+
+def validate_file(path: str, root: Optional[str] = None) -> List[SchemaError]:
+    """Validate one file. Files without a known schema return no errors."""
+    file_path = Path(path)
+    label = os.path.relpath(path, root).replace(os.sep, "/") if root else str(file_path)
+    definition = schema_for_file(file_path)
+    if definition is None:
+        return []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            instance = json.load(f)
+    except json.JSONDecodeError as e:
+        return [SchemaError("", f"Invalid JSON: {e}", label)]
+    except (OSError, UnicodeDecodeError) as e:
+        return [SchemaError("", f"Unreadable file: {e}", label)]
+
+    errors = validate_instance(instance, definition)
+    for error in errors:
+        error.file = label
+    return errors
+
+
+def iter_definition_files(definition_path: Path) -> Iterator[str]:
+    """Yield every schema-backed JSON file under definition/."""
+    for dirpath, _, filenames in os.walk(definition_path):
+        for filename in filenames:
+            if filename.endswith(".json") and schema_for_file(Path(filename)):
+                yield os.path.join(dirpath, filename)
+
+
+def _validate_for_pool(args) -> List[SchemaError]:
+    path, root = args
+    return validate_file(path, root)
+
+
+def validate_report(report_path, workers: Optional[int] = None) -> Iterator[SchemaError]:
+    """
+    Validate every PBIR file of a report, yielding errors as each file completes.
+
+    Files are distributed over a process pool in chunks; results arrive in file
+    order so output is deterministic.
+    """
+    path = Path(report_path)
+    definition = path / "definition" if (path / "definition").is_dir() else path
+    if not definition.is_dir():
+        raise FileNotFoundError(f"PBIR definition folder not found under: {path}")
+
+    yield from validate_files(sorted(iter_definition_files(definition)), definition, workers)
+
+
+def validate_files(files: List[str], definition, workers: Optional[int] = None) -> Iterator[SchemaError]:
+    """Validate an already-listed set of PBIR files (paths reported relative to definition)."""
+    tasks = [(f, str(definition)) for f in files]
+
+    if len(tasks) < PARALLEL_THRESHOLD or workers == 1:
+        for task in tasks:
+            yield from _validate_for_pool(task)
+        return
+
+    chunksize = max(8, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for errors in executor.map(_validate_for_pool, tasks, chunksize=chunksize):
+            yield from errors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate PBIR definition files against bundled schemas",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("file", nargs="?", help="Single PBIR file to validate")
+    parser.add_argument("--report", help="Validate every file under <report>/definition/")
+    parser.add_argument("--workers", type=int, help="Worker processes for --report")
+    parser.add_argument("--json", action="store_true", help="Emit errors as JSON Lines")
+
+    args = parser.parse_args()
+
+    if not args.file and not args.report:
+        parser.print_help()
+        sys.exit(2)
+
+    try:
+        if args.report:
+            errors = validate_report(args.report, args.workers)
+        else:
+            if not Path(args.file).is_file():
+                raise FileNotFoundError(f"File not found: {args.file}")
+            if schema_for_file(Path(args.file)) is None:
+                print(f"Error: no bundled schema for file name '{Path(args.file).name}'", file=sys.stderr)
+                sys.exit(2)
+            errors = iter(validate_file(args.file))
+
+        error_count = 0
+        for error in errors:
+            error_count += 1
+            if args.json:
+                print(json.dumps(asdict(error), ensure_ascii=False), flush=True)
+            else:
+                print(f"❌ {error}", flush=True)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if not args.json:
+        print(f"\nSummary: {error_count} schema error(s)" if error_count else "✅ All files valid")
+    sys.exit(1 if error_count else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,9 @@ import json
 import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Sequence, Tuple
+
+from json_splice import parse_path_segment, render_json_minimal
 
 # Force UTF-8 encoding for stdout on Windows to handle emoji characters
 if sys.platform == 'win32':
@@ -94,27 +96,6 @@ def parse_value(value_str: str) -> Any:
         return value_str
 
 
-def parse_path_segment(segment: str) -> Tuple[str, int]:
-    """
-    Parse a path segment that may include array indexing.
-
-    Args:
-        segment: Path segment like "field" or "projections[0]"
-
-    Returns:
-        Tuple of (key, index) where index is -1 if not an array access
-
-    Examples:
-        parse_path_segment("field") -> ("field", -1)
-        parse_path_segment("projections[0]") -> ("projections", 0)
-    """
-    import re
-    match = re.match(r'^([^\[]+)\[(\d+)\]$', segment)
-    if match:
-        return (match.group(1), int(match.group(2)))
-    return (segment, -1)
-
-
 def set_nested_property(obj: Dict, json_path: str, value: Any) -> None:
     """
     Set a nested property in a dictionary using dot notation with array indexing support.
@@ -195,6 +176,25 @@ def get_nested_property(obj: Dict, json_path: str) -> Any:
     return current
 
 
+def write_json_minimal(file_path: Path, original_text: str, original_obj: Any,
+                       new_obj: Any, changed_paths: Sequence) -> bool:
+    """
+    Write new_obj to file_path, changing only the edited value spans.
+
+    Skips the write entirely when no value changed.
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    if new_obj == original_obj:
+        return False
+
+    text = render_json_minimal(original_text, new_obj, changed_paths, original_obj)
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    return True
+
+
 def replace_property(visual_json: Dict, json_path: str, new_value: Any) -> Dict:
     """
     Execute replace_property operation: modify visual.json property (supports nested paths).
@@ -347,9 +347,12 @@ def execute_xml_edit_plan(
             continue
 
         try:
-            # Read visual.json
-            with open(full_path, 'r', encoding='utf-8') as f:
-                visual_json = json.load(f)
+            # Read visual.json (keep the raw text so unchanged bytes can be preserved)
+            with open(full_path, 'r', encoding='utf-8', newline='') as f:
+                original_text = f.read()
+            original_json = json.loads(original_text)
+            visual_json = json.loads(original_text)  # cheaper than deepcopy for large visuals
+            changed_paths = []
 
             # Apply all steps for this file
             for step in steps:
@@ -367,16 +370,15 @@ def execute_xml_edit_plan(
 
                 # Execute the edit
                 visual_json = execute_edit_step(visual_json, operation, json_path, new_value)
+                changed_paths.append('config' if operation == 'config_edit' else json_path)
 
-            # Write modified visual.json back (pretty-printed with 2-space indent)
-            with open(full_path, 'w', encoding='utf-8') as f:
-                json.dump(visual_json, f, indent=2, ensure_ascii=False)
+            # Splice only the changed values back into the original text
+            if write_json_minimal(full_path, original_text, original_json, visual_json, changed_paths):
+                message = f"Applied {len(steps)} edit(s) successfully"
+            else:
+                message = f"No changes: {len(steps)} edit(s) already match current values"
 
-            results.append((
-                rel_file_path,
-                True,
-                f"Applied {len(steps)} edit(s) successfully"
-            ))
+            results.append((rel_file_path, True, message))
 
         except json.JSONDecodeError as e:
             results.append((rel_file_path, False, f"Invalid JSON in file: {e}"))
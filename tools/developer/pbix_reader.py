@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+PBIX Reader
+
+Reads pages, visuals, measures and M queries directly from a .pbix (or .pbit)
+file without converting it to PBIP in Power BI Desktop. Archive members are
+streamed out of the zip; nothing is extracted to disk.
+
+Members used (when present):
+    Report/Layout     Legacy report layout, UTF-16-LE JSON; streamed section by section
+    DataModelSchema   Model metadata in model.bim form, UTF-16-LE JSON (.pbit files and
+                      some older .pbix files; current .pbix store the model in binary
+                      DataModel, so measures are unavailable for those)
+    DataMashup        Power Query package; Formulas/Section1.m provides M queries when
+                      DataModelSchema is absent
+
+Pages and visuals are converted with legacy_report_converter.py, so consumers get
+the same page.json / visual.json structures as a PBIR project, and report_layout()
+returns the same structure as extract_visual_layout.extract_report_layout().
+
+Usage:
+    python pbix_reader.py <pbix_file> [--layout] [--measures] [--queries] [--json]
+
+Arguments:
+    pbix_file             Path to a .pbix or .pbit file
+
+Options:
+    --layout              Include every page's visuals (extract_visual_layout format)
+    --measures            Include measure definitions
+    --queries             Include M query expressions
+    --json                Output results as JSON
+
+Exit Codes:
+    0 - File read successfully
+    1 - File read, but no report layout was found
+    2 - File not found or not a valid PBIX archive
+
+Examples:
+    python pbix_reader.py "Sales.pbix"
+    python pbix_reader.py "Sales.pbix" --layout --measures --json
+"""
+
+import io
+import re
+import sys
+import json
+import time
+import struct
+import zipfile
+import argparse
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pbi_merger_utils import JsonObjectStream
+from legacy_report_converter import convert_container, convert_section, ConversionError
+from extract_visual_layout import parse_visual, sort_visuals, DEFAULT_CANVAS
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+LAYOUT_MEMBER = "Report/Layout"
+MODEL_SCHEMA_MEMBER = "DataModelSchema"
+MODEL_MEMBER = "DataModel"
+MASHUP_MEMBER = "DataMashup"
+MASHUP_FORMULAS = "Formulas/Section1.m"
+
+# Warning prefix for visual containers iter_pages() could not convert
+SKIPPED_CONTAINER = "Skipped visual container"
+
+# One "shared <name> = <expression>;" statement per query in Section1.m
+SHARED_QUERY = re.compile(r'^shared\s+(#"(?:[^"]|"")+"|[\w.]+)\s*=\s*', re.MULTILINE)
+
+
+def _expression_text(value: Any) -> str:
+    """model.bim stores multi-line expressions as lists of lines."""
+    if isinstance(value, list):
+        return "\n".join(value)
+    return value or ""
+
+
+def parse_section_document(text: str) -> List[Dict[str, str]]:
+    """Split a Power Query section document (Section1.m) into named queries."""
+    queries = []
+    matches = list(SHARED_QUERY.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        name = match.group(1)
+        if name.startswith('#"'):
+            name = name[2:-1].replace('""', '"')
+        expression = text[match.end():end].rstrip().rstrip(';').rstrip()
+        queries.append({"name": name, "expression": expression})
+    return queries
+
+
+@dataclass
+class PbixSummary:
+    """Overview of a PBIX archive"""
+    file_path: str
+    file_size: int
+    has_report_layout: bool
+    has_model_schema: bool
+    has_binary_model: bool
+    has_data_mashup: bool
+    pages: int = 0
+    visuals: int = 0
+    tables: int = 0
+    measures: int = 0
+    m_queries: int = 0
+    page_names: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+class PbixReader:
+    """
+    Read-only access to a PBIX archive.
+
+    The archive stays open for the reader's lifetime; use it as a context
+    manager or call close().
+    """
+
+    def __init__(self, file_path):
+        self.file_path = Path(file_path)
+        if not self.file_path.is_file():
+            raise FileNotFoundError(f"PBIX file not found: {self.file_path}")
+        self._zip = zipfile.ZipFile(self.file_path)
+        self._members = set(self._zip.namelist())
+        self._model: Optional[Dict[str, Any]] = None
+
+    def __enter__(self) -> 'PbixReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def has_member(self, name: str) -> bool:
+        return name in self._members
+
+    def _open_text(self, name: str) -> io.TextIOWrapper:
+        """Open a UTF-16 member as a text stream, honouring a byte-order mark if present."""
+        with self._zip.open(name) as raw:
+            bom = raw.read(2)
+        encoding = 'utf-16' if bom in (b'\xff\xfe', b'\xfe\xff') else 'utf-16-le'
+        return io.TextIOWrapper(self._zip.open(name), encoding=encoding)
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    def iter_layout(self) -> Iterator[Tuple[str, Optional[int], Any]]:
+        """Stream Report/Layout members; sections are yielded one at a time."""
+        if not self.has_member(LAYOUT_MEMBER):
+            return
+        with self._open_text(LAYOUT_MEMBER) as stream:
+            yield from JsonObjectStream(stream, stream_arrays=("sections",))
+
+    def iter_pages(self, warnings: Optional[List[str]] = None) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Yield (page.json, [visual.json, ...]) per page, in PBIR structure, in report order.
+
+        Visual containers that cannot be converted (e.g. no name in their config) are
+        skipped with a warning instead of failing the whole report.
+        """
+        warnings = warnings if warnings is not None else []
+        sections = []
+        for key, index, value in self.iter_layout():
+            if index is not None:
+                containers = value.get("visualContainers") or []
+                page, _ = convert_section(dict(value, visualContainers=[]), warnings)
+                visuals = []
+                for position, container in enumerate(containers):
+                    try:
+                        visuals.append(convert_container(container, warnings))
+                    except ConversionError as e:
+                        warnings.append(f"{SKIPPED_CONTAINER} #{position + 1} on page {page['name']}: {e}")
+                sections.append((value.get("ordinal", index), index, page, visuals))
+        for _, _, page, visuals in sorted(sections, key=lambda s: (s[0], s[1])):
+            yield page, visuals
+
+    def report_layout(self) -> Dict[str, Any]:
+        """Visual layout for every page, in extract_visual_layout.extract_report_layout() format."""
+        pages = []
+        for page, visuals in self.iter_pages():
+            parsed = sort_visuals([parse_visual(v) for v in visuals])
+            pages.append({
+                "id": page["name"],
+                "name": page.get("displayName", page["name"]),
+                "width": page.get("width", DEFAULT_CANVAS[0]),
+                "height": page.get("height", DEFAULT_CANVAS[1]),
+                "visual_count": len(parsed),
+                "visuals": parsed,
+            })
+        return {
+            "report_path": str(self.file_path),
+            "page_count": len(pages),
+            "visual_count": sum(p["visual_count"] for p in pages),
+            "pages": pages,
+        }
+
+    # ------------------------------------------------------------------
+    # Model
+    # ------------------------------------------------------------------
+
+    def model(self) -> Optional[Dict[str, Any]]:
+        """DataModelSchema as a model.bim dictionary, or None when the model is binary-only."""
+        if self._model is None and self.has_member(MODEL_SCHEMA_MEMBER):
+            with self._open_text(MODEL_SCHEMA_MEMBER) as stream:
+                self._model = {key: value for key, _, value in JsonObjectStream(stream)}
+        return self._model
+
+    def measures(self) -> List[Dict[str, Any]]:
+        """Measures as {table, name, expression, formatString, displayFolder} dicts."""
+        model = self.model()
+        if not model:
+            return []
+        measures = []
+        for table in model.get("model", {}).get("tables", []):
+            for measure in table.get("measures", []):
+                measures.append({
+                    "table": table.get("name"),
+                    "name": measure.get("name"),
+                    "expression": _expression_text(measure.get("expression")),
+                    "formatString": measure.get("formatString"),
+                    "displayFolder": measure.get("displayFolder"),
+                })
+        return measures
+
+    def m_queries(self) -> List[Dict[str, Any]]:
+        """M queries as {name, table, expression, source} dicts (source: "partition", "expression" or "mashup")."""
+        model = self.model()
+        if model:
+            queries = []
+            for table in model.get("model", {}).get("tables", []):
+                for partition in table.get("partitions", []):
+                    source = partition.get("source", {})
+                    if source.get("type") == "m":
+                        queries.append({"name": table.get("name"), "table": table.get("name"),
+                                        "expression": _expression_text(source.get("expression")),
+                                        "source": "partition"})
+            for expression in model.get("model", {}).get("expressions", []):
+                if expression.get("kind", "m") == "m":
+                    queries.append({"name": expression.get("name"), "table": None,
+                                    "expression": _expression_text(expression.get("expression")),
+                                    "source": "expression"})
+            return queries
+        text = self.mashup_formulas()
+        if text is None:
+            return []
+        return [dict(q, table=None, source="mashup") for q in parse_section_document(text)]
+
+    def mashup_formulas(self) -> Optional[str]:
+        """Section1.m text from the DataMashup package, or None."""
+        if not self.has_member(MASHUP_MEMBER):
+            return None
+        data = self._zip.read(MASHUP_MEMBER)
+        # DataMashup: int32 version, int32 package-parts length, package-parts zip, ...
+        if len(data) < 8:
+            return None
+        _, parts_length = struct.unpack_from('<ii', data, 0)
+        try:
+            with zipfile.ZipFile(io.BytesIO(data[8:8 + parts_length])) as package:
+                return package.read(MASHUP_FORMULAS).decode('utf-8-sig')
+        except (zipfile.BadZipFile, KeyError):
+            return None
+
+    # ------------------------------------------------------------------
+    # Summary
+    # ------------------------------------------------------------------
+
+    def summary(self) -> PbixSummary:
+        started = time.perf_counter()
+        result = PbixSummary(
+            file_path=str(self.file_path),
+            file_size=self.file_path.stat().st_size,
+            has_report_layout=self.has_member(LAYOUT_MEMBER),
+            has_model_schema=self.has_member(MODEL_SCHEMA_MEMBER),
+            has_binary_model=self.has_member(MODEL_MEMBER),
+            has_data_mashup=self.has_member(MASHUP_MEMBER),
+        )
+        warnings: List[str] = []
+        for page, visuals in self.iter_pages(warnings):
+            result.pages += 1
+            result.visuals += len(visuals)
+            result.page_names.append(page.get("displayName", page["name"]))
+        result.notes.extend(w for w in warnings if w.startswith(SKIPPED_CONTAINER))
+        model = self.model()
+        if model:
+            result.tables = len(model.get("model", {}).get("tables", []))
+            result.measures = len(self.measures())
+        elif result.has_binary_model:
+            result.notes.append("Model is stored in binary DataModel; measures need PBIP conversion or a .pbit export")
+        result.m_queries = len(self.m_queries())
+        if not result.has_report_layout:
+            result.notes.append("No Report/Layout member (dataset-only file?)")
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+
+def format_summary(summary: PbixSummary, layout: Optional[Dict] = None,
+                   measures: Optional[List[Dict]] = None, queries: Optional[List[Dict]] = None) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("PBIX INSPECTION")
+    lines.append("=" * 80)
+    lines.append(f"File: {summary.file_path} ({summary.file_size / 1024 / 1024:,.1f} MB)")
+    lines.append(f"Pages: {summary.pages} | Visuals: {summary.visuals} | Tables: {summary.tables} | "
+                 f"Measures: {summary.measures} | M queries: {summary.m_queries} | {summary.elapsed_ms} ms")
+    for name in summary.page_names:
+        lines.append(f"  - {name}")
+    for note in summary.notes:
+        lines.append(f"⚠️ {note}")
+
+    if layout:
+        for page in layout["pages"]:
+            lines.append("")
+            lines.append(f"PAGE: {page['name']} ({page['width']}x{page['height']}, {page['visual_count']} visuals)")
+            for visual in page["visuals"]:
+                lines.append(f"  {visual['visual_type']:<28} {visual['title'][:30]:<30} "
+                             f"({visual['x']:.0f},{visual['y']:.0f}) {visual['width']:.0f}x{visual['height']:.0f}")
+    if measures:
+        lines.append("")
+        lines.append("MEASURES")
+        for measure in measures:
+            first_line = measure["expression"].strip().splitlines()[0] if measure["expression"].strip() else ""
+            lines.append(f"  {measure['table']}[{measure['name']}] = {first_line[:80]}")
+    if queries:
+        lines.append("")
+        lines.append("M QUERIES")
+        for query in queries:
+            lines.append(f"  {query['name']} ({query['source']}, {len(query['expression'].splitlines())} lines)")
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Read pages, visuals, measures and M queries directly from a PBIX file",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("pbix_file", help="Path to .pbix or .pbit file")
+    parser.add_argument("--layout", action="store_true", help="Include page visual layouts")
+    parser.add_argument("--measures", action="store_true", help="Include measure definitions")
+    parser.add_argument("--queries", action="store_true", help="Include M query expressions")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        with PbixReader(args.pbix_file) as reader:
+            summary = reader.summary()
+            layout = reader.report_layout() if args.layout else None
+            measures = reader.measures() if args.measures else None
+            queries = reader.m_queries() if args.queries else None
+    except (FileNotFoundError, zipfile.BadZipFile, ValueError, ConversionError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        output = {"summary": asdict(summary)}
+        if layout is not None:
+            output["layout"] = layout
+        if measures is not None:
+            output["measures"] = measures
+        if queries is not None:
+            output["m_queries"] = queries
+        print(json.dumps(output, indent=2, ensure_ascii=False))
+    else:
+        print(format_summary(summary, layout, measures, queries))
+
+    sys.exit(0 if summary.has_report_layout else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Power BI Portfolio Scanner
+
+Runs the per-project analyses - sensitive_column_detector.py,
+m_pattern_analyzer.py and query_folding_validator.py - across every PBIP
+project under a root folder and writes one consolidated JSON/CSV report.
+
+Projects are found by their .SemanticModel folders (one project per parent
+folder) and analysed in a process pool. Each finished project is appended to a
+JSONL checkpoint as soon as its worker returns, so an interrupted run resumes
+where it stopped (--resume) and the parent never holds more than the projects
+currently in flight. The consolidated report is assembled by streaming the
+checkpoint, keeping memory bounded however many projects are scanned.
+
+Usage:
+    python portfolio_scanner.py <root> [--output <report.json>] [--csv <report.csv>]
+                                [--checkpoint <file.jsonl>] [--resume] [--workers N]
+                                [--analyses sensitive,mcode,folding] [--rules <rules.json>]
+
+Arguments:
+    root                  Folder containing PBIP projects (searched recursively)
+
+Options:
+    --output <file>       Consolidated JSON report (default: portfolio_report.json)
+    --csv <file>          One-row-per-project CSV summary
+    --checkpoint <file>   JSONL checkpoint (default: <output>.checkpoint.jsonl)
+    --resume              Skip projects already completed in the checkpoint
+                          (projects that failed are retried)
+    --workers N           Worker processes (default: CPU count)
+    --analyses <list>     Comma-separated subset of sensitive, mcode, folding (default: all)
+    --rules <file>        Rules file passed to the sensitive column detector
+    --json                Print the run summary as JSON
+
+Exit Codes:
+    0 - All projects scanned
+    1 - One or more projects failed (see the report's errors), or the run was interrupted
+    2 - Root not found or no projects found
+
+Examples:
+    python portfolio_scanner.py "D:\\Repos" --csv portfolio.csv
+    python portfolio_scanner.py "D:\\Repos" --resume --workers 8
+"""
+
+import csv
+import io
+import json
+import os
+import signal
+import sys
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sensitive_column_detector import SensitiveColumnDetector
+from m_pattern_analyzer import MCodePatternAnalyzer
+from query_folding_validator import QueryFoldingValidator
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+ANALYSES = ('sensitive', 'mcode', 'folding')
+
+# Folders never searched for projects
+SKIP_DIRS = {'.git', 'node_modules', '.pbi-squire-cache', '__pycache__', '.venv'}
+
+CSV_FIELDS = [
+    'project', 'status', 'elapsed_ms', 'tables', 'columns',
+    'sensitive_high', 'sensitive_medium', 'sensitive_low',
+    'partitions', 'folding_breaking', 'folding_maybe', 'partitions_breaking_folding', 'errors'
+]
+
+
+@dataclass
+class PortfolioSummary:
+    """Outcome of a portfolio run"""
+    root: str
+    projects_found: int
+    projects_scanned: int  # Scanned in this run
+    projects_resumed: int  # Taken from the checkpoint
+    projects_failed: int
+    sensitive_high: int = 0
+    folding_breaking: int = 0
+    output: str = ""
+    csv: Optional[str] = None
+    checkpoint: str = ""
+    elapsed_ms: float = 0.0
+    failures: List[Dict[str, str]] = field(default_factory=list)
+
+
+def discover_projects(root: Path) -> List[Path]:
+    """Return project folders under root: the parents of .SemanticModel folders."""
+    projects = []
+    for dirpath, dirnames, _ in os.walk(root):
+        models = [d for d in dirnames if d.endswith('.SemanticModel')]
+        if models:
+            projects.append(Path(dirpath))
+        # Do not descend into project artifacts or tool folders
+        dirnames[:] = [d for d in dirnames
+                       if d not in SKIP_DIRS and not d.endswith(('.SemanticModel', '.Report'))]
+    return sorted(projects)
+
+
+def _run_sensitive(project: Path, rules_path: Optional[str]) -> Dict[str, Any]:
+    detector = SensitiveColumnDetector(str(project), rules_path)
+    result = detector.scan()
+    by_confidence = {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+    for col in result.sensitive_columns:
+        by_confidence[col.confidence] = by_confidence.get(col.confidence, 0) + 1
+    return {
+        'tables_scanned': result.tables_scanned,
+        'columns_scanned': result.columns_scanned,
+        'high': by_confidence['HIGH'],
+        'medium': by_confidence['MEDIUM'],
+        'low': by_confidence['LOW'],
+        'columns': [
+            {'table': c.table, 'column': c.column, 'category': c.pattern_category,
+             'confidence': c.confidence, 'suggested_masking': c.suggested_masking}
+            for c in result.sensitive_columns
+        ]
+    }
+
+
+def _run_mcode(analyzer: MCodePatternAnalyzer) -> Dict[str, Any]:
+    patterns = analyzer.analyze()
+    # Round-trip drops defaultdicts so the result pickles and serializes plainly
+    return {'partitions': len(analyzer.partitions), 'patterns': json.loads(json.dumps(patterns))}
+
+
+def _run_folding(partitions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    breaking = maybe = 0
+    flagged = []
+    for partition in partitions:
+        validator = QueryFoldingValidator(partition['m_code'])
+        issues = validator.validate()
+        if not issues:
+            continue
+        partition_breaking = sum(1 for i in issues if i.severity == 'breaks_folding')
+        breaking += partition_breaking
+        maybe += len(issues) - partition_breaking
+        flagged.append({
+            'partition': partition['name'],
+            'file': partition['file'],
+            'breaks_folding': partition_breaking,
+            'may_break_folding': len(issues) - partition_breaking,
+            'first_break_line': validator.folding_broken_at,
+            'impact': validator.estimate_impact(),
+            'operations': sorted({i.operation for i in issues})
+        })
+    return {
+        'partitions_checked': len(partitions),
+        'breaks_folding': breaking,
+        'may_break_folding': maybe,
+        'partitions_breaking_folding': sum(1 for p in flagged if p['breaks_folding']),
+        'partitions': flagged
+    }
+
+
+def _ignore_interrupt() -> None:
+    """Worker initializer: Ctrl+C is handled by the parent, which stops scheduling work."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def scan_project(project_path: str, analyses: List[str], rules_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the selected analyses on one project (worker entry point).
+
+    The tools print progress to stdout; that output is discarded here. A
+    failing analysis is recorded under 'errors' without stopping the others.
+    """
+    started = time.perf_counter()
+    project = Path(project_path)
+    result: Dict[str, Any] = {'project': project_path, 'status': 'ok', 'errors': {}}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if 'sensitive' in analyses:
+            try:
+                result['sensitive'] = _run_sensitive(project, rules_path)
+            except Exception as e:
+                result['errors']['sensitive'] = f"{type(e).__name__}: {e}"
+
+        if 'mcode' in analyses or 'folding' in analyses:
+            try:
+                analyzer = MCodePatternAnalyzer(str(project))
+                if 'mcode' in analyses:
+                    result['mcode'] = _run_mcode(analyzer)
+                else:
+                    analyzer.extract_partitions()
+                if 'folding' in analyses:
+                    result['folding'] = _run_folding(analyzer.partitions)
+            except Exception as e:
+                for analysis in ('mcode', 'folding'):
+                    if analysis in analyses and analysis not in result:
+                        result['errors'][analysis] = f"{type(e).__name__}: {e}"
+
+    if result['errors']:
+        ran = [a for a in analyses if a in result]
+        result['status'] = 'partial' if ran else 'failed'
+    result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+_decoder = json.JSONDecoder()
+
+
+def _record_head(line: str) -> Optional[tuple]:
+    """
+    (project, status) of a checkpoint line without decoding the whole record.
+
+    Records are written with 'project' and 'status' as their first two keys,
+    so only those two strings are decoded; a line cut short by an interrupted
+    run returns None.
+    """
+    try:
+        if not line.endswith('\n'):
+            return None
+        values = []
+        end = 0
+        for _ in range(2):
+            start = line.index(':', end) + 1
+            while line[start] == ' ':
+                start += 1
+            value, end = _decoder.raw_decode(line, start)
+            values.append(value)
+        return tuple(values)
+    except ValueError:
+        return None
+
+
+def repair_checkpoint(checkpoint: Path) -> None:
+    """Drop a partial last line left by an interrupted run, so appends start on a fresh line."""
+    if not checkpoint.exists():
+        return
+    with open(checkpoint, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            f.truncate(position)
+
+
+def read_checkpoint(checkpoint: Path) -> Dict[str, str]:
+    """Return {project: status} from the last record of each project in a checkpoint."""
+    statuses = {}
+    if not checkpoint.exists():
+        return statuses
+    with open(checkpoint, 'r', encoding='utf-8') as f:
+        for line in f:
+            head = _record_head(line)
+            if head:
+                statuses[head[0]] = head[1]
+    return statuses
+
+
+def iter_final_records(checkpoint: Path, projects: List[str]) -> Iterator[tuple]:
+    """Stream (raw line, record) for the last checkpoint record of each listed project."""
+    wanted = set(projects)
+    last_line = {}
+    with open(checkpoint, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f):
+            head = _record_head(line)
+            if head and head[0] in wanted:
+                last_line[head[0]] = number
+    keep = set(last_line.values())
+    with open(checkpoint, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f):
+            if number in keep:
+                yield line.rstrip('\n'), json.loads(line)
+
+
+def csv_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    sensitive = record.get('sensitive', {})
+    folding = record.get('folding', {})
+    return {
+        'project': record['project'],
+        'status': record['status'],
+        'elapsed_ms': record.get('elapsed_ms'),
+        'tables': sensitive.get('tables_scanned', ''),
+        'columns': sensitive.get('columns_scanned', ''),
+        'sensitive_high': sensitive.get('high', ''),
+        'sensitive_medium': sensitive.get('medium', ''),
+        'sensitive_low': sensitive.get('low', ''),
+        'partitions': record.get('mcode', {}).get('partitions', folding.get('partitions_checked', '')),
+        'folding_breaking': folding.get('breaks_folding', ''),
+        'folding_maybe': folding.get('may_break_folding', ''),
+        'partitions_breaking_folding': folding.get('partitions_breaking_folding', ''),
+        'errors': '; '.join(f"{k}: {v}" for k, v in record.get('errors', {}).items())
+    }
+
+
+class PortfolioScanner:
+    """Discovers projects under a root and scans them in a process pool with checkpointing."""
+
+    def __init__(self, root: str, output: str = 'portfolio_report.json', csv_path: Optional[str] = None,
+                 checkpoint: Optional[str] = None, resume: bool = False, workers: Optional[int] = None,
+                 analyses: Optional[List[str]] = None, rules_path: Optional[str] = None):
+        self.root = Path(root)
+        self.output = Path(output)
+        self.csv_path = Path(csv_path) if csv_path else None
+        self.checkpoint = Path(checkpoint) if checkpoint else self.output.with_suffix('.checkpoint.jsonl')
+        self.resume = resume
+        self.workers = workers or os.cpu_count() or 1
+        self.analyses = list(analyses or ANALYSES)
+        self.rules_path = rules_path
+
+    def run(self, progress=None) -> PortfolioSummary:
+        started = time.perf_counter()
+        projects = [str(p) for p in discover_projects(self.root)]
+
+        done = {}
+        if self.resume:
+            repair_checkpoint(self.checkpoint)
+            done = {p: s for p, s in read_checkpoint(self.checkpoint).items() if s != 'failed'}
+        elif self.checkpoint.exists():
+            self.checkpoint.unlink()
+        pending = [p for p in projects if p not in done]
+
+        summary = PortfolioSummary(
+            root=str(self.root),
+            projects_found=len(projects),
+            projects_scanned=0,
+            projects_resumed=len(projects) - len(pending),
+            projects_failed=0,
+            output=str(self.output),
+            csv=str(self.csv_path) if self.csv_path else None,
+            checkpoint=str(self.checkpoint)
+        )
+
+        if pending:
+            self._scan(pending, summary, progress)
+
+        if projects:
+            self._write_reports(projects, summary)
+        summary.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return summary
+
+    def _scan(self, pending: List[str], summary: PortfolioSummary, progress) -> None:
+        """Fan projects out to the pool, keeping at most 2x workers in flight."""
+        queue = iter(pending)
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_interrupt)
+        try:
+            with open(self.checkpoint, 'a', encoding='utf-8') as checkpoint:
+                in_flight = {}
+
+                def submit_next() -> None:
+                    project = next(queue, None)
+                    if project is not None:
+                        future = executor.submit(scan_project, project, self.analyses, self.rules_path)
+                        in_flight[future] = project
+
+                for _ in range(self.workers * 2):
+                    submit_next()
+
+                while in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        project = in_flight.pop(future)
+                        try:
+                            record = future.result()
+                        except Exception as e:
+                            # Worker crashed (e.g. killed); the next --resume retries it
+                            record = {'project': project, 'status': 'failed',
+                                      'errors': {'worker': f"{type(e).__name__}: {e}"}, 'elapsed_ms': None}
+                        checkpoint.write(json.dumps(record, ensure_ascii=False) + '\n')
+                        checkpoint.flush()
+                        summary.projects_scanned += 1
+                        if progress:
+                            progress(summary.projects_scanned, len(pending), record)
+                        submit_next()
+        except KeyboardInterrupt:
+            # Completed projects are already checkpointed; drop queued work and let
+            # the projects in flight finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+    def _write_reports(self, projects: List[str], summary: PortfolioSummary) -> None:
+        """Assemble JSON (and CSV) from the checkpoint one record at a time."""
+        csv_file = open(self.csv_path, 'w', encoding='utf-8', newline='') if self.csv_path else None
+        try:
+            writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS) if csv_file else None
+            if writer:
+                writer.writeheader()
+
+            with open(self.output, 'w', encoding='utf-8') as out:
+                out.write('{\n  "root": ' + json.dumps(str(self.root), ensure_ascii=False))
+                out.write(',\n  "analyses": ' + json.dumps(self.analyses))
+                out.write(',\n  "projects": [')
+                first = True
+                for line, record in iter_final_records(self.checkpoint, projects):
+                    # Checkpoint lines are already compact JSON records
+                    out.write(('\n    ' if first else ',\n    ') + line)
+                    first = False
+                    if writer:
+                        writer.writerow(csv_row(record))
+                    summary.sensitive_high += record.get('sensitive', {}).get('high', 0)
+                    summary.folding_breaking += record.get('folding', {}).get('breaks_folding', 0)
+                    if record['status'] != 'ok':
+                        summary.failures.append({'project': record['project'], 'status': record['status'],
+                                                 'errors': '; '.join(dict.fromkeys(record.get('errors', {}).values()))})
+                        if record['status'] == 'failed':
+                            summary.projects_failed += 1
+                out.write('\n  ]\n}\n')
+        finally:
+            if csv_file:
+                csv_file.close()
+
+
+def format_summary(summary: PortfolioSummary) -> str:
+    """Generate formatted text summary."""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("POWER BI PORTFOLIO SCAN")
+    lines.append("=" * 80)
+    lines.append(f"Root: {summary.root}")
+    lines.append(f"Projects: {summary.projects_found} found | {summary.projects_scanned} scanned | "
+                 f"{summary.projects_resumed} resumed from checkpoint | {summary.elapsed_ms / 1000:.1f} s")
+    lines.append("")
+    lines.append(f"  High-confidence sensitive columns: {summary.sensitive_high}")
+    lines.append(f"  Query folding breaks: {summary.folding_breaking}")
+    lines.append("")
+
+    if summary.failures:
+        lines.append(f"⚠️ {len(summary.failures)} project(s) with errors:")
+        for failure in summary.failures[:20]:
+            lines.append(f"  {failure['project']} ({failure['status']}): {failure['errors']}")
+        if len(summary.failures) > 20:
+            lines.append(f"  ... and {len(summary.failures) - 20} more (see report)")
+        lines.append("")
+    else:
+        lines.append("✅ All projects scanned")
+        lines.append("")
+
+    lines.append(f"Report: {summary.output}")
+    if summary.csv:
+        lines.append(f"CSV: {summary.csv}")
+    lines.append(f"Checkpoint: {summary.checkpoint}")
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scan every PBIP project under a folder for sensitive columns, M patterns and query folding",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("root", help="Folder containing PBIP projects")
+    parser.add_argument("--output", default="portfolio_report.json", help="Consolidated JSON report")
+    parser.add_argument("--csv", dest="csv_path", help="One-row-per-project CSV summary")
+    parser.add_argument("--checkpoint", help="JSONL checkpoint (default: <output>.checkpoint.jsonl)")
+    parser.add_argument("--resume", action="store_true", help="Skip projects completed in the checkpoint")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--analyses", default=",".join(ANALYSES),
+                        help="Comma-separated subset of: " + ", ".join(ANALYSES))
+    parser.add_argument("--rules", help="Rules file for the sensitive column detector")
+    parser.add_argument("--json", action="store_true", help="Print the run summary as JSON")
+
+    args = parser.parse_args()
+
+    analyses = [a.strip() for a in args.analyses.split(",") if a.strip()]
+    unknown = [a for a in analyses if a not in ANALYSES]
+    if unknown or not analyses:
+        parser.error(f"--analyses must be a subset of: {', '.join(ANALYSES)}")
+
+    if not Path(args.root).is_dir():
+        print(f"Error: Folder not found: {args.root}", file=sys.stderr)
+        sys.exit(2)
+
+    def progress(done: int, total: int, record: Dict[str, Any]) -> None:
+        icon = "✅" if record['status'] == 'ok' else "⚠️" if record['status'] == 'partial' else "❌"
+        print(f"[{done}/{total}] {icon} {record['project']}")
+
+    scanner = PortfolioScanner(args.root, args.output, args.csv_path, args.checkpoint, args.resume,
+                               args.workers, analyses, args.rules)
+    try:
+        summary = scanner.run(progress=None if args.json else progress)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted - completed projects are saved in {scanner.checkpoint}; "
+              f"re-run with --resume to continue", file=sys.stderr)
+        sys.exit(1)
+
+    if summary.projects_found == 0:
+        print(f"Error: No PBIP projects (.SemanticModel folders) found under {args.root}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(asdict(summary), indent=2, ensure_ascii=False))
+    else:
+        print(format_summary(summary))
+
+    sys.exit(1 if summary.projects_failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Report Documenter
+
+Generates page-by-page documentation of a Power BI Report (PBIR): every page in
+pages.json order with its filters and visual interactions, and every visual with
+its title, textbox content, layout, data fields by role and visual-level filters.
+
+Replaces the ad-hoc archive/adhoc/document_all_visuals*.py scripts, which had
+hardcoded page lists and report paths.
+
+Output is streamed: each page is parsed (visuals in parallel), written and then
+released before the next page is read, so memory stays bounded on 100+ page
+reports.
+
+Usage:
+    python report_documenter.py <report_path> [--format markdown|json] [--output <file>]
+
+Arguments:
+    report_path           Path to .Report folder, its definition/ folder, or a
+                          project folder containing exactly one *.Report
+
+Options:
+    --format <fmt>        markdown (default) or json
+    --output <file>       Write to file instead of stdout
+    --pages <ids>         Comma-separated page IDs or display names to document
+    --workers <n>         Parallel visual readers (default: Python's default)
+
+Exit Codes:
+    0 - Documentation generated
+    1 - Generated, but some files could not be parsed (listed in the output)
+    2 - Report not found
+
+Examples:
+    python report_documenter.py "C:\\Projects\\Sales\\Sales.Report" --output visual_inventory.md
+    python report_documenter.py "C:\\Projects\\Sales" --format json --output inventory.json
+    python report_documenter.py "Sales.Report" --pages "Overview,Rep View"
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from pbir_field_index import extract_references, iter_field_nodes
+
+# Force UTF-8 encoding for stdout on Windows to handle non-ASCII report text
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+STATIC_VISUAL_TYPES = {'textbox', 'shape', 'image', 'actionButton', 'basicShape'}
+TEXT_PREVIEW_CHARS = 300
+
+
+@dataclass
+class VisualDoc:
+    """Documentation for one visual container"""
+    name: str
+    visual_type: str
+    title: str = ""
+    text_content: str = ""
+    x: float = 0
+    y: float = 0
+    width: float = 0
+    height: float = 0
+    z: float = 0
+    tab_order: Optional[float] = None
+    hidden: bool = False
+    parent_group: Optional[str] = None
+    fields: Dict[str, List[str]] = field(default_factory=dict)
+    formatting_fields: List[str] = field(default_factory=list)
+    filters: List[Dict[str, Any]] = field(default_factory=list)
+    file_path: str = ""
+    error: Optional[str] = None
+
+    @property
+    def display_name(self) -> str:
+        return self.title or f"({self.visual_type})"
+
+
+@dataclass
+class PageDoc:
+    """Documentation for one report page"""
+    page_id: str
+    display_name: str
+    ordinal: int
+    width: float = 1280
+    height: float = 720
+    hidden: bool = False
+    filters: List[Dict[str, Any]] = field(default_factory=list)
+    interactions: List[Dict[str, str]] = field(default_factory=list)
+    visuals: List[VisualDoc] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+# ---------------------------------------------------------------------------
+# Extraction helpers
+# ---------------------------------------------------------------------------
+
+def _literal_text(expr_holder: Any) -> str:
+    """Return the text of {"expr": {"Literal": {"Value": "'...'"}}}, unquoted."""
+    try:
+        value = expr_holder["expr"]["Literal"]["Value"]
+    except (KeyError, TypeError):
+        return ""
+    if isinstance(value, str) and len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    return str(value)
+
+
+def extract_title(visual: Dict) -> str:
+    """Title from visualContainerObjects.title (literal text only)."""
+    for entry in visual.get("visualContainerObjects", {}).get("title", []) or []:
+        text = _literal_text(entry.get("properties", {}).get("text"))
+        if text:
+            return text
+    return ""
+
+
+def extract_textbox_content(visual: Dict) -> str:
+    """Text of a textbox: objects.general[].properties.paragraphs[].textRuns[].value"""
+    paragraphs_text = []
+    for entry in visual.get("objects", {}).get("general", []) or []:
+        for paragraph in entry.get("properties", {}).get("paragraphs", []) or []:
+            runs = [run.get("value", "") for run in paragraph.get("textRuns", []) or [] if isinstance(run, dict)]
+            paragraphs_text.append("".join(runs))
+    return "\n".join(p for p in paragraphs_text if p).strip()
+
+
+def field_label(kind: str, entity: str, prop: str) -> str:
+    """DAX-style label: 'Table'[Field] for columns/levels, [Measure] for measures."""
+    table = f"'{entity}'" if entity and not entity.replace("_", "").isalnum() else entity
+    if kind == "Measure":
+        return f"{table}[{prop}] (measure)"
+    if kind == "HierarchyLevel":
+        return f"{table}[{prop}] (hierarchy level)"
+    if kind == "Aggregation":
+        return f"{table}[{prop}] (aggregated)"
+    return f"{table}[{prop}]"
+
+
+def extract_filters(filter_config: Any) -> List[Dict[str, Any]]:
+    """Summarize a filterConfig: field, filter type and view-mode flags."""
+    filters = []
+    if not isinstance(filter_config, dict):
+        return filters
+    for flt in filter_config.get("filters", []) or []:
+        if not isinstance(flt, dict):
+            continue
+        labels = [field_label(kind, entity, prop)
+                  for _, _, kind, entity, prop in iter_field_nodes(flt.get("field", {}))]
+        filters.append({
+            "name": flt.get("name", ""),
+            "field": labels[0] if labels else "",
+            "type": flt.get("type", ""),
+            "has_condition": bool((flt.get("filter") or {}).get("Where")),
+            "hidden": bool(flt.get("isHiddenInViewMode", False)),
+            "locked": bool(flt.get("isLockedInViewMode", False))
+        })
+    return filters
+
+
+def document_visual(visual_json_path: Path, rel_path: str) -> VisualDoc:
+    """Parse one visual.json into a VisualDoc (errors are captured, not raised)."""
+    try:
+        with open(visual_json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return VisualDoc(name=visual_json_path.parent.name, visual_type="unknown",
+                         file_path=rel_path, error=str(e))
+
+    position = data.get("position", {})
+    visual = data.get("visual") or {}
+    group = data.get("visualGroup") or {}
+    visual_type = visual.get("visualType") or ("group" if group else "unknown")
+
+    doc = VisualDoc(
+        name=data.get("name", visual_json_path.parent.name),
+        visual_type=visual_type,
+        title=extract_title(visual) or group.get("displayName", ""),
+        x=position.get("x", 0),
+        y=position.get("y", 0),
+        width=position.get("width", 0),
+        height=position.get("height", 0),
+        z=position.get("z", 0),
+        tab_order=position.get("tabOrder"),
+        hidden=bool(data.get("isHidden", False)),
+        parent_group=data.get("parentGroupName"),
+        filters=extract_filters(data.get("filterConfig")),
+        file_path=rel_path
+    )
+
+    if visual_type == "textbox":
+        doc.text_content = extract_textbox_content(visual)
+
+    formatting = set()
+    for ref in extract_references(data, rel_path):
+        if ref.role == "filter":
+            continue
+        label = field_label(ref.kind, ref.entity, ref.property)
+        if ref.role.startswith(("objects.", "visualContainerObjects.")):
+            formatting.add(label)
+        elif ref.role != "sort":
+            role_fields = doc.fields.setdefault(ref.role, [])
+            if label not in role_fields:
+                role_fields.append(label)
+    doc.formatting_fields = sorted(formatting)
+    return doc
+
+
+def _visual_sort_key(visual: VisualDoc):
+    tab = visual.tab_order if isinstance(visual.tab_order, (int, float)) else float("inf")
+    return (tab, visual.y, visual.x)
+
+
+# ---------------------------------------------------------------------------
+# Report traversal
+# ---------------------------------------------------------------------------
+
+def resolve_report_definition(path: Path) -> Path:
+    """Accept a .Report folder, its definition/ folder, or a project folder."""
+    if (path / "definition" / "pages").is_dir():
+        return path / "definition"
+    if path.name == "definition" and (path / "pages").is_dir():
+        return path
+    reports = sorted(p for p in path.glob("*.Report") if (p / "definition").is_dir())
+    if len(reports) == 1:
+        return reports[0] / "definition"
+    if len(reports) > 1:
+        raise FileNotFoundError(f"Multiple .Report folders in {path}; pass one explicitly")
+    raise FileNotFoundError(f"PBIR report definition not found under: {path}")
+
+
+def page_order(pages_path: Path) -> List[str]:
+    """Page IDs in pages.json pageOrder, followed by any unlisted page folders."""
+    folders = sorted(p.name for p in pages_path.iterdir() if p.is_dir())
+    order = []
+    pages_json = pages_path / "pages.json"
+    if pages_json.is_file():
+        try:
+            with open(pages_json, 'r', encoding='utf-8') as f:
+                order = json.load(f).get("pageOrder", []) or []
+        except (OSError, json.JSONDecodeError):
+            order = []
+    existing = set(folders)
+    order = [p for p in order if p in existing]
+    listed = set(order)
+    return order + [p for p in folders if p not in listed]
+
+
+def _load_page_json(page_dir: Path) -> Dict:
+    page_json = page_dir / "page.json"
+    with open(page_json, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_page_docs(definition_path: Path, pool: ThreadPoolExecutor,
+                   only_pages: Optional[List[str]] = None) -> Iterator[PageDoc]:
+    """
+    Yield one fully documented page at a time, in report order.
+
+    Visuals of a page are parsed concurrently on the pool; the next page's files
+    are not touched until the caller has consumed the current page.
+    """
+    pages_path = definition_path / "pages"
+    wanted = {p.casefold() for p in only_pages} if only_pages else None
+
+    for ordinal, page_id in enumerate(page_order(pages_path), 1):
+        page_dir = pages_path / page_id
+        try:
+            page_data = _load_page_json(page_dir)
+            error = None
+        except (OSError, json.JSONDecodeError) as e:
+            page_data, error = {}, str(e)
+
+        display_name = page_data.get("displayName", page_id)
+        if wanted and page_id.casefold() not in wanted and display_name.casefold() not in wanted:
+            continue
+
+        page = PageDoc(
+            page_id=page_id,
+            display_name=display_name,
+            ordinal=ordinal,
+            width=page_data.get("width", 1280),
+            height=page_data.get("height", 720),
+            hidden=page_data.get("visibility") == "HiddenInViewMode",
+            filters=extract_filters(page_data.get("filterConfig")),
+            error=error
+        )
+
+        visuals_dir = page_dir / "visuals"
+        visual_files = sorted(visuals_dir.glob("*/visual.json")) if visuals_dir.is_dir() else []
+        page.visuals = sorted(
+            pool.map(lambda p: document_visual(p, p.relative_to(definition_path).as_posix()), visual_files),
+            key=_visual_sort_key
+        )
+
+        names = {v.name: v.display_name for v in page.visuals}
+        for interaction in page_data.get("visualInteractions", []) or []:
+            page.interactions.append({
+                "source": names.get(interaction.get("source"), interaction.get("source", "")),
+                "target": names.get(interaction.get("target"), interaction.get("target", "")),
+                "type": interaction.get("type", "")
+            })
+
+        yield page
+
+
+def load_report_info(definition_path: Path) -> Dict[str, Any]:
+    """Report-level facts: name, report filters, bookmarks."""
+    report_folder = definition_path.parent
+    info = {
+        "report_name": report_folder.name[:-len(".Report")] if report_folder.name.endswith(".Report") else report_folder.name,
+        "report_path": str(report_folder),
+        "filters": [],
+        "bookmarks": []
+    }
+    report_json = definition_path / "report.json"
+    if report_json.is_file():
+        try:
+            with open(report_json, 'r', encoding='utf-8') as f:
+                info["filters"] = extract_filters(json.load(f).get("filterConfig"))
+        except (OSError, json.JSONDecodeError):
+            pass
+    bookmarks_dir = definition_path / "bookmarks"
+    if bookmarks_dir.is_dir():
+        for bookmark_file in sorted(bookmarks_dir.glob("*.bookmark.json")):
+            try:
+                with open(bookmark_file, 'r', encoding='utf-8') as f:
+                    bookmark = json.load(f)
+                info["bookmarks"].append(bookmark.get("displayName", bookmark_file.stem))
+            except (OSError, json.JSONDecodeError):
+                continue
+    return info
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+class DocumentationStats:
+    """Running totals accumulated while pages stream through."""
+
+    def __init__(self):
+        self.pages = 0
+        self.visuals = 0
+        self.data_bound = 0
+        self.visual_types: Counter = Counter()
+        self.fields = set()
+        self.errors: List[str] = []
+
+    def add_page(self, page: PageDoc) -> None:
+        self.pages += 1
+        if page.error:
+            self.errors.append(f"{page.page_id}/page.json: {page.error}")
+        for visual in page.visuals:
+            self.visuals += 1
+            self.visual_types[visual.visual_type] += 1
+            if visual.fields:
+                self.data_bound += 1
+            for labels in visual.fields.values():
+                self.fields.update(labels)
+            if visual.error:
+                self.errors.append(f"{visual.file_path}: {visual.error}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "visuals": self.visuals,
+            "data_bound_visuals": self.data_bound,
+            "unique_fields": len(self.fields),
+            "visual_types": dict(self.visual_types.most_common()),
+            "errors": self.errors
+        }
+
+
+def _md_filters(lines: List[str], title: str, filters: List[Dict[str, Any]]) -> None:
+    if not filters:
+        return
+    lines.append(f"**{title}**:")
+    for flt in filters:
+        flags = [flag for flag, on in (("condition set", flt["has_condition"]), ("hidden", flt["hidden"]),
+                                       ("locked", flt["locked"])) if on]
+        suffix = f" ({', '.join(flags)})" if flags else ""
+        lines.append(f"- `{flt['field'] or flt['name']}` {flt['type']}{suffix}".rstrip())
+    lines.append("")
+
+
+def render_page_markdown(page: PageDoc) -> str:
+    lines = []
+    data_bound = sum(1 for v in page.visuals if v.fields)
+    lines.append(f"## Page {page.ordinal}: {page.display_name}")
+    lines.append("")
+    lines.append(f"**Page ID**: `{page.page_id}`  ")
+    lines.append(f"**Canvas**: {page.width:g} × {page.height:g}" + ("  \n**Visibility**: Hidden" if page.hidden else "  "))
+    lines.append(f"**Total Visuals**: {len(page.visuals)} ({data_bound} data-bound)")
+    lines.append("")
+    if page.error:
+        lines.append(f"> page.json could not be parsed: {page.error}")
+        lines.append("")
+    _md_filters(lines, "Page Filters", page.filters)
+
+    if not page.visuals:
+        lines.append("*No visuals found on this page.*")
+        lines.append("")
+
+    for idx, visual in enumerate(page.visuals, 1):
+        lines.append(f"### Visual {idx}: {visual.display_name}")
+        lines.append("")
+        if visual.error:
+            lines.append(f"> Could not parse `{visual.file_path}`: {visual.error}")
+            lines.append("")
+            continue
+        lines.append(f"**Visual Type**: `{visual.visual_type}`  ")
+        lines.append(f"**File Path**: `{visual.file_path}`  ")
+        lines.append(f"**Layout**: ({visual.x:g}, {visual.y:g}), {visual.width:g} × {visual.height:g}, "
+                     f"z {visual.z:g}" + (f", tab {visual.tab_order:g}" if visual.tab_order is not None else ""))
+        extras = []
+        if visual.hidden:
+            extras.append("hidden")
+        if visual.parent_group:
+            extras.append(f"group `{visual.parent_group}`")
+        if extras:
+            lines.append(f"**Notes**: {', '.join(extras)}")
+        lines.append("")
+
+        if visual.text_content:
+            preview = visual.text_content.replace("\n", " / ")
+            if len(preview) > TEXT_PREVIEW_CHARS:
+                preview = preview[:TEXT_PREVIEW_CHARS] + "..."
+            lines.append(f"**Content**: {preview}")
+            lines.append("")
+
+        if visual.fields:
+            lines.append("**Data Bindings**:")
+            for role, labels in visual.fields.items():
+                lines.append(f"- **{role}**: {', '.join(f'`{label}`' for label in labels)}")
+            lines.append("")
+        elif visual.visual_type not in STATIC_VISUAL_TYPES and visual.visual_type != "group":
+            lines.append("**Data Bindings**: *(No fields detected)*")
+            lines.append("")
+
+        if visual.formatting_fields:
+            lines.append(f"**Conditional Formatting Fields**: {', '.join(f'`{f}`' for f in visual.formatting_fields)}")
+            lines.append("")
+        _md_filters(lines, "Visual Filters", visual.filters)
+
+    non_default = [i for i in page.interactions if i["type"] != "Default"]
+    if non_default:
+        lines.append("### Visual Interactions")
+        lines.append("")
+        lines.append("| Source | Target | Interaction |")
+        lines.append("|--------|--------|-------------|")
+        for interaction in non_default:
+            lines.append(f"| {interaction['source']} | {interaction['target']} | {interaction['type']} |")
+        lines.append("")
+
+    lines.append("---")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_markdown(out: TextIO, info: Dict[str, Any], pages: Iterator[PageDoc], stats: DocumentationStats) -> None:
+    out.write(f"# Report Documentation: {info['report_name']}\n\n")
+    out.write(f"**Report Path**: `{info['report_path']}`\n\n")
+    header = []
+    _md_filters(header, "Report Filters", info["filters"])
+    if info["bookmarks"]:
+        header.append(f"**Bookmarks** ({len(info['bookmarks'])}): {', '.join(info['bookmarks'])}")
+        header.append("")
+    if header:
+        out.write("\n".join(header) + "\n")
+    out.write("---\n\n")
+
+    for page in pages:
+        stats.add_page(page)
+        out.write(render_page_markdown(page))
+        out.flush()
+
+    summary = stats.to_dict()
+    out.write("## Summary\n\n")
+    out.write(f"- **Pages**: {summary['pages']}\n")
+    out.write(f"- **Visuals**: {summary['visuals']} ({summary['data_bound_visuals']} data-bound)\n")
+    out.write(f"- **Unique fields referenced**: {summary['unique_fields']}\n")
+    if summary["visual_types"]:
+        out.write("- **Visual types**: " + ", ".join(f"{t} ({n})" for t, n in summary["visual_types"].items()) + "\n")
+    if summary["errors"]:
+        out.write("\n**Files that could not be parsed**:\n")
+        for error in summary["errors"]:
+            out.write(f"- {error}\n")
+
+
+def write_json(out: TextIO, info: Dict[str, Any], pages: Iterator[PageDoc], stats: DocumentationStats) -> None:
+    """Stream one JSON document; pages are serialized as soon as they are parsed."""
+    out.write("{\n")
+    for key in ("report_name", "report_path", "filters", "bookmarks"):
+        out.write(f"  {json.dumps(key)}: {json.dumps(info[key], ensure_ascii=False)},\n")
+    out.write('  "pages": [')
+    for i, page in enumerate(pages):
+        stats.add_page(page)
+        out.write(("," if i else "") + "\n    " + json.dumps(page.to_dict(), ensure_ascii=False))
+        out.flush()
+    out.write("\n  ],\n")
+    out.write(f'  "summary": {json.dumps(stats.to_dict(), ensure_ascii=False)}\n')
+    out.write("}\n")
+
+
+def document_report(report_path, out: TextIO, output_format: str = "markdown",
+                    only_pages: Optional[List[str]] = None, workers: Optional[int] = None) -> DocumentationStats:
+    """Document a report, streaming output page by page. Returns the run statistics."""
+    definition_path = resolve_report_definition(Path(report_path))
+    info = load_report_info(definition_path)
+    stats = DocumentationStats()
+    writer = write_json if output_format == "json" else write_markdown
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        writer(out, info, iter_page_docs(definition_path, pool, only_pages), stats)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate page-by-page documentation of a Power BI Report (PBIR)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("report_path", help="Path to .Report folder or project folder")
+    parser.add_argument("--format", choices=["markdown", "json"], default="markdown", help="Output format")
+    parser.add_argument("--output", help="Write to file instead of stdout")
+    parser.add_argument("--pages", help="Comma-separated page IDs or display names")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel visual readers")
+
+    args = parser.parse_args()
+    only_pages = [p.strip() for p in args.pages.split(",") if p.strip()] if args.pages else None
+
+    try:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                stats = document_report(args.report_path, out, args.format, only_pages, args.workers)
+            print(f"Documented {stats.pages} pages, {stats.visuals} visuals -> {args.output}")
+        else:
+            stats = document_report(args.report_path, sys.stdout, args.format, only_pages, args.workers)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    sys.exit(1 if stats.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
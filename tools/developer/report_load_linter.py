@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Report Load Linter
+
+Static estimate of how much work each Power BI Report (PBIR) page does when it
+renders, so slow pages can be identified from the definition files alone.
+
+Per-page metrics:
+    visuals              Visible visual containers (groups excluded)
+    estimated_queries    DAX queries issued on load: one per visible visual that
+                         binds model fields (data roles or field-bound formatting)
+    distinct_measures    Distinct measures referenced by the page's visuals
+    max_visual_measures  Most measures bound to a single visual
+    slicers              Slicer visuals (built-in and custom)
+    synced_slicers       Slicers participating in a sync group
+    sync_groups          Distinct sync groups used on the page
+    visual_filters       Visual-level filters across all visuals
+    custom_visuals       Visuals whose type is not a built-in Power BI visual
+    bookmarks            Bookmarks that target the page
+
+Each metric is compared with a budget; pages over budget are reported as
+"warning", and pages at or above twice the budget as "critical".
+
+The report is read in a single pass: every definition file is parsed once.
+
+Usage:
+    python report_load_linter.py <report_path> [--budget name=value ...] [--budgets <file.json>] [--json]
+
+Arguments:
+    report_path           Path to .Report folder (or its definition/ folder)
+
+Options:
+    --budget name=value   Override one budget (repeatable), e.g. --budget visuals=20
+    --budgets <file>      JSON object of budget overrides
+    --json                Output results as JSON
+
+Default budgets:
+    visuals=20  estimated_queries=15  distinct_measures=30  max_visual_measures=10
+    slicers=6  synced_slicers=4  sync_groups=4  visual_filters=20
+    custom_visuals=3  bookmarks=15
+
+Exit Codes:
+    0 - All pages within budget
+    1 - One or more pages over budget
+    2 - Report not found or invalid budget
+
+Examples:
+    python report_load_linter.py "Sales.Report"
+    python report_load_linter.py "Sales.Report" --budget visuals=15 --budget slicers=4 --json
+"""
+
+import sys
+import json
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass, field, asdict, fields as dataclass_fields
+from typing import Any, Dict, List, Optional, Set
+
+from pbir_field_index import resolve_definition_path, iter_definition_files, iter_field_nodes
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# Built-in visual types (anything else is treated as a custom visual)
+BUILTIN_VISUAL_TYPES = {
+    'actionButton', 'advancedSlicerVisual', 'areaChart', 'barChart', 'basicShape', 'bookmarkNavigator',
+    'card', 'cardVisual', 'clusteredBarChart', 'clusteredColumnChart', 'columnChart', 'decompositionTreeVisual',
+    'donutChart', 'filledMap', 'funnel', 'gauge', 'hundredPercentStackedAreaChart',
+    'hundredPercentStackedBarChart', 'hundredPercentStackedColumnChart', 'image', 'keyDriversVisual', 'kpi',
+    'lineChart', 'lineClusteredColumnComboChart', 'lineStackedColumnComboChart', 'listSlicer', 'map',
+    'multiRowCard', 'pageNavigator', 'pieChart', 'pivotTable', 'qnaVisual', 'ribbonChart', 'scatterChart',
+    'scriptVisual', 'pythonVisual', 'shape', 'shapeMap', 'slicer', 'stackedAreaChart', 'tableEx', 'textbox',
+    'textSlicer', 'treemap', 'waterfallChart', 'azureMap', 'aiNarratives', 'scorecard', 'rdlVisual'
+}
+SLICER_VISUAL_TYPES = {'slicer', 'advancedSlicerVisual', 'listSlicer', 'textSlicer'}
+# Built-in visuals that never query the model on their own
+STATIC_VISUAL_TYPES = {'actionButton', 'basicShape', 'bookmarkNavigator', 'image', 'pageNavigator', 'shape', 'textbox'}
+
+
+@dataclass
+class LoadBudgets:
+    """Per-page thresholds; a metric above its budget is reported."""
+    visuals: int = 20
+    estimated_queries: int = 15
+    distinct_measures: int = 30
+    max_visual_measures: int = 10
+    slicers: int = 6
+    synced_slicers: int = 4
+    sync_groups: int = 4
+    visual_filters: int = 20
+    custom_visuals: int = 3
+    bookmarks: int = 15
+
+    def update(self, overrides: Dict[str, Any]) -> None:
+        known = {f.name for f in dataclass_fields(self)}
+        for name, value in overrides.items():
+            if name not in known:
+                raise ValueError(f"Unknown budget '{name}'. Valid budgets: {', '.join(sorted(known))}")
+            setattr(self, name, int(value))
+
+
+@dataclass
+class PageLoadMetrics:
+    """Load metrics for one page"""
+    page_id: str
+    display_name: str
+    visuals: int = 0
+    hidden_visuals: int = 0
+    estimated_queries: int = 0
+    distinct_measures: int = 0
+    max_visual_measures: int = 0
+    slicers: int = 0
+    synced_slicers: int = 0
+    sync_groups: int = 0
+    visual_filters: int = 0
+    custom_visuals: int = 0
+    bookmarks: int = 0
+    custom_visual_types: List[str] = field(default_factory=list)
+    heaviest_visuals: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class LoadFinding:
+    """A page metric over its budget"""
+    page_id: str
+    display_name: str
+    metric: str
+    value: int
+    budget: int
+    severity: str
+    message: str
+
+
+class _PageAccumulator:
+    """Running counters for one page while files stream through."""
+
+    def __init__(self, page_id: str):
+        self.page_id = page_id
+        self.display_name = page_id
+        self.metrics = PageLoadMetrics(page_id, page_id)
+        self.measures: Set[str] = set()
+        self.sync_groups: Set[str] = set()
+        self.custom_types: Set[str] = set()
+        self.visual_weights: List[Dict[str, Any]] = []
+
+
+class ReportLoadLinter:
+    """Single-pass load analysis over a PBIR definition folder."""
+
+    def __init__(self, report_path, budgets: Optional[LoadBudgets] = None):
+        self.definition_path = resolve_definition_path(report_path)
+        self.budgets = budgets or LoadBudgets()
+        self.pages: Dict[str, _PageAccumulator] = {}
+        self.declared_custom_visuals: Set[str] = set()
+        self.bookmark_pages: Dict[str, int] = defaultdict(int)
+        self.errors: List[str] = []
+
+    def _page(self, page_id: str) -> _PageAccumulator:
+        if page_id not in self.pages:
+            self.pages[page_id] = _PageAccumulator(page_id)
+        return self.pages[page_id]
+
+    def run(self) -> Dict[str, Any]:
+        # iter_definition_files yields report.json first, so declared custom visuals
+        # are known before any visual is classified
+        for rel_path, _ in iter_definition_files(self.definition_path):
+            try:
+                with open(self.definition_path / rel_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                self.errors.append(f"{rel_path}: {e}")
+                continue
+
+            parts = rel_path.split("/")
+            if rel_path == "report.json":
+                self._read_report(data)
+            elif parts[0] == "bookmarks":
+                state = data.get("explorationState") or {}
+                # Target page is activeSection; older bookmarks only carry their captured sections
+                targets = [state["activeSection"]] if state.get("activeSection") else list(state.get("sections") or {})
+                for section in targets:
+                    self.bookmark_pages[section] += 1
+            elif len(parts) == 3:
+                self._page(parts[1]).display_name = data.get("displayName", parts[1])
+            else:
+                self._add_visual(self._page(parts[1]), self._summarize_visual(data))
+
+        metrics = [self._finish_page(acc) for acc in self._ordered_pages()]
+        findings = [finding for m in metrics for finding in self._check_budgets(m)]
+
+        return {
+            "report_path": str(self.definition_path.parent),
+            "budgets": asdict(self.budgets),
+            "page_count": len(metrics),
+            "pages_over_budget": len({f.page_id for f in findings}),
+            "findings": [asdict(f) for f in findings],
+            "pages": [asdict(m) for m in metrics],
+            "errors": self.errors
+        }
+
+    def _read_report(self, data: Dict) -> None:
+        self.declared_custom_visuals.update(data.get("publicCustomVisuals", []) or [])
+        for package in data.get("resourcePackages", []) or []:
+            if isinstance(package, dict) and package.get("type") == "CustomVisual":
+                self.declared_custom_visuals.add(package.get("name", ""))
+
+    @staticmethod
+    def _summarize_visual(data: Dict) -> Dict[str, Any]:
+        visual = data.get("visual")
+        if not isinstance(visual, dict):
+            return {"kind": "group"}
+
+        measures = set()
+        bound_fields = 0
+        for _, _, kind, entity, prop in iter_field_nodes(visual):
+            bound_fields += 1
+            if kind == "Measure":
+                measures.add(f"{entity}\x1f{prop}".casefold())
+
+        filters = (data.get("filterConfig") or {}).get("filters", []) or []
+        sync_group = (visual.get("syncGroup") or {}).get("groupName")
+        return {
+            "kind": "visual",
+            "name": data.get("name", ""),
+            "visual_type": visual.get("visualType", "unknown"),
+            "hidden": bool(data.get("isHidden", False)),
+            "measures": measures,
+            "bound_fields": bound_fields,
+            "filters": len(filters),
+            "sync_group": sync_group
+        }
+
+    def _add_visual(self, acc: _PageAccumulator, summary: Dict[str, Any]) -> None:
+        if summary["kind"] == "group":
+            return
+        m = acc.metrics
+        if summary["hidden"]:
+            m.hidden_visuals += 1
+            return
+
+        visual_type = summary["visual_type"]
+        is_custom = visual_type in self.declared_custom_visuals or visual_type not in BUILTIN_VISUAL_TYPES
+        is_slicer = visual_type in SLICER_VISUAL_TYPES or (is_custom and "slicer" in visual_type.lower())
+
+        m.visuals += 1
+        if summary["bound_fields"] and (visual_type not in STATIC_VISUAL_TYPES or summary["measures"]):
+            m.estimated_queries += 1
+        acc.measures.update(summary["measures"])
+        m.max_visual_measures = max(m.max_visual_measures, len(summary["measures"]))
+        m.visual_filters += summary["filters"]
+        if is_slicer:
+            m.slicers += 1
+            if summary["sync_group"]:
+                m.synced_slicers += 1
+                acc.sync_groups.add(summary["sync_group"])
+        if is_custom:
+            m.custom_visuals += 1
+            acc.custom_types.add(visual_type)
+        acc.visual_weights.append({
+            "visual": summary["name"],
+            "visual_type": visual_type,
+            "measures": len(summary["measures"]),
+            "fields": summary["bound_fields"],
+            "filters": summary["filters"]
+        })
+
+    def _ordered_pages(self) -> List[_PageAccumulator]:
+        order = []
+        pages_json = self.definition_path / "pages" / "pages.json"
+        if pages_json.is_file():
+            try:
+                with open(pages_json, 'r', encoding='utf-8') as f:
+                    order = [p for p in json.load(f).get("pageOrder", []) or [] if p in self.pages]
+            except (OSError, json.JSONDecodeError):
+                order = []
+        listed = set(order)
+        return [self.pages[p] for p in order] + [self.pages[p] for p in sorted(self.pages) if p not in listed]
+
+    def _finish_page(self, acc: _PageAccumulator) -> PageLoadMetrics:
+        m = acc.metrics
+        m.display_name = acc.display_name
+        m.distinct_measures = len(acc.measures)
+        m.sync_groups = len(acc.sync_groups)
+        m.bookmarks = self.bookmark_pages.get(acc.page_id, 0)
+        m.custom_visual_types = sorted(acc.custom_types)
+        m.heaviest_visuals = sorted(acc.visual_weights, key=lambda v: (-v["measures"], -v["fields"], v["visual"]))[:5]
+        return m
+
+    def _check_budgets(self, m: PageLoadMetrics) -> List[LoadFinding]:
+        findings = []
+        for budget_field in dataclass_fields(self.budgets):
+            name = budget_field.name
+            budget = getattr(self.budgets, name)
+            value = getattr(m, name)
+            if value <= budget:
+                continue
+            severity = "critical" if budget and value >= 2 * budget else "warning"
+            findings.append(LoadFinding(
+                page_id=m.page_id,
+                display_name=m.display_name,
+                metric=name,
+                value=value,
+                budget=budget,
+                severity=severity,
+                message=f"{name.replace('_', ' ')} {value} exceeds budget {budget}"
+            ))
+        return findings
+
+
+def lint_report(report_path, budgets: Optional[LoadBudgets] = None) -> Dict[str, Any]:
+    """Run the load linter and return a JSON-serializable result."""
+    return ReportLoadLinter(report_path, budgets).run()
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 100)
+    lines.append("REPORT LOAD LINT")
+    lines.append("=" * 100)
+    lines.append(f"Report: {result['report_path']}")
+    lines.append(f"Pages: {result['page_count']} | Over budget: {result['pages_over_budget']}")
+    lines.append("")
+    lines.append(f"{'Page':<32} {'Visuals':>7} {'Queries':>7} {'Measures':>8} {'Slicers':>7} "
+                 f"{'Synced':>6} {'Filters':>7} {'Custom':>6} {'Bkmks':>5}")
+    lines.append("-" * 100)
+    for page in result["pages"]:
+        name = page["display_name"][:31]
+        lines.append(f"{name:<32} {page['visuals']:>7} {page['estimated_queries']:>7} {page['distinct_measures']:>8} "
+                     f"{page['slicers']:>7} {page['synced_slicers']:>6} {page['visual_filters']:>7} "
+                     f"{page['custom_visuals']:>6} {page['bookmarks']:>5}")
+
+    lines.append("")
+    if not result["findings"]:
+        lines.append("✅ All pages within budget")
+    else:
+        lines.append(f"FINDINGS ({len(result['findings'])}):")
+        for finding in result["findings"]:
+            icon = "❌" if finding["severity"] == "critical" else "⚠️"
+            lines.append(f"  {icon} [{finding['severity'].upper()}] {finding['display_name']}: {finding['message']}")
+
+    if result["errors"]:
+        lines.append("")
+        lines.append("Files that could not be parsed:")
+        for error in result["errors"]:
+            lines.append(f"  - {error}")
+
+    lines.append("=" * 100)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Estimate per-page load cost of a Power BI Report (PBIR) and flag pages over budget",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("report_path", help="Path to .Report folder")
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=VALUE", help="Override one budget")
+    parser.add_argument("--budgets", help="JSON file of budget overrides")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    budgets = LoadBudgets()
+    try:
+        if args.budgets:
+            with open(args.budgets, 'r', encoding='utf-8') as f:
+                budgets.update(json.load(f))
+        for item in args.budget:
+            name, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"Budget must be NAME=VALUE, got '{item}'")
+            budgets.update({name.strip(): value.strip()})
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        result = lint_report(args.report_path, budgets)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(result))
+
+    sys.exit(1 if result["findings"] else 0)
+
+
+if __name__ == "__main__":
+    main()
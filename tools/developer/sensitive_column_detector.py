@@ -5,23 +5,70 @@ Sensitive Column Detector for Power BI Projects
 Scans TMDL files to identify columns likely to contain sensitive/PII data
 based on naming patterns. Used by the setup-data-anonymization workflow.
 
+The pattern table is compiled once into a single alternation of named groups,
+so each column name is matched with one regex call while keeping the table's
+first-match-wins order. Extra or replacement rules can be loaded from a JSON
+rules file.
+
+With --samples, local data extracts (CSV, or Parquet when pyarrow is
+installed) are also classified by content - emails, phone numbers, SSN-like
+identifiers, dictionary names and dates of birth - so a column named Attr7
+holding emails is still found. Files are read in fixed-size row chunks and
+each classifier runs once per column per chunk over the joined values, so
+memory stays bounded whatever the file size. A sample file maps to the table
+named by its file stem (Customers.csv -> Customers).
+
+With --previous, an earlier --json result is reused: TMDL files whose size
+and modification time (or, failing that, content hash) are unchanged keep
+their previous findings without being read, only changed files are
+re-scanned, and reviewer decisions are carried over. Set "review_status" to
+"confirmed" or "rejected" on a column in the JSON; rejected columns are left
+out of the report and exit code, confirmed columns are kept even if no
+pattern matches them any more.
+
 Usage:
     python sensitive_column_detector.py "<project-path>"
     python sensitive_column_detector.py "<project-path>" --output "<report-file>"
     python sensitive_column_detector.py "<project-path>" --json "<json-file>"
+    python sensitive_column_detector.py "<project-path>" --rules "<rules.json>"
+    python sensitive_column_detector.py "<project-path>" --samples "<csv-or-folder>" [--sample-rows 100000]
+    python sensitive_column_detector.py "<project-path>" --previous scan.json --json scan.json
+    python sensitive_column_detector.py --benchmark 1000000
+
+Rules file format:
+    {
+      "replace_defaults": false,
+      "patterns": [
+        {"pattern": "(?i)^patient_?id$", "category": "identifiers",
+         "confidence": "HIGH", "masking": "partial_mask"}
+      ],
+      "masking_strategies": {"hash": "Replace with a salted hash"}
+    }
+    Custom patterns are checked before the built-in table (or replace it when
+    replace_defaults is true).
 """
 
 import sys
 import os
 import re
 import argparse
+import csv
+import hashlib
+import itertools
+import random
+import time
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from collections import defaultdict
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Optional, Tuple
+from collections import Counter, defaultdict
 import json
 from datetime import datetime
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
 
 @dataclass
 class SensitiveColumn:
@@ -33,6 +80,7 @@ class SensitiveColumn:
     data_type: str
     matched_pattern: str
     suggested_masking: str
+    review_status: str = 'pending'  # pending, confirmed, rejected (set by a reviewer in the JSON)
 
 
 @dataclass
@@ -43,6 +91,325 @@ class DetectionResult:
     tables_scanned: int
     columns_scanned: int
     sensitive_columns: List[SensitiveColumn] = field(default_factory=list)
+    content_findings: List['ContentFinding'] = field(default_factory=list)
+    files_rescanned: int = 0
+    files_reused: int = 0
+
+
+@dataclass
+class ContentFinding:
+    """A column whose sampled values look sensitive."""
+    table: str
+    column: str
+    category: str  # emails, phones, identifiers, names, dates
+    confidence: str  # HIGH, MEDIUM, LOW
+    hit_rate: float  # matching share of non-empty sampled values
+    values_sampled: int
+    suggested_masking: str
+    source_file: str
+    name_match: bool = False  # also flagged by the column-name patterns
+
+
+CONFIDENCE_LEVELS = ('HIGH', 'MEDIUM', 'LOW')
+
+# (regex, category, confidence, suggested_masking)
+PatternRule = Tuple[str, str, str, str]
+
+# \1..\99 outside an escaped backslash; these break once rules share one regex
+NUMBERED_BACKREF = re.compile(r'(?<!\\)(?:\\\\)*\\[1-9]')
+
+
+class ColumnPatternMatcher:
+    """
+    First-match lookup over an ordered pattern table with one regex call.
+
+    Each pattern becomes a named group (?P<r0>...)|(?P<r1>...)|... and a
+    leading global flag such as (?i) is rewritten as a scoped group (?i:...),
+    so patterns can share one compiled expression. Regex alternation tries
+    branches left to right at the same position, which preserves the
+    sequential re.match priority; match.lastgroup names the winning rule.
+    """
+
+    GLOBAL_FLAGS = re.compile(r'^\(\?([aiLmsux]+)\)')
+
+    def __init__(self, patterns: List[PatternRule]):
+        self.patterns = list(patterns)
+        branches = [self.branch(i, rule[0]) for i, rule in enumerate(self.patterns)]
+        self.regex = re.compile('|'.join(branches)) if branches else None
+
+    @classmethod
+    def branch(cls, index: int, pattern: str) -> str:
+        """Return pattern as the named alternation branch for rule index."""
+        flags = cls.GLOBAL_FLAGS.match(pattern)
+        if flags:
+            pattern = f'(?{flags.group(1)}:{pattern[flags.end():]})'
+        return f'(?P<r{index}>{pattern})'
+
+    def match(self, column_name: str) -> Optional[PatternRule]:
+        """Return the first rule whose pattern matches the start of column_name."""
+        if self.regex is None:
+            return None
+        m = self.regex.match(column_name)
+        if m is None:
+            return None
+        return self.patterns[int(m.lastgroup[1:])]
+
+
+def load_rules(rules_path: str, default_patterns: List[PatternRule]) -> Tuple[List[PatternRule], Dict[str, str]]:
+    """
+    Load a JSON rules file.
+
+    Returns:
+        (ordered pattern table, extra masking strategy descriptions)
+
+    Raises:
+        ValueError: On a malformed rule or an invalid regex
+    """
+    with open(rules_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, list):
+        data = {'patterns': data}
+
+    patterns = []
+    group_names = set()
+    for i, rule in enumerate(data.get('patterns', [])):
+        try:
+            pattern = rule['pattern']
+            category = rule['category']
+            confidence = rule.get('confidence', 'MEDIUM').upper()
+            masking = rule.get('masking', 'placeholder_text')
+        except (KeyError, TypeError, AttributeError):
+            raise ValueError(f"Rule {i} in {rules_path} needs at least 'pattern' and 'category'")
+        if confidence not in CONFIDENCE_LEVELS:
+            raise ValueError(f"Rule {i} in {rules_path}: confidence must be one of {', '.join(CONFIDENCE_LEVELS)}")
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Rule {i} in {rules_path}: invalid pattern {pattern!r}: {e}")
+        # Rules are combined into one alternation (see ColumnPatternMatcher), which
+        # renumbers groups and shares group names across rules
+        if NUMBERED_BACKREF.search(pattern):
+            raise ValueError(f"Rule {i} in {rules_path}: pattern {pattern!r} uses a numbered backreference; "
+                             f"use a named group and (?P=name) instead")
+        try:
+            names = re.compile(ColumnPatternMatcher.branch(i, pattern)).groupindex
+        except re.error as e:
+            raise ValueError(f"Rule {i} in {rules_path}: pattern {pattern!r} cannot be combined with other rules: {e}")
+        for name in names:
+            if name != f'r{i}' and (re.fullmatch(r'r\d+', name) or name in group_names):
+                raise ValueError(f"Rule {i} in {rules_path}: group name {name!r} is reserved "
+                                 f"or already used by another rule")
+        group_names.update(names)
+        patterns.append((pattern, category, confidence, masking))
+
+    if not data.get('replace_defaults', False):
+        patterns.extend(default_patterns)
+
+    return patterns, dict(data.get('masking_strategies', {}))
+
+
+class SampleContentScanner:
+    """
+    Content-based PII classifier for local sample extracts.
+
+    Rows are read chunk_size at a time and transposed into columns. Each
+    column's values are joined into one newline-separated string and every
+    classifier is a multiline-anchored regex run once over it (findall), so
+    per-value work happens in the regex engine rather than a Python loop.
+    Only per-column counters are kept between chunks.
+    """
+
+    # Share of non-empty values that must match to report a column
+    MIN_HIT_RATE = 0.2
+    # Fewer sampled values than this lowers confidence one level
+    MIN_VALUES = 20
+
+    # Common first and last names for the dictionary classifier (extend with --names-file).
+    # Surnames that are also everyday words (colours, 'King', 'Hill', ...) are left out so
+    # attribute columns such as Color do not read as names.
+    COMMON_NAMES = (
+        'james', 'mary', 'john', 'patricia', 'robert', 'jennifer', 'michael', 'linda', 'william',
+        'elizabeth', 'david', 'barbara', 'richard', 'susan', 'joseph', 'jessica', 'thomas', 'sarah',
+        'charles', 'karen', 'christopher', 'lisa', 'daniel', 'nancy', 'matthew', 'betty', 'anthony',
+        'sandra', 'margaret', 'donald', 'ashley', 'steven', 'kimberly', 'paul', 'emily',
+        'andrew', 'donna', 'joshua', 'michelle', 'kenneth', 'carol', 'kevin', 'amanda', 'brian',
+        'melissa', 'george', 'deborah', 'timothy', 'stephanie', 'maria', 'jose', 'juan', 'carlos',
+        'ana', 'luis', 'anna', 'peter', 'hans', 'pierre', 'marie', 'wei', 'mohammed', 'ahmed',
+        'smith', 'johnson', 'williams', 'jones', 'garcia', 'miller', 'davis', 'rodriguez',
+        'martinez', 'hernandez', 'lopez', 'gonzalez', 'wilson', 'anderson', 'taylor', 'moore',
+        'jackson', 'martin', 'lee', 'perez', 'thompson', 'harris', 'sanchez', 'clark',
+        'ramirez', 'lewis', 'robinson', 'walker', 'allen', 'wright', 'scott',
+        'torres', 'nguyen', 'flores', 'adams', 'nelson', 'rivera',
+        'campbell', 'mitchell', 'carter', 'roberts', 'mueller', 'schmidt', 'wang', 'zhang', 'chen',
+    )
+
+    # category -> (regex body matching one whole value, character every match contains, suggested masking)
+    CLASSIFIERS = {
+        'emails': (r"[\w.+'-]+@[\w-]+(?:\.[\w-]+)+", '@', 'fake_domain'),
+        # Separated digit groups, at least 7 digits, never a plain decimal such as 47.606209
+        'phones': (r'(?=(?:[^\d\n]*\d){7})(?![+-]?\d+(?:\.\d+)?[ \t]*$)'
+                   r'(?:\+\d{1,3}[ .-]?)?(?:\(\d{2,4}\)[ .-]?|\d{2,4}[ .-])\d{3,4}[ .-]\d{3,4}', None, 'fake_prefix'),
+        'identifiers': (r'\d{3}-\d{2}-\d{4}', '-', 'partial_mask'),
+    }
+
+    # "First Last", "Last, First" or a single name; captures the token looked up in the dictionary
+    NAME_PATTERN = r"(?:[A-Za-z'-]+,[ \t]*)?([A-Za-z'-]+)(?:[ \t]+[A-Za-z.'-]+){0,3}"
+
+    # ISO (2001-02-03[ time]) or D/M/Y, M/D/Y with / or . separators; captures the year
+    DATE_PATTERN = r'(?:(\d{4})-\d{1,2}-\d{1,2}|\d{1,2}[/.]\d{1,2}[/.](\d{4}))(?:[T ][\d:.]+Z?)?'
+
+    def __init__(self, chunk_size: int = 10000, max_rows: Optional[int] = None,
+                 extra_names: Optional[List[str]] = None):
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+
+        def anchored(body: str, flags: int = 0):
+            return re.compile(rf'^[ \t]*(?:{body})[ \t]*$', re.MULTILINE | flags)
+
+        self.classifiers = {category: (anchored(body), required, masking)
+                            for category, (body, required, masking) in self.CLASSIFIERS.items()}
+        # Names: extract candidate tokens with one regex pass, then look up only the distinct ones
+        self.name_regex = anchored(self.NAME_PATTERN)
+        self.names = set(self.COMMON_NAMES) | {n.strip().lower() for n in extra_names or [] if n.strip()}
+        self.date_regex = anchored(self.DATE_PATTERN)
+        year = datetime.now().year
+        # Years of birth for people aged roughly 16-100
+        self.birth_years = range(year - 100, year - 15)
+
+    def scan_path(self, path: str) -> List[ContentFinding]:
+        """Scan a sample file, or every .csv/.parquet file in a folder."""
+        target = Path(path)
+        if target.is_dir():
+            files = sorted(f for f in target.iterdir() if f.suffix.lower() in ('.csv', '.parquet'))
+        elif target.exists():
+            files = [target]
+        else:
+            raise FileNotFoundError(f"Sample path not found: {path}")
+
+        findings = []
+        for sample_file in files:
+            try:
+                findings.extend(self.scan_file(sample_file))
+            except ImportError as e:
+                print(f"[WARNING] Skipping {sample_file.name}: {e}")
+        return findings
+
+    def scan_file(self, sample_file: Path) -> List[ContentFinding]:
+        """Classify every column of one sample file."""
+        if sample_file.suffix.lower() == '.parquet':
+            chunks = self._iter_parquet_chunks(sample_file)
+        else:
+            chunks = self._iter_csv_chunks(sample_file)
+
+        headers: List[str] = []
+        stats: Dict[int, Dict] = {}
+        for headers, columns in chunks:
+            for i, values in enumerate(columns):
+                self._classify(values, stats.setdefault(i, {'sampled': 0, 'hits': Counter(), 'years': Counter()}))
+
+        findings = []
+        for i, column_stats in stats.items():
+            finding = self._finding(sample_file, headers[i] if i < len(headers) else f'Column{i + 1}', column_stats)
+            if finding:
+                findings.append(finding)
+        return findings
+
+    def _iter_csv_chunks(self, sample_file: Path):
+        csv.field_size_limit(1 << 30)
+        with open(sample_file, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+            try:
+                dialect = csv.Sniffer().sniff(f.read(65536), delimiters=',;\t|')
+            except csv.Error:
+                dialect = csv.excel
+            f.seek(0)
+            reader = csv.reader(f, dialect)
+            headers = next(reader, [])
+            rows = reader if self.max_rows is None else itertools.islice(reader, self.max_rows)
+            while True:
+                chunk = list(itertools.islice(rows, self.chunk_size))
+                if not chunk:
+                    return
+                yield headers, list(itertools.zip_longest(*chunk, fillvalue=''))
+
+    def _iter_parquet_chunks(self, sample_file: Path):
+        if pq is None:
+            raise ImportError(f"Reading {sample_file.name} requires pyarrow (pip install pyarrow)")
+        parquet = pq.ParquetFile(str(sample_file))
+        headers = parquet.schema_arrow.names
+        remaining = self.max_rows
+        for batch in parquet.iter_batches(batch_size=self.chunk_size):
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                batch = batch.slice(0, remaining)
+                remaining -= batch.num_rows
+            yield headers, [['' if v is None else str(v) for v in column.to_pylist()]
+                            for column in batch.columns]
+
+    def _classify(self, values, column_stats: Dict) -> None:
+        """Update one column's counters from a chunk of its values."""
+        values = [v for v in values if v] if '' in values else values
+        if not values:
+            return
+        # Embedded newlines would split a value across lines
+        text = '\n'.join(values)
+        if '\r' in text:
+            text = text.replace('\r', ' ')
+        column_stats['sampled'] += len(values)
+        for category, (regex, required, _) in self.classifiers.items():
+            if required and required not in text:
+                continue
+            hits = len(regex.findall(text))
+            if hits:
+                column_stats['hits'][category] += hits
+        tokens = Counter(self.name_regex.findall(text))
+        hits = sum(count for token, count in tokens.items() if token.lower() in self.names)
+        if hits:
+            column_stats['hits']['names'] += hits
+        if '-' in text or '/' in text or '.' in text:
+            for (iso_year, dmy_year), count in Counter(self.date_regex.findall(text)).items():
+                column_stats['years'][int(iso_year or dmy_year)] += count
+
+    def _finding(self, sample_file: Path, column: str, column_stats: Dict) -> Optional[ContentFinding]:
+        sampled = column_stats['sampled']
+        if not sampled:
+            return None
+
+        hits = dict(column_stats['hits'])
+        years = column_stats['years']
+        birth_hits = sum(count for year, count in years.items() if year in self.birth_years)
+        if birth_hits:
+            hits['dates'] = birth_hits
+        if not hits:
+            return None
+
+        category = max(hits, key=hits.get)
+        rate = min(hits[category] / sampled, 1.0)
+        if rate < self.MIN_HIT_RATE:
+            return None
+
+        level = 0 if rate >= 0.8 else 1 if rate >= 0.5 else 2
+        if sampled < self.MIN_VALUES:
+            level += 1
+        if category == 'dates':
+            # Transaction dates cluster in a few recent years; birth dates spread over decades
+            in_range = [year for year in years if year in self.birth_years]
+            if max(in_range) - min(in_range) < 15:
+                level += 1
+        confidence = CONFIDENCE_LEVELS[min(level, 2)]
+
+        masking = {'dates': 'date_offset', 'names': 'sequential_numbering'}.get(category) or self.classifiers[category][2]
+        return ContentFinding(
+            table=sample_file.stem,
+            column=column,
+            category=category,
+            confidence=confidence,
+            hit_rate=round(rate, 3),
+            values_sampled=sampled,
+            suggested_masking=masking,
+            source_file=str(sample_file)
+        )
 
 
 class SensitiveColumnDetector:
@@ -112,14 +479,40 @@ class SensitiveColumnDetector:
         'placeholder_text': 'Replace with "[REDACTED]" or generic text',
     }
 
-    def __init__(self, project_path: str):
+    _default_matcher: Optional[ColumnPatternMatcher] = None
+
+    @classmethod
+    def default_matcher(cls) -> ColumnPatternMatcher:
+        """Compiled COLUMN_PATTERNS, built once and shared by all instances."""
+        if cls._default_matcher is None:
+            cls._default_matcher = ColumnPatternMatcher(cls.COLUMN_PATTERNS)
+        return cls._default_matcher
+
+    REVIEW_STATUSES = ('pending', 'confirmed', 'rejected')
+
+    def __init__(self, project_path: str, rules_path: Optional[str] = None,
+                 previous: Optional[Dict] = None, min_confidence: Optional[str] = None):
         self.project_path = Path(project_path)
+
+        if rules_path:
+            patterns, strategies = load_rules(rules_path, self.COLUMN_PATTERNS)
+            self.matcher = ColumnPatternMatcher(patterns)
+            self.MASKING_STRATEGIES = {**self.MASKING_STRATEGIES, **strategies}
+        else:
+            self.matcher = self.default_matcher()
+
+        # Previous findings are only reusable if produced by the same rules and filter
+        self.scan_key = hashlib.sha1(
+            json.dumps([self.matcher.patterns, min_confidence]).encode('utf-8')).hexdigest()
+        self.previous = previous or {}
+
         self.tmdl_files = list(self.project_path.rglob('*.tmdl'))
 
         if not self.tmdl_files:
             raise ValueError(f"No TMDL files found in {project_path}")
 
         self.tables = {}  # table_name -> list of columns
+        self.files = {}  # relative path -> {mtime_ns, size, sha1, tables: {table: column count}}
         self.result = DetectionResult(
             scan_timestamp=datetime.now().isoformat(),
             project_path=str(project_path),
@@ -128,33 +521,124 @@ class SensitiveColumnDetector:
         )
 
     def scan(self) -> DetectionResult:
-        """Run full scan and return detection results."""
+        """Run full scan (or an incremental one against previous results) and return detection results."""
         print(f"Scanning {len(self.tmdl_files)} TMDL files...\n")
 
-        # Extract tables and columns
-        for tmdl_file in self.tmdl_files:
-            self._extract_columns(tmdl_file)
-
-        self.result.tables_scanned = len(self.tables)
-        self.result.columns_scanned = sum(len(cols) for cols in self.tables.values())
-
-        print(f"Found {self.result.tables_scanned} tables with {self.result.columns_scanned} columns\n")
+        previous_files = {}
+        if self.previous.get('scan_key') == self.scan_key:
+            previous_files = self.previous.get('files', {})
 
-        # Detect sensitive columns
+        # Extract tables and columns from changed files; keep counts for unchanged ones
+        reused_tables = {}
+        for tmdl_file in self.tmdl_files:
+            rel = tmdl_file.relative_to(self.project_path).as_posix()
+            entry = self._reuse_file(tmdl_file, previous_files.get(rel))
+            if entry is None:
+                content = tmdl_file.read_bytes()
+                tables = self._extract_columns(tmdl_file, content.decode('utf-8'))
+                stat = tmdl_file.stat()
+                entry = {
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'sha1': hashlib.sha1(content).hexdigest(),
+                    'tables': {t: len(self.tables[t]) for t in tables},
+                }
+                self.result.files_rescanned += 1
+            else:
+                reused_tables.update(entry['tables'])
+                self.result.files_reused += 1
+            self.files[rel] = entry
+
+        reused_tables = {t: n for t, n in reused_tables.items() if t not in self.tables}
+        self.result.tables_scanned = len(self.tables) + len(reused_tables)
+        self.result.columns_scanned = (sum(len(cols) for cols in self.tables.values()) +
+                                       sum(reused_tables.values()))
+
+        print(f"Found {self.result.tables_scanned} tables with {self.result.columns_scanned} columns")
+        if previous_files:
+            print(f"Re-scanned {self.result.files_rescanned} changed file(s), "
+                  f"reused {self.result.files_reused} unchanged")
+        print()
+
+        reviews = {}
+        for entry in self.previous.get('sensitive_columns', []):
+            if entry.get('review_status', 'pending') != 'pending':
+                reviews[(entry['table'], entry['column'])] = entry
+
+        # Unchanged tables keep their previous findings as they were
+        for entry in self.previous.get('sensitive_columns', []) if previous_files else []:
+            if entry['table'] in reused_tables:
+                self.result.sensitive_columns.append(self._column_from_json(entry))
+
+        # Detect sensitive columns in re-scanned tables, carrying over reviewer decisions
         for table_name, columns in self.tables.items():
             for column in columns:
                 sensitive = self._check_column(table_name, column)
+                reviewed = reviews.pop((table_name, column['name']), None)
+                if sensitive and reviewed:
+                    sensitive.review_status = reviewed['review_status']
+                elif reviewed and reviewed['review_status'] == 'confirmed':
+                    # Confirmed by a reviewer although no pattern matches (any more)
+                    sensitive = self._column_from_json(reviewed)
+                    sensitive.data_type = column.get('data_type', sensitive.data_type)
                 if sensitive:
                     self.result.sensitive_columns.append(sensitive)
 
         return self.result
 
-    def _extract_columns(self, tmdl_file: Path):
-        """Extract table and column definitions from TMDL file."""
-        content = tmdl_file.read_text(encoding='utf-8')
+    @staticmethod
+    def _reuse_file(tmdl_file: Path, entry: Optional[Dict]) -> Optional[Dict]:
+        """Return the previous entry for an unchanged file (size+mtime, then content hash), else None."""
+        if not entry:
+            return None
+        stat = tmdl_file.stat()
+        if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry
+        if entry.get('size') != stat.st_size:
+            return None
+        # Touched but possibly identical (checkout, copy): compare content
+        if hashlib.sha1(tmdl_file.read_bytes()).hexdigest() != entry.get('sha1'):
+            return None
+        return {**entry, 'mtime_ns': stat.st_mtime_ns}
+
+    def _column_from_json(self, entry: Dict) -> SensitiveColumn:
+        status = entry.get('review_status', 'pending')
+        return SensitiveColumn(
+            table=entry['table'],
+            column=entry['column'],
+            pattern_category=entry.get('pattern_category', 'manual'),
+            confidence=entry.get('confidence', 'HIGH'),
+            data_type=entry.get('data_type', 'unknown'),
+            matched_pattern=entry.get('matched_pattern', ''),
+            suggested_masking=entry.get('suggested_masking', 'placeholder_text'),
+            review_status=status if status in self.REVIEW_STATUSES else 'pending'
+        )
+
+    def scan_samples(self, samples_path: str, max_rows: Optional[int] = None,
+                     names_file: Optional[str] = None) -> List[ContentFinding]:
+        """Classify local sample extracts by content and add the findings to the result."""
+        extra_names = None
+        if names_file:
+            extra_names = Path(names_file).read_text(encoding='utf-8').splitlines()
+        scanner = SampleContentScanner(max_rows=max_rows, extra_names=extra_names)
+
+        print(f"Scanning sample data in {samples_path}...\n")
+        findings = scanner.scan_path(samples_path)
+
+        flagged = {(c.table.lower(), c.column.lower()) for c in self.result.sensitive_columns}
+        for finding in findings:
+            finding.name_match = (finding.table.lower(), finding.column.lower()) in flagged
+        self.result.content_findings.extend(findings)
+        return findings
+
+    def _extract_columns(self, tmdl_file: Path, content: Optional[str] = None) -> List[str]:
+        """Extract table and column definitions from TMDL file; returns the tables declared in it."""
+        if content is None:
+            content = tmdl_file.read_text(encoding='utf-8')
         lines = content.splitlines()
 
         current_table = None
+        declared = []
 
         for line in lines:
             # Find table declaration
@@ -163,6 +647,7 @@ class SensitiveColumnDetector:
                 current_table = table_match.group(2)
                 if current_table not in self.tables:
                     self.tables[current_table] = []
+                declared.append(current_table)
                 continue
 
             if current_table:
@@ -182,24 +667,27 @@ class SensitiveColumnDetector:
                         'data_type': data_type
                     })
 
+        return declared
+
     def _check_column(self, table_name: str, column: Dict) -> Optional[SensitiveColumn]:
         """Check if a column matches any sensitive pattern."""
         column_name = column['name']
         data_type = column.get('data_type', 'unknown')
 
-        for pattern, category, confidence, masking in self.COLUMN_PATTERNS:
-            if re.match(pattern, column_name):
-                return SensitiveColumn(
-                    table=table_name,
-                    column=column_name,
-                    pattern_category=category,
-                    confidence=confidence,
-                    data_type=data_type,
-                    matched_pattern=pattern,
-                    suggested_masking=masking
-                )
-
-        return None
+        rule = self.matcher.match(column_name)
+        if rule is None:
+            return None
+
+        pattern, category, confidence, masking = rule
+        return SensitiveColumn(
+            table=table_name,
+            column=column_name,
+            pattern_category=category,
+            confidence=confidence,
+            data_type=data_type,
+            matched_pattern=pattern,
+            suggested_masking=masking
+        )
 
     def generate_report(self) -> str:
         """Generate human-readable detection report."""
@@ -211,22 +699,35 @@ class SensitiveColumnDetector:
         report.append(f"Scan Time: {self.result.scan_timestamp}")
         report.append(f"Tables Scanned: {self.result.tables_scanned}")
         report.append(f"Columns Scanned: {self.result.columns_scanned}")
+        if self.result.files_reused:
+            report.append(f"Incremental: {self.result.files_rescanned} file(s) re-scanned, "
+                          f"{self.result.files_reused} unchanged since the previous scan")
         report.append("")
 
-        if not self.result.sensitive_columns:
-            report.append("No sensitive columns detected based on naming patterns.")
+        # Columns a reviewer rejected stay in the JSON but are not reported
+        active = [c for c in self.result.sensitive_columns if c.review_status != 'rejected']
+        rejected = len(self.result.sensitive_columns) - len(active)
+        if rejected:
+            report.append(f"Rejected by reviewer (not shown): {rejected}")
             report.append("")
-            report.append("Note: This analysis is based on column names only.")
-            report.append("You may still have sensitive data in columns with non-standard names.")
+
+        if not active:
+            report.append("No sensitive columns detected based on naming patterns.")
             report.append("")
+            if self.result.content_findings:
+                report.extend(self._content_report())
+            else:
+                report.append("Note: This analysis is based on column names only.")
+                report.append("You may still have sensitive data in columns with non-standard names.")
+                report.append("")
             return '\n'.join(report)
 
         # Group by confidence
-        high = [c for c in self.result.sensitive_columns if c.confidence == 'HIGH']
-        medium = [c for c in self.result.sensitive_columns if c.confidence == 'MEDIUM']
-        low = [c for c in self.result.sensitive_columns if c.confidence == 'LOW']
+        high = [c for c in active if c.confidence == 'HIGH']
+        medium = [c for c in active if c.confidence == 'MEDIUM']
+        low = [c for c in active if c.confidence == 'LOW']
 
-        report.append(f"SENSITIVE COLUMNS FOUND: {len(self.result.sensitive_columns)}")
+        report.append(f"SENSITIVE COLUMNS FOUND: {len(active)}")
         report.append(f"  - High Confidence: {len(high)}")
         report.append(f"  - Medium Confidence: {len(medium)}")
         report.append(f"  - Low Confidence: {len(low)}")
@@ -239,7 +740,7 @@ class SensitiveColumnDetector:
             report.append("=" * 80)
             report.append("")
             for col in high:
-                report.append(f"  {col.table}.{col.column}")
+                report.append(f"  {col.table}.{col.column}{' (confirmed)' if col.review_status == 'confirmed' else ''}")
                 report.append(f"    Category: {col.pattern_category}")
                 report.append(f"    Suggested Masking: {self.MASKING_STRATEGIES.get(col.suggested_masking, col.suggested_masking)}")
                 report.append("")
@@ -251,7 +752,7 @@ class SensitiveColumnDetector:
             report.append("=" * 80)
             report.append("")
             for col in medium:
-                report.append(f"  {col.table}.{col.column}")
+                report.append(f"  {col.table}.{col.column}{' (confirmed)' if col.review_status == 'confirmed' else ''}")
                 report.append(f"    Category: {col.pattern_category}")
                 report.append(f"    Suggested Masking: {self.MASKING_STRATEGIES.get(col.suggested_masking, col.suggested_masking)}")
                 report.append("")
@@ -263,7 +764,7 @@ class SensitiveColumnDetector:
             report.append("=" * 80)
             report.append("")
             for col in low:
-                report.append(f"  {col.table}.{col.column}")
+                report.append(f"  {col.table}.{col.column}{' (confirmed)' if col.review_status == 'confirmed' else ''}")
                 report.append(f"    Category: {col.pattern_category}")
                 report.append(f"    Suggested Masking: {self.MASKING_STRATEGIES.get(col.suggested_masking, col.suggested_masking)}")
                 report.append("")
@@ -275,7 +776,7 @@ class SensitiveColumnDetector:
         report.append("")
 
         by_table = defaultdict(list)
-        for col in self.result.sensitive_columns:
+        for col in active:
             by_table[col.table].append(col)
 
         for table, columns in sorted(by_table.items()):
@@ -284,6 +785,8 @@ class SensitiveColumnDetector:
                 report.append(f"    - {col.column} ({col.pattern_category}, {col.confidence})")
             report.append("")
 
+        report.extend(self._content_report())
+
         report.append("=" * 80)
         report.append("NEXT STEPS")
         report.append("=" * 80)
@@ -297,6 +800,26 @@ class SensitiveColumnDetector:
 
         return '\n'.join(report)
 
+    def _content_report(self) -> List[str]:
+        """Report lines for content-based findings (empty when no samples were scanned)."""
+        if not self.result.content_findings:
+            return []
+
+        lines = []
+        lines.append("=" * 80)
+        lines.append("CONTENT-BASED FINDINGS (from sample data)")
+        lines.append("=" * 80)
+        lines.append("")
+        for finding in sorted(self.result.content_findings,
+                              key=lambda f: (CONFIDENCE_LEVELS.index(f.confidence), f.table, f.column)):
+            note = "" if finding.name_match else "  <- not caught by name patterns"
+            lines.append(f"  {finding.table}.{finding.column}{note}")
+            lines.append(f"    Category: {finding.category} ({finding.confidence}, "
+                         f"{finding.hit_rate:.0%} of {finding.values_sampled:,} values)")
+            lines.append(f"    Suggested Masking: {self.MASKING_STRATEGIES.get(finding.suggested_masking, finding.suggested_masking)}")
+            lines.append("")
+        return lines
+
     def to_json(self) -> Dict:
         """Convert results to JSON-serializable dict."""
         return {
@@ -311,34 +834,117 @@ class SensitiveColumnDetector:
                     'pattern_category': col.pattern_category,
                     'confidence': col.confidence,
                     'data_type': col.data_type,
-                    'suggested_masking': col.suggested_masking
+                    'matched_pattern': col.matched_pattern,
+                    'suggested_masking': col.suggested_masking,
+                    'review_status': col.review_status
                 }
                 for col in self.result.sensitive_columns
             ],
-            'masking_strategies': self.MASKING_STRATEGIES
+            'content_findings': [asdict(finding) for finding in self.result.content_findings],
+            'masking_strategies': self.MASKING_STRATEGIES,
+            # Used by --previous to skip unchanged files on the next run
+            'scan_key': self.scan_key,
+            'files': self.files
         }
 
 
+def run_benchmark(count: int, rules_path: Optional[str] = None) -> int:
+    """
+    Time the combined matcher against sequential re.match on synthetic names.
+
+    Names mix exact pattern hits, decorated variants and unrelated names, and
+    both strategies must agree on every name.
+    """
+    patterns = SensitiveColumnDetector.COLUMN_PATTERNS
+    if rules_path:
+        patterns, _ = load_rules(rules_path, patterns)
+
+    rng = random.Random(42)
+    hits = ['CustomerName', 'first_name', 'Name', 'Email', 'EmailAddress', 'SSN', 'TaxId',
+            'PhoneNumber', 'mobile', 'Fax', 'BillingAddress', 'AddressLine1', 'City', 'ZipCode',
+            'Salary', 'CardNumber', 'Amount', 'DOB', 'HireDate', 'Notes', 'Country']
+    words = ['Order', 'Product', 'Sales', 'Key', 'Id', 'Qty', 'Date', 'Flag', 'Code', 'Status',
+             'Region', 'Category', 'Line', 'Total', 'Type', 'Attr']
+    names = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.2:
+            names.append(rng.choice(hits))
+        elif kind < 0.3:
+            names.append(rng.choice(hits) + rng.choice(words))
+        else:
+            names.append(''.join(rng.choice(words) for _ in range(rng.randint(1, 3))) + str(rng.randint(0, 999)))
+
+    print(f"Benchmark: {count:,} synthetic column names, {len(patterns)} patterns\n")
+
+    start = time.perf_counter()
+    matcher = ColumnPatternMatcher(patterns)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    combined = [matcher.match(name) for name in names]
+    combined_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sequential = []
+    for name in names:
+        for rule in patterns:
+            if re.match(rule[0], name):
+                sequential.append(rule)
+                break
+        else:
+            sequential.append(None)
+    sequential_s = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(combined, sequential) if a is not b)
+    matched = sum(1 for r in combined if r is not None)
+
+    print(f"  Combined matcher:   {combined_s:8.2f} s  ({count / combined_s:,.0f} names/s, compile {compile_ms:.1f} ms)")
+    print(f"  Sequential re.match:{sequential_s:8.2f} s  ({count / sequential_s:,.0f} names/s)")
+    print(f"  Speedup: {sequential_s / combined_s:.1f}x   Matched: {matched:,}   Mismatches: {mismatches}")
+
+    return 1 if mismatches else 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Detect sensitive columns in Power BI TMDL files',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
 
-    parser.add_argument('project_path', help='Path to Power BI project folder (contains .SemanticModel)')
+    parser.add_argument('project_path', nargs='?', help='Path to Power BI project folder (contains .SemanticModel)')
     parser.add_argument('--output', help='Output file for report (default: stdout)')
     parser.add_argument('--json', help='Output JSON file for structured data')
     parser.add_argument('--confidence', choices=['HIGH', 'MEDIUM', 'LOW'],
                         help='Minimum confidence level to include (default: all)')
+    parser.add_argument('--rules', help='JSON rules file with extra (or replacement) column patterns')
+    parser.add_argument('--previous', help='Previous --json result: re-scan only changed TMDL files and keep review decisions')
+    parser.add_argument('--samples', help='CSV/Parquet sample file or folder to classify by content')
+    parser.add_argument('--sample-rows', type=int, help='Maximum rows to read per sample file (default: all)')
+    parser.add_argument('--names-file', help='Extra names (one per line) for the name dictionary classifier')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Time the pattern matcher on N synthetic column names and exit')
 
     args = parser.parse_args()
 
+    if args.benchmark:
+        return run_benchmark(args.benchmark, args.rules)
+    if not args.project_path:
+        parser.error('project_path is required unless --benchmark is given')
+
     try:
+        previous = None
+        if args.previous and Path(args.previous).exists():
+            with open(args.previous, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+
         # Initialize detector
-        detector = SensitiveColumnDetector(args.project_path)
+        detector = SensitiveColumnDetector(args.project_path, args.rules, previous, args.confidence)
 
         # Run scan
         result = detector.scan()
+        if args.samples:
+            detector.scan_samples(args.samples, args.sample_rows, args.names_file)
 
         # Filter by confidence if specified
         if args.confidence:
@@ -348,6 +954,10 @@ def main():
                 c for c in result.sensitive_columns
                 if confidence_order.get(c.confidence, 0) >= min_conf
             ]
+            result.content_findings = [
+                c for c in result.content_findings
+                if confidence_order.get(c.confidence, 0) >= min_conf
+            ]
 
         # Generate report
         report = detector.generate_report()
@@ -367,7 +977,8 @@ def main():
             print(f"JSON data saved to: {args.json}")
 
         # Exit code: 0 if no high-confidence issues, 1 if has high-confidence
-        high_conf = [c for c in result.sensitive_columns if c.confidence == 'HIGH']
+        high_conf = [c for c in result.sensitive_columns + result.content_findings
+                     if c.confidence == 'HIGH' and getattr(c, 'review_status', 'pending') != 'rejected']
         return 1 if high_conf else 0
 
     except Exception as e:
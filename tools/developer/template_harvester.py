@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Template Harvester
+
+Scans one or many Power BI Report (PBIR) folders and turns the visuals in use
+into parameterized visual templates, one per distinct configuration, with
+usage counts - so template collection does not depend on picking examples by
+hand.
+
+Each visual.json is canonicalized:
+    - name, position and filter names become {{VISUAL_NAME}}, {{X}}..., {{FILTER_GUID_n}}
+    - field bindings become role-named placeholders ({{CATEGORY_TABLE}}.{{CATEGORY_COLUMN}},
+      {{Y_TABLE}}.{{Y_MEASURE}}, ...), queryRef/nativeQueryRef rebuilt from them
+    - title/subtitle and textbox text become {{TITLE}}, {{SUBTITLE}}, {{TEXT}}
+    - projection display names and filter conditions are dropped
+
+The canonical form is hashed (structure hash: identical configurations) and
+reduced to a shape - visual type, roles with projection kinds, formatting cards
+used, filter count - which is hashed again (shape hash: near-identical
+configurations differing only in formatting values). Visuals are clustered by
+shape (or by structure with --exact) and one template is emitted per cluster
+from its most common variant. Files are canonicalized in parallel processes.
+
+Output templates use the harvested-template layout (templateInfo, defaultSize,
+visualStructure, placeholders), which pbir_page_generator.py accepts directly.
+
+Usage:
+    python template_harvester.py <path> [<path> ...] [--output <dir>] [--exact] [--min-usage N]
+                                 [--workers N] [--json]
+
+Arguments:
+    path                  .Report folder, or a folder searched recursively for .Report folders
+
+Options:
+    --output <dir>        Write one template per cluster plus harvest_summary.json
+    --exact               Cluster identical configurations only (default: by shape)
+    --min-usage <n>       Only emit clusters used at least n times (default: 1)
+    --workers <n>         Parallel worker processes (default: CPU count)
+    --json                Output the cluster summary as JSON
+
+Exit Codes:
+    0 - Templates harvested
+    2 - No PBIR reports or visuals found
+
+Examples:
+    python template_harvester.py "Sales.Report"
+    python template_harvester.py C:/Reports --min-usage 3 --output harvested-templates
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import date
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, List, Optional, Tuple
+
+from pbir_field_index import iter_field_nodes, role_for_path
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+POSITION_PLACEHOLDERS = {"x": "X", "y": "Y", "z": "Z", "height": "HEIGHT", "width": "WIDTH", "tabOrder": "TAB_ORDER"}
+TEXT_CARDS = {"title": "TITLE", "subTitle": "SUBTITLE"}
+DROPPED_VISUAL_KEYS = ("parentGroupName", "isHidden", "howCreated")
+
+
+def _ph(name: str) -> str:
+    return "{{" + name + "}}"
+
+
+def _get(data: Any, path: Tuple) -> Any:
+    for key in path:
+        data = data[key]
+    return data
+
+
+def _role_stem(role: str) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '_', role).strip('_').upper() or "FIELD"
+
+
+class VisualCanonicalizer:
+    """Rewrite one decoded visual.json into its parameterized canonical form."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.bindings: Dict[Tuple[str, str, str], str] = {}
+        self.stem_counts: Counter = Counter()
+        self.placeholders: Dict[str, str] = {}
+
+    def _stem_for(self, kind: str, entity: str, prop: str, role: str) -> str:
+        key = (kind, entity, prop)
+        if key not in self.bindings:
+            base = _role_stem(role)
+            self.stem_counts[base] += 1
+            count = self.stem_counts[base]
+            self.bindings[key] = base if count == 1 else f"{base}_{count}"
+        return self.bindings[key]
+
+    def _bind(self, node: Any, stem: str, role: str, field_kind: str) -> Any:
+        """Replace entity and property names inside a field node with placeholders."""
+        if isinstance(node, list):
+            return [self._bind(item, stem, role, field_kind) for item in node]
+        if not isinstance(node, dict):
+            return node
+        out = {}
+        for key, value in node.items():
+            if key == "Entity" and isinstance(value, str):
+                out[key] = self._declare(f"{stem}_TABLE", f"Table for the {role} field")
+            elif key == "Property" and isinstance(value, str):
+                out[key] = self._declare(f"{stem}_{field_kind.upper()}", f"{field_kind} for the {role} field")
+            elif key == "Hierarchy" and isinstance(value, str):
+                out[key] = self._declare(f"{stem}_HIERARCHY", f"Hierarchy for the {role} field")
+            elif key == "Level" and isinstance(value, str):
+                out[key] = self._declare(f"{stem}_LEVEL", f"Hierarchy level for the {role} field")
+            else:
+                kind = key if key in ("Column", "Measure") else field_kind
+                out[key] = self._bind(value, stem, role, kind)
+        return out
+
+    def _declare(self, name: str, description: str) -> str:
+        self.placeholders.setdefault(name, description)
+        return _ph(name)
+
+    def canonicalize(self) -> Dict[str, Any]:
+        data = self.data
+        data["name"] = self._declare("VISUAL_NAME", "Unique visual name (20 hex characters)")
+        if isinstance(data.get("position"), dict):
+            data["position"] = {k: self._declare(v, "Position (from layout)")
+                                for k, v in POSITION_PLACEHOLDERS.items() if k in data["position"]}
+        for key in DROPPED_VISUAL_KEYS:
+            data.pop(key, None)
+
+        for path, parent, kind, entity, prop in list(iter_field_nodes(data)):
+            role = role_for_path("visual", path)
+            stem = self._stem_for(kind, entity, prop, role)
+            inner_kind = "Column" if kind in ("Aggregation", "HierarchyLevel") else kind
+            parent[path[-1]] = self._bind(parent[path[-1]], stem, role, inner_kind)
+
+            if len(path) >= 2 and path[-2] == "field":
+                projection = _get(data, path[:-2])
+                self._rewrite_query_refs(projection, kind, entity, prop, stem)
+
+        self._scrub_text(data.get("visual", {}))
+        self._scrub_filters(data.get("filterConfig"))
+        return data
+
+    def _rewrite_query_refs(self, projection: Dict, kind: str, entity: str, prop: str, stem: str) -> None:
+        if kind == "HierarchyLevel":
+            prop_ph = f"{_ph(stem + '_HIERARCHY')}.{_ph(stem + '_LEVEL')}"
+            leaf = prop.rsplit(".", 1)[-1]
+            leaf_ph = _ph(stem + "_LEVEL")
+        else:
+            suffix = "MEASURE" if kind == "Measure" else "COLUMN"
+            prop_ph = leaf_ph = _ph(f"{stem}_{suffix}")
+            leaf = prop
+        qualified = f"{entity}.{prop}"
+        if isinstance(projection.get("queryRef"), str):
+            projection["queryRef"] = projection["queryRef"].replace(qualified, f"{_ph(stem + '_TABLE')}.{prop_ph}")
+        if isinstance(projection.get("nativeQueryRef"), str):
+            native = projection["nativeQueryRef"]
+            projection["nativeQueryRef"] = native.replace(leaf, leaf_ph) if leaf and leaf in native else leaf_ph
+        projection.pop("displayName", None)
+
+    def _scrub_text(self, visual: Dict[str, Any]) -> None:
+        containers = visual.get("visualContainerObjects") or {}
+        for card, placeholder in TEXT_CARDS.items():
+            for entry in containers.get(card) or []:
+                literal = (((entry.get("properties") or {}).get("text") or {}).get("expr") or {}).get("Literal")
+                if isinstance(literal, dict) and "Value" in literal:
+                    literal["Value"] = "'" + self._declare(placeholder, f"{card} text") + "'"
+        for entry in (visual.get("objects") or {}).get("general") or []:
+            for paragraph in (entry.get("properties") or {}).get("paragraphs") or []:
+                for run in paragraph.get("textRuns") or []:
+                    if "value" in run:
+                        run["value"] = self._declare("TEXT", "Text box content")
+
+    def _scrub_filters(self, filter_config: Any) -> None:
+        if not isinstance(filter_config, dict):
+            return
+        for i, flt in enumerate(filter_config.get("filters") or [], start=1):
+            if isinstance(flt, dict):
+                flt["name"] = self._declare(f"FILTER_GUID_{i}", "Unique filter name (20 hex characters)")
+                flt.pop("filter", None)
+
+
+def visual_shape(canonical: Dict[str, Any]) -> Dict[str, Any]:
+    """Structure that near-identical visuals share: type, roles/kinds, formatting cards, filter count."""
+    visual = canonical.get("visual") or {}
+    query_state = (visual.get("query") or {}).get("queryState") or {}
+    roles = {}
+    for role, state in query_state.items():
+        projections = state.get("projections") if isinstance(state, dict) else None
+        roles[role] = [next(iter(p.get("field", {})), "?") for p in projections or [] if isinstance(p, dict)]
+    return {
+        "visualType": visual.get("visualType"),
+        "roles": dict(sorted(roles.items())),
+        "objects": sorted((visual.get("objects") or {}).keys()),
+        "containerObjects": sorted((visual.get("visualContainerObjects") or {}).keys()),
+        "filters": len((canonical.get("filterConfig") or {}).get("filters") or []),
+    }
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def harvest_visual(job: Tuple[str, str]) -> Dict[str, Any]:
+    """Canonicalize one visual.json (worker function)."""
+    path, report = job
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
+        return {"path": path, "error": str(e)}
+    if not isinstance(data, dict) or not isinstance(data.get("visual"), dict):
+        # Visual groups have no visual body
+        return {"path": path, "skipped": True}
+
+    position = data.get("position") or {}
+    size = (position.get("width"), position.get("height"))
+    canonicalizer = VisualCanonicalizer(data)
+    canonical = canonicalizer.canonicalize()
+    shape = visual_shape(canonical)
+    return {
+        "path": path,
+        "report": report,
+        "visual_type": shape["visualType"] or "unknown",
+        "structure_hash": _digest(canonical),
+        "shape_hash": _digest(shape),
+        "shape": shape,
+        "canonical": canonical,
+        "placeholders": canonicalizer.placeholders,
+        "size": size,
+    }
+
+
+def find_reports(paths: List[str]) -> List[Path]:
+    """Resolve each path to .Report folders (itself, or found recursively beneath it)."""
+    reports = []
+    for raw in paths:
+        path = Path(raw)
+        if (path / "definition" / "pages").is_dir():
+            reports.append(path)
+            continue
+        for root, dirs, _ in os.walk(path):
+            for d in list(dirs):
+                if d.endswith(".Report") and os.path.isdir(os.path.join(root, d, "definition", "pages")):
+                    reports.append(Path(root) / d)
+                    dirs.remove(d)
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+    return sorted(set(reports))
+
+
+def report_labels(reports: List[Path], paths: List[str]) -> Dict[Path, str]:
+    """
+    Identify each report by its path relative to the scan root it was found under.
+
+    Report folder names repeat across projects (every project can have a
+    Sales.Report), so the name alone would merge distinct reports.
+    """
+    roots = [Path(raw) for raw in paths]
+    labels = {}
+    for report in reports:
+        label = report.name
+        for root in roots:
+            if report != root and root in report.parents:
+                label = report.relative_to(root).as_posix()
+                break
+        labels[report] = label
+    counts = Counter(labels.values())
+    return {report: label if counts[label] == 1 else report.as_posix() for report, label in labels.items()}
+
+
+def iter_visual_files(report: Path):
+    """Yield every visual.json path in a report."""
+    pages = report / "definition" / "pages"
+    for page in os.scandir(pages):
+        visuals = os.path.join(page.path, "visuals")
+        if page.is_dir() and os.path.isdir(visuals):
+            for visual in os.scandir(visuals):
+                path = os.path.join(visual.path, "visual.json")
+                if os.path.isfile(path):
+                    yield path
+
+
+@dataclass
+class TemplateCluster:
+    """Visuals sharing a configuration"""
+    cluster_id: str
+    visual_type: str
+    usage_count: int
+    variant_count: int
+    reports: List[str]
+    shape: Dict[str, Any]
+    template_file: Optional[str] = None
+    variant_usage: List[int] = field(default_factory=list)
+
+
+class TemplateHarvester:
+    """Canonicalize visuals across reports and cluster them into templates."""
+
+    def __init__(self, exact: bool = False, workers: Optional[int] = None):
+        self.exact = exact
+        self.workers = workers
+        self.reports: List[Path] = []
+        self.visual_count = 0
+        self.errors: List[Dict[str, str]] = []
+        self._clusters: Dict[str, Dict[str, Any]] = {}
+
+    def scan(self, paths: List[str]) -> None:
+        self.reports = find_reports(paths)
+        labels = report_labels(self.reports, paths)
+        jobs = [(p, labels[report]) for report in self.reports for p in iter_visual_files(report)]
+        if len(jobs) > 1 and self.workers != 1:
+            with ProcessPoolExecutor(max_workers=self.workers or os.cpu_count()) as pool:
+                results = pool.map(harvest_visual, jobs, chunksize=max(1, len(jobs) // ((os.cpu_count() or 1) * 8)))
+                for result in results:
+                    self._add(result)
+        else:
+            for job in jobs:
+                self._add(harvest_visual(job))
+
+    def _add(self, result: Dict[str, Any]) -> None:
+        if "error" in result:
+            self.errors.append({"path": result["path"], "error": result["error"]})
+            return
+        if result.get("skipped"):
+            return
+        self.visual_count += 1
+        key = result["structure_hash"] if self.exact else result["shape_hash"]
+        cluster = self._clusters.get(key)
+        if cluster is None:
+            cluster = self._clusters[key] = {
+                "visual_type": result["visual_type"],
+                "shape": result["shape"],
+                "variants": Counter(),
+                "examples": {},
+                "reports": Counter(),
+                "sizes": [],
+            }
+        cluster["variants"][result["structure_hash"]] += 1
+        if result["structure_hash"] not in cluster["examples"]:
+            cluster["examples"][result["structure_hash"]] = (result["canonical"], result["placeholders"])
+        cluster["reports"][result["report"]] += 1
+        width, height = result["size"]
+        if isinstance(width, (int, float)) and isinstance(height, (int, float)):
+            cluster["sizes"].append((width, height))
+
+    def clusters(self, min_usage: int = 1) -> List[Tuple[TemplateCluster, Dict[str, Any]]]:
+        """Clusters (most used first) with the template built from their most common variant."""
+        out = []
+        for key, c in self._clusters.items():
+            usage = sum(c["variants"].values())
+            if usage < min_usage:
+                continue
+            representative = min(c["variants"], key=lambda h: (-c["variants"][h], h))
+            canonical, placeholders = c["examples"][representative]
+            roles = "-".join(_role_stem(r).lower() for r in c["shape"]["roles"]) or "static"
+            cluster = TemplateCluster(
+                cluster_id=key[:12],
+                visual_type=c["visual_type"],
+                usage_count=usage,
+                variant_count=len(c["variants"]),
+                reports=sorted(c["reports"]),
+                shape=c["shape"],
+                template_file=re.sub(r'[^\w\-]+', '_', f"{c['visual_type']}-{roles}-{key[:8]}") + ".json",
+                variant_usage=sorted(c["variants"].values(), reverse=True),
+            )
+            template = {
+                "templateInfo": {
+                    "visualType": c["visual_type"],
+                    "description": f"{c['visual_type']} ({', '.join(c['shape']['roles']) or 'no data roles'}), "
+                                   f"used by {usage} visual(s) in {len(c['reports'])} report(s)",
+                    "extractedFrom": cluster.reports,
+                    "extractedDate": date.today().isoformat(),
+                    "usageCount": usage,
+                    "variantCount": cluster.variant_count,
+                    "clusterId": cluster.cluster_id,
+                },
+                "visualStructure": canonical,
+                "placeholders": [{"name": n, "description": d} for n, d in placeholders.items()],
+            }
+            if c["sizes"]:
+                template["defaultSize"] = {
+                    "width": int(median(w for w, _ in c["sizes"])),
+                    "height": int(median(h for _, h in c["sizes"])),
+                }
+            out.append((cluster, template))
+        out.sort(key=lambda item: (-item[0].usage_count, item[0].visual_type, item[0].cluster_id))
+        return out
+
+
+def write_templates(output_dir: Path, harvested: List[Tuple[TemplateCluster, Dict[str, Any]]],
+                    summary: Dict[str, Any]) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for cluster, template in harvested:
+        with open(output_dir / cluster.template_file, 'w', encoding='utf-8') as f:
+            json.dump(template, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+    with open(output_dir / "harvest_summary.json", 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Generate formatted text report."""
+    lines = []
+    lines.append("=" * 90)
+    lines.append("TEMPLATE HARVEST")
+    lines.append("=" * 90)
+    lines.append(f"Reports: {summary['report_count']} | Visuals: {summary['visual_count']} | "
+                 f"Clusters: {summary['cluster_count']} ({summary['mode']})")
+    lines.append("")
+    lines.append(f"{'Uses':>6} {'Variants':>8}  {'Visual Type':<24} Template")
+    lines.append("-" * 90)
+    for c in summary["clusters"]:
+        lines.append(f"{c['usage_count']:>6} {c['variant_count']:>8}  {c['visual_type'][:23]:<24} {c['template_file']}")
+    if summary["errors"]:
+        lines.append("")
+        lines.append(f"⚠️ {len(summary['errors'])} file(s) could not be parsed")
+        for e in summary["errors"][:10]:
+            lines.append(f"  - {e['path']}: {e['error']}")
+    if summary.get("output_dir"):
+        lines.append("")
+        lines.append(f"✅ Templates written to: {summary['output_dir']}")
+    lines.append("=" * 90)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Harvest deduplicated visual templates from PBIR reports",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("paths", nargs="+", help=".Report folders or folders to search")
+    parser.add_argument("--output", help="Write templates and harvest_summary.json to this folder")
+    parser.add_argument("--exact", action="store_true", help="Cluster identical configurations only")
+    parser.add_argument("--min-usage", type=int, default=1, help="Minimum usage count per template")
+    parser.add_argument("--workers", type=int, help="Parallel worker processes")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    harvester = TemplateHarvester(exact=args.exact, workers=args.workers)
+    harvester.scan(args.paths)
+    if not harvester.reports or not harvester.visual_count:
+        print("Error: no PBIR reports or visuals found", file=sys.stderr)
+        sys.exit(2)
+
+    harvested = harvester.clusters(args.min_usage)
+    summary = {
+        "report_count": len(harvester.reports),
+        "visual_count": harvester.visual_count,
+        "mode": "exact" if args.exact else "shape",
+        "cluster_count": len(harvested),
+        "output_dir": str(Path(args.output)) if args.output else None,
+        "clusters": [asdict(c) for c, _ in harvested],
+        "errors": harvester.errors,
+    }
+    if args.output:
+        write_templates(Path(args.output), harvested, summary)
+
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print(format_summary(summary))
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
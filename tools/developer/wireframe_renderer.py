@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Wireframe Renderer
+
+Renders every page of a Power BI Report (PBIR) as an SVG and/or PNG wireframe
+from page.json / visual.json positions, types, titles and z-order, so layout
+changes can be reviewed locally before any deploy or browser session.
+
+Visuals are drawn in z-order and colour-coded by category (cards, charts,
+tables, slicers, text, decorative). SVG wireframes include titles and visual
+types; PNG wireframes are rasterized with the standard library only (zlib) and
+show blocks and borders without text. Pages are rendered in parallel.
+
+Usage:
+    python wireframe_renderer.py <report_path> [--output <dir>] [--format svg|png|both]
+                                 [--page <page_id>] [--scale N] [--show-hidden] [--workers N]
+                                 [--no-cache] [--json]
+
+Arguments:
+    report_path           Path to .Report folder
+
+Options:
+    --output <dir>        Output folder (default: <project>/.pbi-squire-cache/wireframes/<report>)
+    --format <fmt>        svg, png or both (default: svg)
+    --page <page_id>      Only render this page (folder name)
+    --scale <factor>      Output scale factor (default: 1.0)
+    --show-hidden         Draw hidden visuals as dashed outlines
+    --workers <n>         Parallel page renderers (default: CPU count)
+    --no-cache            Do not use the extract_visual_layout.py layout cache
+    --json                Output the list of written files as JSON
+
+Exit Codes:
+    0 - Wireframes written
+    2 - Report or page not found
+
+Examples:
+    python wireframe_renderer.py "Sales.Report"
+    python wireframe_renderer.py "Sales.Report" --format both --scale 0.5 --output wireframes
+"""
+
+import os
+import re
+import sys
+import json
+import zlib
+import struct
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from extract_visual_layout import CACHE_DIR_NAME, extract_report_layout
+from layout_linter import DECORATIVE_VISUAL_TYPES
+from layout_solver import visual_category
+
+# Force UTF-8 encoding for stdout on Windows to handle emoji characters
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+# (fill, border) RGB per category
+CATEGORY_COLORS = {
+    "card": ((214, 230, 248), (46, 117, 182)),
+    "chart": ((218, 240, 222), (56, 142, 60)),
+    "table": ((252, 232, 212), (230, 124, 25)),
+    "slicer": ((232, 222, 245), (123, 77, 170)),
+    "text": ((242, 242, 242), (128, 128, 128)),
+    "decorative": ((236, 236, 236), (190, 190, 190)),
+    "other": ((214, 240, 240), (0, 131, 143)),
+}
+PAGE_BACKGROUND = (255, 255, 255)
+PAGE_BORDER = (160, 160, 160)
+
+
+def _rgb(color: Tuple[int, int, int]) -> str:
+    return "#{:02x}{:02x}{:02x}".format(*color)
+
+
+def _category(visual: Dict[str, Any]) -> str:
+    if visual["visual_type"] in DECORATIVE_VISUAL_TYPES:
+        return "decorative"
+    return visual_category(visual["visual_type"])
+
+
+def drawable_visuals(page: Dict[str, Any], show_hidden: bool = False) -> List[Dict[str, Any]]:
+    """Visuals in paint order (z-index, then container ID), without groups and, by default, hidden visuals."""
+    visuals = [v for v in page["visuals"] if not v.get("is_group") and (show_hidden or not v.get("is_hidden"))]
+    return sorted(visuals, key=lambda v: (v.get("z_index") or 0, v["container_id"]))
+
+
+def render_svg(page: Dict[str, Any], scale: float = 1.0, show_hidden: bool = False) -> str:
+    """Render one page as an SVG document."""
+    width, height = page["width"], page["height"]
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width * scale:g}" height="{height * scale:g}" '
+        f'viewBox="0 0 {width:g} {height:g}" font-family="Segoe UI, Arial, sans-serif">',
+        f'  <title>{escape(page["name"])}</title>',
+        f'  <rect width="{width:g}" height="{height:g}" fill="{_rgb(PAGE_BACKGROUND)}" '
+        f'stroke="{_rgb(PAGE_BORDER)}" stroke-width="2"/>',
+    ]
+    for visual in drawable_visuals(page, show_hidden):
+        fill, border = CATEGORY_COLORS[_category(visual)]
+        x, y, w, h = visual["x"], visual["y"], visual["width"], visual["height"]
+        dash = ' stroke-dasharray="6 4" fill-opacity="0.3"' if visual.get("is_hidden") else ""
+        label = visual["title"] or visual["visual_type"]
+        # Nested viewport clips labels to the visual bounds
+        lines.append(f'  <svg x="{x:g}" y="{y:g}" width="{max(w, 0):g}" height="{max(h, 0):g}" overflow="hidden">')
+        lines.append(f'    <rect x="0.5" y="0.5" width="{max(w - 1, 0):g}" height="{max(h - 1, 0):g}" '
+                     f'fill="{_rgb(fill)}" stroke="{_rgb(border)}"{dash}/>')
+        lines.append(f'    <text x="6" y="16" font-size="12" font-weight="600" fill="#252423">{escape(label)}</text>')
+        if visual["title"]:
+            lines.append(f'    <text x="6" y="30" font-size="10" fill="#605e5c">{escape(visual["visual_type"])}</text>')
+        lines.append('  </svg>')
+    lines.append('</svg>')
+    return "\n".join(lines) + "\n"
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+
+def render_png(page: Dict[str, Any], scale: float = 1.0, show_hidden: bool = False) -> bytes:
+    """Rasterize one page as an RGB PNG (filled blocks with borders, no text)."""
+    width = max(int(round(page["width"] * scale)), 1)
+    height = max(int(round(page["height"] * scale)), 1)
+    rows = [bytearray(bytes(PAGE_BACKGROUND) * width) for _ in range(height)]
+
+    def fill_rect(x0, y0, x1, y1, color):
+        x0, x1 = max(x0, 0), min(x1, width)
+        y0, y1 = max(y0, 0), min(y1, height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        span = bytes(color) * (x1 - x0)
+        for y in range(y0, y1):
+            rows[y][x0 * 3:x1 * 3] = span
+
+    def outline(x0, y0, x1, y1, color):
+        fill_rect(x0, y0, x1, y0 + 1, color)
+        fill_rect(x0, y1 - 1, x1, y1, color)
+        fill_rect(x0, y0, x0 + 1, y1, color)
+        fill_rect(x1 - 1, y0, x1, y1, color)
+
+    for visual in drawable_visuals(page, show_hidden):
+        fill, border = CATEGORY_COLORS[_category(visual)]
+        x0 = int(round(visual["x"] * scale))
+        y0 = int(round(visual["y"] * scale))
+        x1 = int(round((visual["x"] + visual["width"]) * scale))
+        y1 = int(round((visual["y"] + visual["height"]) * scale))
+        if not visual.get("is_hidden"):
+            fill_rect(x0, y0, x1, y1, fill)
+            # Title bar hint
+            fill_rect(x0, y0, x1, y0 + max(int(6 * scale), 2), border)
+        outline(x0, y0, x1, y1, border)
+    outline(0, 0, width, height, PAGE_BORDER)
+
+    raw = b"".join(b"\x00" + bytes(row) for row in rows)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+        _png_chunk(b"IDAT", zlib.compress(raw, 6)),
+        _png_chunk(b"IEND", b""),
+    ])
+
+
+def _safe_filename(name: str) -> str:
+    return re.sub(r'[^\w\-]+', '_', name).strip('_')[:60] or "page"
+
+
+def _render_page(job: Tuple[Dict[str, Any], str, str, float, bool]) -> List[str]:
+    page, stem, fmt, scale, show_hidden = job
+    written = []
+    if fmt in ("svg", "both"):
+        path = stem + ".svg"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_svg(page, scale, show_hidden))
+        written.append(path)
+    if fmt in ("png", "both"):
+        path = stem + ".png"
+        with open(path, 'wb') as f:
+            f.write(render_png(page, scale, show_hidden))
+        written.append(path)
+    return written
+
+
+def wireframe_output_dir(report_path) -> Path:
+    """Default output: <project>/.pbi-squire-cache/wireframes/<report>"""
+    report_folder = Path(report_path).resolve()
+    return report_folder.parent / CACHE_DIR_NAME / "wireframes" / report_folder.stem
+
+
+def render_report(report_path, output_dir=None, fmt: str = "svg", page_id: Optional[str] = None,
+                  scale: float = 1.0, show_hidden: bool = False, workers: Optional[int] = None,
+                  use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Render wireframes for every page (or one page) of a report.
+
+    Returns:
+        Dict with the output folder and, per page, the files written
+    """
+    layout = extract_report_layout(report_path, use_cache=use_cache)
+    pages = layout["pages"]
+    if page_id:
+        pages = [p for p in pages if p["id"] == page_id]
+        if not pages:
+            raise FileNotFoundError(f"Page not found: {page_id}")
+
+    out = Path(output_dir) if output_dir else wireframe_output_dir(report_path)
+    out.mkdir(parents=True, exist_ok=True)
+    jobs = [
+        (page, str(out / f"{index:02d}_{_safe_filename(page['name'])}"), fmt, scale, show_hidden)
+        for index, page in enumerate(pages, start=1)
+    ]
+
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            written = list(pool.map(_render_page, jobs))
+    else:
+        written = [_render_page(job) for job in jobs]
+
+    return {
+        "report_path": str(report_path),
+        "output_dir": str(out),
+        "format": fmt,
+        "pages": [
+            {"page_id": page["id"], "display_name": page["name"], "visual_count": page["visual_count"], "files": files}
+            for page, files in zip(pages, written)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render SVG/PNG wireframes of PBIR report pages",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("report_path", help="Path to .Report folder")
+    parser.add_argument("--output", help="Output folder")
+    parser.add_argument("--format", choices=["svg", "png", "both"], default="svg", help="Output format")
+    parser.add_argument("--page", help="Only render this page ID")
+    parser.add_argument("--scale", type=float, default=1.0, help="Output scale factor")
+    parser.add_argument("--show-hidden", action="store_true", help="Draw hidden visuals as dashed outlines")
+    parser.add_argument("--workers", type=int, help="Parallel page renderers")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the layout cache")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        result = render_report(args.report_path, args.output, args.format, args.page, args.scale,
+                               args.show_hidden, args.workers, use_cache=not args.no_cache)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(f"Wireframes written to: {result['output_dir']}")
+        for page in result["pages"]:
+            files = ", ".join(Path(f).name for f in page["files"])
+            print(f"  ✅ {page['display_name']} ({page['visual_count']} visuals): {files}")
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()